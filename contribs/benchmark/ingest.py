@@ -0,0 +1,349 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""End-to-end ingest benchmark.
+
+A fake Asterisk, in a child process, streams AMI events to the real
+AMIClient, EventHandlerFacade and BusClient stack, which publishes them on a
+local RabbitMQ. Each event carries the time it was sent, to measure the
+latency until it is consumed from RabbitMQ.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import socket
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from kombu import Connection, Exchange, Queue
+
+from wazo_amid.ami.client import AMIClient
+from wazo_amid.bus.client import BusClient
+from wazo_amid.config import _DEFAULT_CONFIG, BusConfigDict
+from wazo_amid.event_queue import EventQueue
+from wazo_amid.facade import EventHandlerFacade
+
+__location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
+
+SENT_AT_HEADER = 'BenchSentAt'
+CHUNK_EVENTS = 64
+
+
+def load_sample_frames() -> list[bytes]:
+    with open(os.path.join(__location__, 'ami-messages.txt'), 'rb') as f:
+        sample = f.read().replace(b'\n', b'\r\n')
+    return [frame.strip() for frame in sample.split(b'\r\n\r\n') if frame.strip()]
+
+
+def build_frames(mix: dict[str, int] | None, seed: int) -> Iterator[bytes]:
+    """Yield frames forever, from the sample or following the event mix"""
+    frames = load_sample_frames()
+    if not mix:
+        while True:
+            yield from frames
+
+    by_name: dict[str, list[bytes]] = {}
+    for frame in frames:
+        name = frame.split(b'\r\n', 1)[0].partition(b': ')[2].decode()
+        by_name.setdefault(name, []).append(frame)
+    choices = [
+        by_name.get(name) or [f'Event: {name}\r\nPrivilege: call,all'.encode()]
+        for name in mix
+    ]
+    weights = list(mix.values())
+    rng = random.Random(seed)
+    while True:
+        yield rng.choice(rng.choices(choices, weights)[0])
+
+
+def serve(
+    server: socket.socket,
+    events: int,
+    rate: float,
+    mix: dict[str, int] | None,
+    seed: int,
+) -> None:
+    conn, _ = server.accept()
+    with conn:
+        conn.sendall(b'Asterisk Call Manager/5.0.1\r\n')
+        conn.recv(4096)  # login and event filtering actions
+
+        frames = build_frames(mix, seed)
+        start = time.monotonic()
+        sent = 0
+        while sent < events:
+            count = min(CHUNK_EVENTS, events - sent)
+            if rate:
+                delay = start + (sent + count) / rate - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            sent_at = b'\r\n%s: %r\r\n\r\n' % (
+                SENT_AT_HEADER.encode(),
+                time.monotonic(),
+            )
+            conn.sendall(b''.join(next(frames) + sent_at for _ in range(count)))
+            sent += count
+
+        # wait for the client to disconnect
+        while conn.recv(4096):
+            pass
+
+
+class Recorder:
+    def __init__(self, expected: int) -> None:
+        self.latencies = array('d')
+        self.first_published_at: float | None = None
+        self.last_published_at: float | None = None
+        self.done = threading.Event()
+        self._expected = expected
+
+    def record(self, sent_at: float) -> None:
+        now = time.monotonic()
+        if self.first_published_at is None:
+            self.first_published_at = now
+        self.last_published_at = now
+        self.latencies.append(now - sent_at)
+        if len(self.latencies) >= self._expected:
+            self.done.set()
+
+
+class BusConsumer:
+    """Record the events received from RabbitMQ, as any bus consumer would"""
+
+    def __init__(self, bus_config: BusConfigDict, recorder: Recorder) -> None:
+        self._recorder = recorder
+        self._stopped = threading.Event()
+        self._connection = Connection(
+            hostname=bus_config['host'],
+            port=bus_config['port'],
+            userid=bus_config['username'],
+            password=bus_config['password'],
+            virtual_host=bus_config['vhost'],
+        )
+        exchange = Exchange(bus_config['exchange_name'], bus_config['exchange_type'])
+        # a headers binding without arguments matches every message
+        queue = Queue(exclusive=True, auto_delete=True, exchange=exchange)
+        # the queue is bound now, before any event is published
+        self._consumer = self._connection.Consumer(
+            queue, callbacks=[self._on_message], accept=['json'], no_ack=True
+        )
+        self._consumer.consume()
+
+    def _on_message(self, body: Any, message: Any) -> None:
+        if isinstance(body, (bytes, str)):
+            body = json.loads(body)
+        self._recorder.record(float(body['data'][SENT_AT_HEADER]))
+
+    def run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._connection.drain_events(timeout=1)
+            except socket.timeout:
+                pass
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def close(self) -> None:
+        self._consumer.cancel()
+        self._connection.release()
+
+
+def percentile(sorted_values: array, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    server = socket.create_server(('127.0.0.1', 0))
+    port = server.getsockname()[1]
+    server_process = multiprocessing.Process(
+        target=serve,
+        args=(server, args.events, args.rate, args.mix, args.seed),
+        daemon=True,
+    )
+    server_process.start()
+
+    recorder = Recorder(args.events)
+    bus_config: BusConfigDict = {
+        **_DEFAULT_CONFIG['bus'],
+        'host': args.bus_host,
+        'port': args.bus_port,
+        'username': args.bus_username,
+        'password': args.bus_password,
+    }
+    consumer = BusConsumer(bus_config, recorder)
+    consumer_thread = threading.Thread(target=consumer.run, name='consumer')
+    consumer_thread.start()
+
+    bus_client = BusClient.from_config('benchmark', bus_config)
+    ami_client = AMIClient('127.0.0.1', 'bench', 'bench', port)
+    facade = EventHandlerFacade(
+        [ami_client], bus_client, EventQueue(max_size=args.queue_size)
+    )
+
+    usage_before = resource.getrusage(resource.RUSAGE_SELF)
+    with bus_client:
+        facade_thread = threading.Thread(target=facade.run, name='facade')
+        facade_thread.start()
+        completed = recorder.done.wait(timeout=args.timeout)
+        facade.stop()
+        facade_thread.join()
+    usage_after = resource.getrusage(resource.RUSAGE_SELF)
+    consumer.stop()
+    consumer_thread.join()
+    consumer.close()
+    server_process.join(timeout=5)
+    server.close()
+
+    published = len(recorder.latencies)
+    duration = (recorder.last_published_at or 0) - (recorder.first_published_at or 0)
+    latencies = array('d', sorted(recorder.latencies))
+    user = usage_after.ru_utime - usage_before.ru_utime
+    system = usage_after.ru_stime - usage_before.ru_stime
+    return {
+        'completed': completed,
+        'events': published,
+        'duration_seconds': duration,
+        'events_per_second': published / duration if duration else 0.0,
+        'latency_seconds': {
+            'p50': percentile(latencies, 0.50),
+            'p99': percentile(latencies, 0.99),
+            'p999': percentile(latencies, 0.999),
+            'max': latencies[-1] if latencies else 0.0,
+        },
+        'cpu_seconds': {'user': user, 'system': system},
+        'cpu_microseconds_per_event': (
+            (user + system) * 1e6 / published if published else 0.0
+        ),
+        'max_rss_kib': usage_after.ru_maxrss,
+    }
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            capture_output=True,
+            check=True,
+            cwd=__location__,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'date': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results: dict[str, Any], baseline_file: str, tolerance: float) -> bool:
+    with open(baseline_file) as f:
+        baseline = json.load(f)['results']
+
+    regressions = []
+    throughput = results['events_per_second']
+    if throughput < baseline['events_per_second'] * (1 - tolerance):
+        regressions.append(
+            f'events_per_second: {throughput:.0f} < '
+            f'{baseline["events_per_second"]:.0f}'
+        )
+    p99 = results['latency_seconds']['p99']
+    if p99 > baseline['latency_seconds']['p99'] * (1 + tolerance):
+        regressions.append(
+            f'p99 latency: {p99:.6f}s > {baseline["latency_seconds"]["p99"]:.6f}s'
+        )
+    for regression in regressions:
+        print(f'Regression: {regression}', file=sys.stderr)
+    return not regressions
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition(':')
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=200000)
+    parser.add_argument(
+        '--rate', type=float, default=0, help='events per second, 0 for no limit'
+    )
+    parser.add_argument(
+        '--mix',
+        type=parse_mix,
+        help='weighted event names, e.g. "VarSet:10,Newchannel:1,Hangup:1". '
+        'Default: the events of ami-messages.txt, in order',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--queue-size', type=int, default=10000)
+    bus_config = _DEFAULT_CONFIG['bus']
+    parser.add_argument(
+        '--bus-host', default=bus_config['host'], help='RabbitMQ to publish on'
+    )
+    parser.add_argument('--bus-port', type=int, default=bus_config['port'])
+    parser.add_argument('--bus-username', default=bus_config['username'])
+    parser.add_argument('--bus-password', default=bus_config['password'])
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--output', help='JSON file to write, default: stdout')
+    parser.add_argument('--baseline', help='JSON results of a previous run')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='relative difference with the baseline reported as a regression',
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    report: dict[str, Any] = {
+        'benchmark': 'ingest',
+        'parameters': {
+            'events': args.events,
+            'rate': args.rate,
+            'mix': args.mix,
+            'seed': args.seed,
+            'queue_size': args.queue_size,
+        },
+        'environment': environment(),
+        'results': run(args),
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    if not report['results']['completed']:
+        print('Timeout: not every event was published', file=sys.stderr)
+        sys.exit(1)
+    if args.baseline and not compare(report['results'], args.baseline, args.tolerance):
+        sys.exit(2)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,10 @@
 from __future__ import annotations
 
 import os
+import sys
 from typing import Any
 
+from wazo_amid.ami.capture import read_capture
 from wazo_amid.ami.parser import parse_buffer
 
 __location__ = os.path.realpath(os.path.join(os.getcwd(), os.path.dirname(__file__)))
@@ -15,9 +17,15 @@ def pass_(*args: Any, **kwargs: Any) -> None:
     pass
 
 
-with open(os.path.join(__location__, 'ami-messages.txt'), 'rb') as f:
-    sample = f.read().replace(b'\n', b'\r\n')
+if len(sys.argv) > 1:
+    # AMI capture files recorded by wazo-amid
+    ami_stream = b''.join(
+        data for path in sys.argv[1:] for _, data in read_capture(path)
+    )
+else:
+    with open(os.path.join(__location__, 'ami-messages.txt'), 'rb') as f:
+        sample = f.read().replace(b'\n', b'\r\n')
 
-ami_stream = sample * 50
+    ami_stream = sample * 50
 
 parse_buffer(ami_stream, pass_, pass_)
@@ -0,0 +1,114 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Fake Asterisk sending the data of AMI capture files.
+
+The files are written by wazo-amid when ami_capture is enabled. Each AMI
+client connecting gets the captured data, with the captured timing divided by
+--speed, or as fast as possible with --speed 0.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import time
+from collections.abc import Iterator
+
+from wazo_amid.ami.capture import capture_files, read_capture
+
+logger = logging.getLogger('replay')
+
+BANNER = b'Asterisk Call Manager/5.0.1\r\n'
+
+
+def iter_chunks(paths: list[str]) -> Iterator[tuple[float, bytes]]:
+    for path in paths:
+        yield from read_capture(path)
+
+
+def expand_paths(paths: list[str]) -> list[str]:
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(capture_files(path))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def replay(conn: socket.socket, paths: list[str], speed: float) -> tuple[int, float]:
+    start = time.monotonic()
+    first_received_at = None
+    sent = 0
+    for received_at, data in iter_chunks(paths):
+        if first_received_at is None:
+            first_received_at = received_at
+        if speed:
+            delay = start + (received_at - first_received_at) / speed
+            delay -= time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        conn.sendall(data)
+        sent += len(data)
+    return sent, time.monotonic() - start
+
+
+def serve(args: argparse.Namespace) -> None:
+    paths = expand_paths(args.captures)
+    if not paths:
+        raise SystemExit('No capture file found')
+
+    with socket.create_server((args.host, args.port)) as server:
+        logger.info('Listening on %s:%s', args.host, args.port)
+        while True:
+            conn, address = server.accept()
+            with conn:
+                logger.info('AMI client connected from %s:%s', *address)
+                conn.sendall(BANNER)
+                try:
+                    sent, duration = replay(conn, paths, args.speed)
+                except OSError as e:
+                    logger.info('AMI client disconnected: %s', e)
+                    continue
+                logger.info(
+                    'Sent %d bytes in %.3f seconds (%.0f bytes/s)',
+                    sent,
+                    duration,
+                    sent / duration if duration else 0,
+                )
+                if not args.loop:
+                    # keep the connection open until the client is done
+                    while conn.recv(4096):
+                        pass
+                    return
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        'captures', nargs='+', help='capture files or directories, in order'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5038)
+    parser.add_argument(
+        '--speed',
+        type=float,
+        default=1,
+        help='replay speed: 1 for real time, 10 for 10 times faster, '
+        '0 for as fast as possible. Default: %(default)s',
+    )
+    parser.add_argument(
+        '--loop',
+        action='store_true',
+        help='replay the captures again for each new connection',
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    serve(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,9 +5,14 @@
 from __future__ import annotations
 
 import argparse
+import heapq
+import itertools
 import logging
+import random
 import socket
 import threading
+import time
+from collections.abc import Iterator
 from http import HTTPStatus
 from threading import Thread
 from typing import Any
@@ -17,6 +22,7 @@ from flask import Flask, request
 logging.basicConfig(level=logging.DEBUG)
 
 mock_ami: MockedAsteriskAMI = None  # type: ignore[assignment]
+generator: CallGenerator | None = None
 app = Flask(__name__)
 
 
@@ -27,6 +33,36 @@ def send_event() -> tuple[str, int]:
     return "", HTTPStatus.OK
 
 
+@app.route('/generator', methods=['POST'])
+def start_generator() -> tuple[dict[str, Any], int]:
+    global generator
+    if generator is not None:
+        generator.stop()
+    generator = CallGenerator(mock_ami, **(request.get_json() or {}))
+    generator.start()
+    return generator.stats(), HTTPStatus.OK
+
+
+@app.route('/generator', methods=['GET'])
+def get_generator() -> tuple[dict[str, Any], int]:
+    if generator is None:
+        return {}, HTTPStatus.NOT_FOUND
+    return generator.stats(), HTTPStatus.OK
+
+
+@app.route('/generator', methods=['DELETE'])
+def stop_generator() -> tuple[str, int]:
+    if generator is not None:
+        generator.stop()
+    return "", HTTPStatus.NO_CONTENT
+
+
+@app.route('/disconnect_clients', methods=['POST'])
+def disconnect_clients() -> tuple[str, int]:
+    mock_ami.disconnect_clients()
+    return "", HTTPStatus.NO_CONTENT
+
+
 class MockedAsteriskAMI(Thread):
     def __init__(self, host: str, port: int) -> None:
         self.host = host
@@ -60,6 +96,10 @@ class MockedAsteriskAMI(Thread):
                         b'Response: Success\r\n'
                         b'Message: Authentication accepted\r\n'
                         b'\r\n'
+                        b'Event: FullyBooted\r\n'
+                        b'Privilege: system,all\r\n'
+                        b'Status: Fully Booted\r\n'
+                        b'\r\n'
                     )
                 else:
                     client.send(b'Response: Success\r\n\r\n')
@@ -82,6 +122,285 @@ class MockedAsteriskAMI(Thread):
                 logging.exception('Cannot send')
                 del self.clients_addresses[c]
 
+    def send_data_all_clients(self, data: bytes) -> None:
+        for c in list(self.clients_addresses):
+            try:
+                c.sendall(data)
+            except OSError:
+                logging.warning('Cannot send to client (%s)', c)
+                self.clients_addresses.pop(c, None)
+
+    def disconnect_clients(self) -> None:
+        for c in list(self.clients_addresses):
+            logging.info('Disconnecting client (%s)', c)
+            try:
+                c.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+# headers of an event, in order, possibly with several ChanVariable headers
+Block = list[tuple[str, str]]
+
+
+def frame(event: str, *blocks: Block, **headers: str) -> bytes:
+    lines = [f'Event: {event}', 'Privilege: call,all']
+    for block in blocks:
+        lines.extend(f'{name}: {value}' for name, value in block)
+    lines.extend(f'{name}: {value}' for name, value in headers.items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+
+class Channel:
+    def __init__(
+        self,
+        name: str,
+        uniqueid: str,
+        linkedid: str,
+        number: str,
+        exten: str,
+        variables: dict[str, str],
+    ) -> None:
+        self.name = name
+        self.uniqueid = uniqueid
+        self.linkedid = linkedid
+        self.number = number
+        self.exten = exten
+        self.variables = variables
+        self.state = '0'
+        self.state_desc = 'Down'
+        self.connected = '<unknown>'
+
+    def block(self, prefix: str = '') -> Block:
+        headers = [
+            ('Channel', self.name),
+            ('ChannelState', self.state),
+            ('ChannelStateDesc', self.state_desc),
+            ('CallerIDNum', self.number),
+            ('CallerIDName', f'User {self.number}'),
+            ('ConnectedLineNum', self.connected),
+            ('ConnectedLineName', self.connected),
+            ('Language', 'en_US'),
+            ('AccountCode', ''),
+            ('Context', 'default'),
+            ('Exten', self.exten),
+            ('Priority', '1'),
+            ('Uniqueid', self.uniqueid),
+            ('Linkedid', self.linkedid),
+        ]
+        headers.extend(
+            ('ChanVariable', f'{name}={value}')
+            for name, value in self.variables.items()
+        )
+        return [(f'{prefix}{name}', value) for name, value in headers]
+
+    def set_state(self, state: str, state_desc: str) -> bytes:
+        self.state = state
+        self.state_desc = state_desc
+        return frame('Newstate', self.block())
+
+    def var_set(self, name: str, value: str) -> bytes:
+        return frame('VarSet', self.block(), Variable=name, Value=value)
+
+
+class CallGenerator:
+    """Send the AMI events of simulated calls between two PJSIP endpoints.
+
+    A new call starts every 1/calls_per_second seconds, unless `concurrency`
+    calls are already running. The caller channel is created, dials the
+    callee, the callee rings for `ring_time` seconds, answers and both
+    channels are bridged for `talk_time` seconds, then hung up. Each
+    channel has a consistent Uniqueid, and the Linkedid of the caller.
+    """
+
+    def __init__(
+        self,
+        ami: MockedAsteriskAMI,
+        calls_per_second: float = 10,
+        concurrency: int = 100,
+        ring_time: float = 2,
+        talk_time: float = 10,
+        varsets_per_call: int = 10,
+        channel_variables: dict[str, str] | None = None,
+        calls: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self._ami = ami
+        self._interval = 1 / calls_per_second
+        self._concurrency = concurrency
+        self._ring_time = ring_time
+        self._talk_time = talk_time
+        self._varsets_per_call = varsets_per_call
+        self._channel_variables = (
+            {'WAZO_CALL_RECORD_ACTIVE': '0'}
+            if channel_variables is None
+            else channel_variables
+        )
+        self._max_calls = calls
+        self._random = random.Random(seed)
+        self._sequence = itertools.count(1)
+        self._epoch = int(time.time())
+        self._stop_event = threading.Event()
+        self._thread = Thread(target=self._run, name='call_generator', daemon=True)
+        self._started = 0
+        self._completed = 0
+        self._skipped = 0
+        self._events = 0
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'running': self._thread.is_alive(),
+            'calls_started': self._started,
+            'calls_completed': self._completed,
+            'calls_active': self._started - self._completed,
+            'calls_skipped': self._skipped,
+            'events_sent': self._events,
+        }
+
+    def _run(self) -> None:
+        # steps of the running calls: (due time, call number, call steps)
+        steps: list[tuple[float, int, Iterator[tuple[float, list[bytes]]]]] = []
+        next_call_at = time.monotonic()
+        while not self._stop_event.is_set():
+            now = time.monotonic()
+            frames: list[bytes] = []
+            while steps and steps[0][0] <= now:
+                _, number, call = heapq.heappop(steps)
+                self._next_step(steps, now, number, call, frames)
+            while self._starting() and next_call_at <= now:
+                next_call_at += self._interval
+                if self._started - self._completed >= self._concurrency:
+                    self._skipped += 1
+                    continue
+                number = next(self._sequence)
+                self._started += 1
+                self._next_step(steps, now, number, self._call(number), frames)
+
+            if frames:
+                self._ami.send_data_all_clients(b''.join(frames))
+                self._events += len(frames)
+
+            if self._starting():
+                next_due = min(steps[0][0], next_call_at) if steps else next_call_at
+            elif steps:
+                next_due = steps[0][0]
+            else:
+                break
+            self._stop_event.wait(timeout=max(next_due - time.monotonic(), 0))
+
+    def _starting(self) -> bool:
+        return self._max_calls is None or self._started < self._max_calls
+
+    def _next_step(
+        self,
+        steps: list[tuple[float, int, Iterator[tuple[float, list[bytes]]]]],
+        now: float,
+        number: int,
+        call: Iterator[tuple[float, list[bytes]]],
+        frames: list[bytes],
+    ) -> None:
+        try:
+            delay, step_frames = next(call)
+        except StopIteration:
+            self._completed += 1
+            return
+        frames.extend(step_frames)
+        heapq.heappush(steps, (now + delay, number, call))
+
+    def _call(self, number: int) -> Iterator[tuple[float, list[bytes]]]:
+        caller_number = str(1000 + self._random.randrange(9000))
+        callee_number = str(1000 + self._random.randrange(9000))
+        caller_id = f'{self._epoch}.{2 * number}'
+        callee_id = f'{self._epoch}.{2 * number + 1}'
+        caller = Channel(
+            f'PJSIP/{caller_number}-{2 * number:08x}',
+            caller_id,
+            caller_id,
+            caller_number,
+            callee_number,
+            dict(self._channel_variables),
+        )
+        callee = Channel(
+            f'PJSIP/{callee_number}-{2 * number + 1:08x}',
+            callee_id,
+            caller_id,
+            callee_number,
+            's',
+            dict(self._channel_variables),
+        )
+
+        def bridge(num_channels: int) -> Block:
+            return [
+                ('BridgeUniqueid', f'bridge-{caller_id}'),
+                ('BridgeType', 'basic'),
+                ('BridgeTechnology', 'simple_bridge'),
+                ('BridgeCreator', '<unknown>'),
+                ('BridgeName', '<unknown>'),
+                ('BridgeNumChannels', str(num_channels)),
+                ('BridgeVideoSourceMode', 'none'),
+            ]
+
+        frames = [frame('Newchannel', caller.block())]
+        frames.append(caller.set_state('4', 'Ring'))
+        frames.extend(
+            caller.var_set(f'WAZO_VAR_{index}', str(index))
+            for index in range(self._varsets_per_call)
+        )
+        frames.append(
+            frame(
+                'Newexten',
+                caller.block(),
+                Extension=callee_number,
+                Application='Dial',
+                AppData=f'PJSIP/{callee_number}',
+            )
+        )
+        frames.append(frame('Newchannel', callee.block()))
+        caller.connected = callee_number
+        callee.connected = caller_number
+        frames.append(
+            frame(
+                'DialBegin',
+                caller.block(),
+                callee.block('Dest'),
+                DialString=callee_number,
+            )
+        )
+        frames.append(callee.set_state('5', 'Ringing'))
+        yield self._ring_time, frames
+
+        frames = [callee.set_state('6', 'Up'), caller.set_state('6', 'Up')]
+        frames.append(
+            frame('DialEnd', caller.block(), callee.block('Dest'), DialStatus='ANSWER')
+        )
+        frames.append(frame('BridgeCreate', bridge(0)))
+        frames.append(frame('BridgeEnter', bridge(1), caller.block()))
+        frames.append(frame('BridgeEnter', bridge(2), callee.block()))
+        yield self._talk_time, frames
+
+        frames = [frame('SoftHangupRequest', callee.block(), Cause='16')]
+        frames.append(frame('BridgeLeave', bridge(1), callee.block()))
+        frames.append(frame('BridgeLeave', bridge(0), caller.block()))
+        frames.append(frame('BridgeDestroy', bridge(0)))
+        for channel in (callee, caller):
+            channel.state, channel.state_desc = '6', 'Up'
+            frames.append(
+                frame(
+                    'Hangup',
+                    channel.block(),
+                    Cause='16',
+                    **{'Cause-txt': 'Normal Clearing'},
+                )
+            )
+        yield 0, frames
+
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(
@@ -93,7 +412,25 @@ if __name__ == '__main__':
     parser.add_argument(
         '--ami_port', type=int, required=True, help='port of the AMI socket'
     )
+    parser.add_argument(
+        '--calls_per_second',
+        type=float,
+        help='start the call generator with this rate of new calls',
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=100,
+        help='maximum number of simultaneous generated calls',
+    )
     args = parser.parse_args()
     mock_ami = MockedAsteriskAMI('0.0.0.0', args.ami_port)
     mock_ami.start()
+    if args.calls_per_second:
+        generator = CallGenerator(
+            mock_ami,
+            calls_per_second=args.calls_per_second,
+            concurrency=args.concurrency,
+        )
+        generator.start()
     app.run(host='0.0.0.0', port=args.http_port, debug=True, use_reloader=False)
@@ -83,12 +83,16 @@ class APIAssetLaunchingTestCase(AssetLaunchingTestCase):
         return f'http://127.0.0.1:{ajam_port}'
 
     @classmethod
-    def make_send_event_ami_url(cls) -> str:
+    def make_mock_ami_url(cls, path: str) -> str:
         try:
-            send_event_ami_port = cls.service_port(8123, SERVICE_ASTERISK_AMI)
+            mock_ami_port = cls.service_port(8123, SERVICE_ASTERISK_AMI)
         except (NoSuchPort, NoSuchService):
-            send_event_ami_port = None
-        return f'http://127.0.0.1:{send_event_ami_port}/send_event'
+            mock_ami_port = None
+        return f'http://127.0.0.1:{mock_ami_port}/{path}'
+
+    @classmethod
+    def make_send_event_ami_url(cls) -> str:
+        return cls.make_mock_ami_url('send_event')
 
 
 class APIIntegrationTest(unittest.TestCase):
@@ -3,7 +3,15 @@
 
 import pytest
 import requests
-from hamcrest import assert_that, has_entries, has_items
+from hamcrest import (
+    assert_that,
+    empty,
+    equal_to,
+    has_entries,
+    has_items,
+    has_length,
+    is_not,
+)
 from wazo_test_helpers import until
 from wazo_test_helpers.bus import BusClient, BusMessageAccumulator
 
@@ -44,3 +52,46 @@ class TestBusEvents(APIIntegrationTest):
             )
 
         until.assert_(assert_received, events, tries=10)
+
+    def test_generated_calls_sent_on_bus(self) -> None:
+        hangups = self.bus.accumulator(headers={'name': 'Hangup'})
+        generator_url = self.asset_cls.make_mock_ami_url('generator')
+
+        response = requests.post(
+            generator_url,
+            json={'calls_per_second': 50, 'ring_time': 0, 'talk_time': 0, 'calls': 10},
+        )
+        assert_that(response.status_code, equal_to(200))
+        self.addCleanup(requests.delete, generator_url)
+
+        def assert_received(bus_accumulator: BusMessageAccumulator) -> None:
+            linkedids: dict[str, set[str]] = {}
+            for message in bus_accumulator.accumulate():
+                data = message['data']
+                linkedids.setdefault(data['Linkedid'], set()).add(data['Uniqueid'])
+            assert_that(linkedids, has_length(10))
+            for uniqueids in linkedids.values():
+                assert_that(uniqueids, has_length(2))
+
+        until.assert_(assert_received, hangups, tries=10)
+
+    def test_generated_calls_sent_on_bus_after_ami_disconnection(self) -> None:
+        hangups = self.bus.accumulator(headers={'name': 'Hangup'})
+        generator_url = self.asset_cls.make_mock_ami_url('generator')
+        response = requests.post(
+            generator_url,
+            json={'calls_per_second': 20, 'ring_time': 0, 'talk_time': 0},
+        )
+        assert_that(response.status_code, equal_to(200))
+        self.addCleanup(requests.delete, generator_url)
+
+        def assert_received(bus_accumulator: BusMessageAccumulator) -> None:
+            assert_that(bus_accumulator.accumulate(), is_not(empty()))
+
+        until.assert_(assert_received, hangups, tries=10)
+
+        response = requests.post(self.asset_cls.make_mock_ami_url('disconnect_clients'))
+        assert_that(response.status_code, equal_to(204))
+        hangups_after_reconnection = self.bus.accumulator(headers={'name': 'Hangup'})
+
+        until.assert_(assert_received, hangups_after_reconnection, tries=10)
@@ -0,0 +1,218 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import fnmatch
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from wazo_amid.plugin_helpers.ami import AMIActionResponse, AMIActionStream, args_key
+
+if TYPE_CHECKING:
+    from xivo.status import StatusDict
+
+    from .ami.client import AnyMessage
+    from .config import CachedActionConfigDict
+    from .plugin_helpers.ami import (
+        ActionArgs,
+        ActionClient,
+        ActionResponse,
+        ActionStream,
+        ArgsKey,
+    )
+
+# events after which no cached response can be trusted anymore
+GLOBAL_INVALIDATION_EVENTS = frozenset(('Reload', 'FullyBooted'))
+ERROR_RESPONSE = b'Response: Error'
+MAX_ENTRIES_PER_ACTION = 1024
+
+
+class _Entry:
+    __slots__ = ('expires_at', 'content')
+
+    def __init__(self, expires_at: float, content: bytes) -> None:
+        self.expires_at = expires_at
+        self.content = content
+
+
+class ActionCache:
+    """Responses of read-only AMI actions, kept for a per-action TTL.
+
+    Entries are keyed on the action and its arguments, with argument names
+    compared case-insensitively like AMI headers. Besides expiring, all
+    entries are dropped on Reload and FullyBooted events, and the entries of
+    an action are dropped on the events matching its `invalidated_by`
+    patterns. Error responses are never cached, nor responses to actions sent
+    before an invalidation.
+    """
+
+    def __init__(
+        self,
+        actions: dict[str, CachedActionConfigDict],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttls = {
+            action.lower(): float(config['ttl'])
+            for action, config in actions.items()
+            if config['ttl'] > 0
+        }
+        self._invalidation_patterns = [
+            (pattern, action.lower())
+            for action, config in actions.items()
+            for pattern in config.get('invalidated_by', [])
+        ]
+        self._invalidated_actions: dict[str, frozenset[str]] = {}
+        self._clock = clock
+        self._entries: dict[str, dict[ArgsKey, _Entry]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def cacheable(self, action: str) -> bool:
+        return action.lower() in self._ttls
+
+    def epoch(self) -> int:
+        """Counter of invalidations, to be passed to `set`"""
+        return self._epoch
+
+    def get(self, action: str, ami_args: ActionArgs) -> bytes | None:
+        action = action.lower()
+        key = args_key(ami_args)
+        with self._lock:
+            entry = self._entries.get(action, {}).get(key)
+            if entry is None or entry.expires_at <= self._clock():
+                self._misses += 1
+                return None
+            self._hits += 1
+            return entry.content
+
+    def set(
+        self, action: str, ami_args: ActionArgs, content: bytes, epoch: int
+    ) -> None:
+        """Store a response, unless entries were invalidated since `epoch`"""
+        if content.startswith(ERROR_RESPONSE):
+            return
+        action = action.lower()
+        ttl = self._ttls.get(action)
+        if ttl is None:
+            return
+        now = self._clock()
+        with self._lock:
+            if epoch != self._epoch:
+                return
+            entries = self._entries.setdefault(action, {})
+            if len(entries) >= MAX_ENTRIES_PER_ACTION:
+                self._evict(entries, now)
+            entries[args_key(ami_args)] = _Entry(now + ttl, content)
+
+    def invalidate(self, messages: Iterable[AnyMessage]) -> None:
+        """Drop the entries made stale by these AMI events"""
+        if not self._ttls:
+            return
+        for message in messages:
+            if message.name in GLOBAL_INVALIDATION_EVENTS:
+                self.clear()
+                continue
+            actions = self._invalidated_actions.get(message.name)
+            if actions is None:
+                actions = self._match_actions(message.name)
+            if actions:
+                with self._lock:
+                    self._epoch += 1
+                    for action in actions:
+                        if self._entries.pop(action, None):
+                            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            if self._entries:
+                self._invalidations += 1
+                self._entries.clear()
+
+    def provide_status(self, status: StatusDict) -> None:
+        with self._lock:
+            lookups = self._hits + self._misses
+            status['action_cache']['size'] = sum(
+                len(entries) for entries in self._entries.values()
+            )
+            status['action_cache']['hits'] = self._hits
+            status['action_cache']['misses'] = self._misses
+            status['action_cache']['hit_ratio'] = (
+                self._hits / lookups if lookups else 0.0
+            )
+            status['action_cache']['invalidations'] = self._invalidations
+
+    def _match_actions(self, event_name: str) -> frozenset[str]:
+        actions = frozenset(
+            action
+            for pattern, action in self._invalidation_patterns
+            if fnmatch.fnmatchcase(event_name, pattern)
+        )
+        self._invalidated_actions[event_name] = actions
+        return actions
+
+    @staticmethod
+    def _evict(entries: dict[ArgsKey, _Entry], now: float) -> None:
+        for key in [key for key, entry in entries.items() if entry.expires_at <= now]:
+            del entries[key]
+        while len(entries) >= MAX_ENTRIES_PER_ACTION:
+            del entries[next(iter(entries))]
+
+
+class CachedActionClient:
+    """Serve cacheable actions from an ActionCache, others from `action_client`"""
+
+    def __init__(self, action_client: ActionClient, cache: ActionCache) -> None:
+        self._action_client = action_client
+        self._cache = cache
+
+    def get(self, action: str, ami_args: ActionArgs) -> ActionResponse:
+        if not self._cache.cacheable(action):
+            return self._action_client.get(action, ami_args)
+
+        content = self._cache.get(action, ami_args)
+        if content is not None:
+            return AMIActionResponse(content)
+        epoch = self._cache.epoch()
+        response = self._action_client.get(action, ami_args)
+        self._cache.set(action, ami_args, response.content, epoch)
+        return response
+
+    def stream(self, action: str, ami_args: ActionArgs) -> ActionStream:
+        if not self._cache.cacheable(action):
+            return self._action_client.stream(action, ami_args)
+
+        content = self._cache.get(action, ami_args)
+        if content is not None:
+            return AMIActionStream(content)
+        epoch = self._cache.epoch()
+        return _RecordingStream(
+            self._action_client.stream(action, ami_args),
+            lambda content: self._cache.set(action, ami_args, content, epoch),
+        )
+
+
+class _RecordingStream:
+    """Pass chunks through and hand the full content over once exhausted"""
+
+    def __init__(
+        self, stream: ActionStream, on_complete: Callable[[bytes], None]
+    ) -> None:
+        self._stream = stream
+        self._on_complete = on_complete
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks = []
+        for chunk in self._stream:
+            chunks.append(chunk)
+            yield chunk
+        self._on_complete(b''.join(chunks))
+
+    def close(self) -> None:
+        self._stream.close()
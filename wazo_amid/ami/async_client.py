@@ -0,0 +1,90 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+
+from wazo_amid.ami.client import AMIClient, AMIConnectionError, AnyMessage
+from wazo_amid.ami.liveness import set_tcp_keepalive
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAMIClient(AMIClient):
+    """AMIClient reading from asyncio streams instead of a blocking socket.
+
+    The parser, event filtering and status reporting are shared with
+    AMIClient, so the same Message objects are produced.
+    """
+
+    _reader: asyncio.StreamReader | None = None
+    _writer: asyncio.StreamWriter | None = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    async def connect_and_login(self) -> None:  # type: ignore[override]
+        self.stopping = False
+        if self._writer is None:
+            logger.info('Connecting AMI client to %s:%s', self._hostname, self._port)
+            try:
+                self._reader, self._writer = await asyncio.open_connection(
+                    self._hostname, self._port
+                )
+                set_tcp_keepalive(
+                    self._writer.get_extra_info('socket'), self._tcp_keepalive
+                )
+                # discard the AMI protocol version
+                await self._reader.readline()
+            except OSError as e:
+                raise AMIConnectionError(e)
+            await self._send_data(
+                self._build_login_msg()
+                + self._build_event_filtering_msg()
+                + self._build_startup_actions_msg()
+            )
+            self.liveness.connected()
+            logger.info('AMI client connected to %s:%s', self._hostname, self._port)
+        self.backoff.connected()
+
+    async def parse_next_messages(self) -> deque[AnyMessage]:  # type: ignore[override]
+        if self._reader is None:
+            raise AMIConnectionError('Not connected')
+        try:
+            data = await self._reader.read(self._BUFSIZE)
+        except OSError as e:
+            logger.error('Could not read data from socket: %s', e)
+            raise AMIConnectionError(e)
+        if not data:
+            logger.error('Could not read data from socket: connection closed')
+            raise AMIConnectionError('Connection closed from remote')
+        self._feed_parser(data)
+        return self._pop_messages()
+
+    async def ping(self) -> None:
+        await self._send_data(self._build_ping_msg())
+
+    async def _send_data(self, data: bytes) -> None:
+        if self._writer is None:
+            raise AMIConnectionError('Not connected')
+        try:
+            self._writer.write(data)
+            await self._writer.drain()
+        except OSError as e:
+            logger.error('Could not write data to socket: %s', e)
+            raise AMIConnectionError(e)
+
+    def disconnect(self, reason: Exception | str | None = None) -> None:
+        if self._writer is not None:
+            logger.info('Disconnecting AMI client. Reason: %s', reason)
+            self._writer.close()
+            self._reader = self._writer = None
+        self._parser.clear()
+
+    def stop(self) -> None:
+        self.stopping = True
+        self.disconnect(reason='explicit stop')
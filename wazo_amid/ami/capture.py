@@ -0,0 +1,130 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import glob
+import gzip
+import logging
+import os
+import re
+import struct
+import time
+import zlib
+from collections.abc import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'AMICAP1\n'
+SUFFIX = '.amicap.gz'
+_FILENAME_REGEX = re.compile(
+    r'^(?P<prefix>.+)-(?P<timestamp>\d{8}T\d{6})-(?P<sequence>\d+)\.amicap\.gz$'
+)
+FLUSH_INTERVAL = 1
+
+# reception time and length of the chunk, followed by the chunk
+_RECORD_HEADER = struct.Struct('<dI')
+
+
+class CaptureWriter:
+    """Write the raw AMI byte stream to rolling gzip files.
+
+    Each chunk received from Asterisk is written with its monotonic reception
+    time. A new file is started after `max_file_size` uncompressed bytes and
+    only the last `max_files` files of the same prefix are kept.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = 'ami',
+        max_file_size: int = 104857600,
+        max_files: int = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._directory = directory
+        self._prefix = prefix.replace(os.sep, '_').replace(':', '_')
+        self._max_file_size = max_file_size
+        self._max_files = max_files
+        self._clock = clock
+        self._file: gzip.GzipFile | None = None
+        self._file_size = 0
+        self._flushed_at = 0.0
+        self._sequence = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, received_at: float, data: bytes) -> None:
+        try:
+            if self._file is None or self._file_size >= self._max_file_size:
+                self._rotate()
+            assert self._file is not None
+            self._file.write(_RECORD_HEADER.pack(received_at, len(data)))
+            self._file.write(data)
+            self._file_size += _RECORD_HEADER.size + len(data)
+            now = self._clock()
+            if now - self._flushed_at >= FLUSH_INTERVAL:
+                # a sync flush makes the file readable up to here after a crash
+                self._file.flush()
+                self._flushed_at = now
+        except OSError as e:
+            logger.error('Could not write the AMI capture: %s', e)
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logger.error('Could not close the AMI capture: %s', e)
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        timestamp = time.strftime('%Y%m%dT%H%M%S')
+        filename = f'{self._prefix}-{timestamp}-{self._sequence:04d}{SUFFIX}'
+        self._sequence += 1
+        path = os.path.join(self._directory, filename)
+        self._file = gzip.GzipFile(path, 'wb', compresslevel=1)
+        self._file.write(MAGIC)
+        self._file_size = len(MAGIC)
+        self._remove_old_files()
+
+    def _remove_old_files(self) -> None:
+        paths = capture_files(self._directory, self._prefix)
+        for path in paths[: max(len(paths) - self._max_files, 0)]:
+            logger.debug('Removing old AMI capture %s', path)
+            os.unlink(path)
+
+
+def capture_files(directory: str, prefix: str | None = None) -> list[str]:
+    """Capture files of `directory`, of every prefix by default, oldest first"""
+    files = []
+    for path in glob.glob(os.path.join(glob.escape(directory), f'*{SUFFIX}')):
+        match = _FILENAME_REGEX.match(os.path.basename(path))
+        if not match or prefix is not None and match['prefix'] != prefix:
+            continue
+        files.append((match['timestamp'], int(match['sequence']), path))
+    return [path for _, _, path in sorted(files)]
+
+
+def read_capture(path: str) -> Iterator[tuple[float, bytes]]:
+    """Yield the reception time and the data of each chunk of a capture file.
+
+    A file that was not closed, e.g. after a crash, is read up to its last
+    complete chunk.
+    """
+    with gzip.open(path, 'rb') as f:
+        try:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not an AMI capture file')
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    return
+                received_at, length = _RECORD_HEADER.unpack(header)
+                data = f.read(length)
+                if len(data) < length:
+                    return
+                yield received_at, data
+        except (EOFError, zlib.error):
+            return
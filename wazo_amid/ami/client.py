@@ -5,12 +5,25 @@ from __future__ import annotations
 
 import logging
 import socket
-from collections import defaultdict, deque
-from typing import NamedTuple
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, NamedTuple, Union
 
-from xivo.status import Status
+from xivo.status import Status, StatusDict
 
+from wazo_amid import metrics
 from wazo_amid.ami import parser
+from wazo_amid.ami.filters import EventFilter
+from wazo_amid.ami.liveness import LivenessMonitor, set_tcp_keepalive
+from wazo_amid.ami.reconnect import ReconnectBackoff
+
+if TYPE_CHECKING:
+    from wazo_amid.ami.capture import CaptureWriter
+    from wazo_amid.config import (
+        AmiReconnectConfigDict,
+        EventFilterConfigDict,
+        TcpKeepaliveConfigDict,
+    )
 
 logger = logging.getLogger(__name__)
 
@@ -18,19 +31,91 @@ logger = logging.getLogger(__name__)
 class Message(NamedTuple):
     name: str
     headers: dict[str, str]
+    node: str | None = None
+    received_at: float | None = None
+
+
+class LazyMessage:
+    """AMI event holding its raw frame, decoded on the first access to headers.
+
+    The event name is parsed upfront, so that the event can be routed,
+    filtered or counted without decoding the rest of the frame.
+    """
+
+    __slots__ = ('name', 'raw', 'node', 'received_at', '_headers')
+
+    def __init__(
+        self,
+        name: str,
+        raw: bytes,
+        node: str | None = None,
+        received_at: float | None = None,
+    ) -> None:
+        self.name = name
+        self.raw = raw
+        self.node = node
+        self.received_at = received_at
+        self._headers: dict[str, Any] | None = None
+
+    @property
+    def headers(self) -> dict[str, Any]:
+        if self._headers is None:
+            self._headers = parser.parse_frame_headers(self.raw)
+        return self._headers
+
+    def __repr__(self) -> str:
+        return f'LazyMessage(name={self.name!r}, node={self.node!r})'
+
+
+AnyMessage = Union[Message, LazyMessage]
 
 
 class AMIClient:
     _BUFSIZE = 4096
 
-    def __init__(self, host: str, username: str, password: str, port: int) -> None:
+    def __init__(
+        self,
+        host: str,
+        username: str,
+        password: str,
+        port: int,
+        event_filter: EventFilterConfigDict | None = None,
+        event_mask: str | None = None,
+        filters: list[str] | None = None,
+        name: str | None = None,
+        startup_actions: list[dict[str, str]] | None = None,
+        capture: CaptureWriter | None = None,
+        reconnect: AmiReconnectConfigDict | None = None,
+        ping_interval: float = 0,
+        ping_timeout: float = 10,
+        tcp_keepalive: TcpKeepaliveConfigDict | None = None,
+    ) -> None:
+        self.name = name
         self._hostname = host
         self._username = username
         self._password = password
         self._port = port
+        self._event_mask = event_mask
+        self._filters = filters or []
+        self._startup_actions = startup_actions or []
+        self._capture = capture
+        self.backoff = (
+            ReconnectBackoff(name, **reconnect) if reconnect else ReconnectBackoff(name)
+        )
+        self.liveness = LivenessMonitor(name, ping_interval, ping_timeout)
+        self._tcp_keepalive = tcp_keepalive
         self._sock: socket.socket | None = None
-        self._buffer = b''
-        self._event_queue: deque[Message] = deque()
+        self._event_queue: deque[AnyMessage] = deque()
+        self._event_filter = (
+            EventFilter(**event_filter) if event_filter else EventFilter()
+        )
+        self._parser = parser.StreamParser(
+            self.event_parser_callback,
+            self.response_parser_callback,
+            self._event_filter if self._event_filter.enabled else None,
+            self.raw_event_parser_callback,
+        )
+        self._received_at: float | None = None
         self.stopping = False
 
     def connect_and_login(self) -> None:
@@ -39,21 +124,35 @@ class AMIClient:
             logger.info('Connecting AMI client to %s:%s', self._hostname, self._port)
             self._connect_socket()
             self._login()
+            self.liveness.connected()
             logger.info('AMI client connected to %s:%s', self._hostname, self._port)
+        self.backoff.connected()
 
     def disconnect(self, reason: Exception | str | None = None) -> None:
         if self._sock is not None:
             logger.info('Disconnecting AMI client. Reason: %s', reason)
             self._disconnect_socket()
 
-    def parse_next_messages(self) -> deque[Message]:
-        self._add_data_to_buffer()
-        self._parse_buffer()
+    def parse_next_messages(self) -> deque[AnyMessage]:
+        self._feed_parser(self._recv_data_from_socket())
         return self._pop_messages()
 
+    def _feed_parser(self, data: bytes) -> None:
+        # every event of the chunk shares its reception time
+        self._received_at = time.monotonic()
+        self.liveness.received(self._received_at)
+        if self._capture is not None and data:
+            self._capture.write(self._received_at, data)
+        start = time.perf_counter()
+        self._parser.feed(data)
+        metrics.ami_parse_seconds.observe(time.perf_counter() - start)
+
     def _connect_socket(self) -> None:
         try:
             self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            set_tcp_keepalive(self._sock, self._tcp_keepalive)
+            # recv() gives up regularly to check that the connection is alive
+            self._sock.settimeout(self.liveness.poll_interval)
             self._sock.connect((self._hostname, self._port))
             # discard the AMI protocol version
             self._sock.recv(self._BUFSIZE)
@@ -61,41 +160,82 @@ class AMIClient:
             raise AMIConnectionError(e)
 
     def _login(self) -> None:
-        data = self._build_login_msg()
+        data = (
+            self._build_login_msg()
+            + self._build_event_filtering_msg()
+            + self._build_startup_actions_msg()
+        )
         self._send_data_to_socket(data)
 
     def _build_login_msg(self) -> bytes:
-        lines = [
+        return self._build_action_msg(
             'Action: Login',
             'Username: %s' % self._username,
             'Secret: %s' % self._password,
-            '\r\n',
-        ]
-        return '\r\n'.join(lines).encode('UTF-8')
+        )
+
+    def _build_event_filtering_msg(self) -> bytes:
+        msgs = []
+        if self._event_mask is not None:
+            msgs.append(
+                self._build_action_msg(
+                    'Action: Events', 'EventMask: %s' % self._event_mask
+                )
+            )
+        for filter_ in self._filters:
+            msgs.append(
+                self._build_action_msg(
+                    'Action: Filter', 'Operation: Add', 'Filter: %s' % filter_
+                )
+            )
+        return b''.join(msgs)
+
+    def _build_startup_actions_msg(self) -> bytes:
+        return b''.join(
+            self._build_action_msg(
+                *(f'{key}: {value}' for key, value in action.items())
+            )
+            for action in self._startup_actions
+        )
+
+    def _build_ping_msg(self) -> bytes:
+        action_id = self.liveness.ping_sent()
+        return self._build_action_msg('Action: Ping', f'ActionID: {action_id}')
+
+    @staticmethod
+    def _build_action_msg(*lines: str) -> bytes:
+        return '\r\n'.join([*lines, '\r\n']).encode('UTF-8')
 
     def _disconnect_socket(self) -> None:
         if self._sock:
             self._sock.close()
             self._sock = None
-        self._buffer = b''
-
-    def _add_data_to_buffer(self) -> None:
-        data = self._recv_data_from_socket()
-        self._buffer += data
+        self._parser.clear()
 
     def event_parser_callback(
         self, event_name: str, action_id: str | None, headers: dict[str, str]
     ) -> None:
-        message = Message(event_name, headers)
+        if event_name == 'FullyBooted':
+            self.backoff.booted()
+        message = Message(event_name, headers, self.name, self._received_at)
         self._event_queue.append(message)
 
-    def _parse_buffer(self) -> None:
-        self._buffer = parser.parse_buffer(
-            self._buffer, self.event_parser_callback, None
+    def response_parser_callback(
+        self, response: str, action_id: str | None, headers: dict[str, str]
+    ) -> None:
+        self.liveness.response_received(action_id)
+
+    def raw_event_parser_callback(self, event_name: str, frame: bytes) -> None:
+        if event_name == 'FullyBooted':
+            self.backoff.booted()
+        metrics.ami_received_events.inc(event_name)
+        metrics.ami_received_bytes.inc(event_name, amount=len(frame))
+        self._event_queue.append(
+            LazyMessage(event_name, frame, self.name, self._received_at)
         )
 
-    def _pop_messages(self) -> deque[Message]:
-        messages: deque[Message] = deque()
+    def _pop_messages(self) -> deque[AnyMessage]:
+        messages: deque[AnyMessage] = deque()
         messages.extend(self._event_queue)
         self._event_queue.clear()
         return messages
@@ -108,25 +248,59 @@ class AMIClient:
             raise AMIConnectionError(e)
 
     def _recv_data_from_socket(self) -> bytes:
-        try:
-            data = self._sock.recv(self._BUFSIZE)  # type: ignore
-        except OSError as e:
-            logger.error('Could not read data from socket: %s', e)
-            raise AMIConnectionError(e)
-        else:
+        while True:
+            try:
+                data = self._sock.recv(self._BUFSIZE)  # type: ignore
+            except socket.timeout:
+                self._check_liveness()
+                continue
+            except OSError as e:
+                logger.error('Could not read data from socket: %s', e)
+                raise AMIConnectionError(e)
             if not data and not self.stopping:
                 logger.error('Could not read data from socket: connection closed')
                 raise AMIConnectionError('Connection closed from remote')
             return data
 
+    def _check_liveness(self) -> None:
+        if self.liveness.expired():
+            logger.error(
+                'No data received from AMI %s seconds after a Ping',
+                self.liveness.ping_timeout,
+            )
+            raise AMIConnectionError('Ping timeout')
+        if self.liveness.ping_due():
+            self._send_data_to_socket(self._build_ping_msg())
+
     def stop(self) -> None:
         if self._sock is not None:
             self.stopping = True
             self._sock.shutdown(socket.SHUT_RDWR)
             self.disconnect(reason='explicit stop')
 
-    def provide_status(self, status: defaultdict[str, defaultdict[str, str]]) -> None:
-        status['ami_socket']['status'] = Status.ok if self._sock else Status.fail
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def provide_status(self, status: StatusDict) -> None:
+        # several clients may report in the same status, one per Asterisk node
+        socket_status = Status.ok if self.connected else Status.fail
+        if status['ami_socket'].get('status') != Status.fail:
+            status['ami_socket']['status'] = socket_status
+        if self.name is not None:
+            nodes = status['ami_socket'].setdefault('nodes', {})
+            nodes[self.name] = {
+                'status': socket_status,
+                'reconnect': self.backoff.status(),
+                'liveness': self.liveness.status(),
+            }
+        else:
+            status['ami_socket']['reconnect'] = self.backoff.status()
+            status['ami_socket']['liveness'] = self.liveness.status()
+        if self._event_filter.enabled:
+            dropped = status['ami_event_filter'].setdefault('dropped', {})
+            for event_name, count in self._event_filter.dropped().items():
+                dropped[event_name] = dropped.get(event_name, 0) + count
 
 
 class AMIConnectionError(Exception):
@@ -0,0 +1,55 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import fnmatch
+import threading
+from collections import Counter
+from collections.abc import Iterable
+
+
+class EventFilter:
+    """Decide which AMI events are parsed, based on their name.
+
+    Both lists accept exact event names or glob patterns. An empty allow list
+    accepts every event not explicitly denied. Decisions are memoized per
+    event name, since Asterisk only emits a few hundred distinct events.
+    """
+
+    def __init__(
+        self, allow: Iterable[str] | None = None, deny: Iterable[str] | None = None
+    ) -> None:
+        self._allow = list(allow or [])
+        self._deny = list(deny or [])
+        self._decisions: dict[str, bool] = {}
+        self._dropped: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._allow or self._deny)
+
+    def accepts(self, event_name: str) -> bool:
+        try:
+            accepted = self._decisions[event_name]
+        except KeyError:
+            accepted = self._decisions[event_name] = self._decide(event_name)
+
+        if not accepted:
+            with self._lock:
+                self._dropped[event_name] += 1
+        return accepted
+
+    def dropped(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._dropped)
+
+    def _decide(self, event_name: str) -> bool:
+        if self._allow and not _matches_any(event_name, self._allow):
+            return False
+        return not _matches_any(event_name, self._deny)
+
+
+def _matches_any(event_name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(event_name, pattern) for pattern in patterns)
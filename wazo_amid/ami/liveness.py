@@ -0,0 +1,157 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import itertools
+import socket
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from wazo_amid import metrics
+
+if TYPE_CHECKING:
+    from wazo_amid.config import TcpKeepaliveConfigDict
+
+PING_ACTION_ID_PREFIX = 'wazo-amid-ping-'
+
+
+class LivenessMonitor:
+    """Detect an AMI connection that died without being closed.
+
+    A Ping action is due after `ping_interval` seconds without receiving
+    anything from Asterisk. The connection is dead when nothing, not even the
+    response to the Ping, was received in the `ping_timeout` seconds after it
+    was sent. A `ping_interval` of 0 disables the Ping actions.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        ping_interval: float = 0,
+        ping_timeout: float = 10,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._node = name or ''
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._clock = clock
+        self._action_ids = itertools.count(1)
+        self._received_at: float | None = None
+        self._resumed_at: float | None = None
+        self._ping_action_id: str | None = None
+        self._ping_sent_at: float | None = None
+        self._ping_rtt: float | None = None
+        self._ping_timeouts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ping_interval > 0
+
+    @property
+    def poll_interval(self) -> float | None:
+        """Longest wait for data before checking the connection again"""
+        if not self.enabled:
+            return None
+        return min(self.ping_interval, self.ping_timeout)
+
+    def connected(self) -> None:
+        self._received_at = self._clock()
+        self._resumed_at = None
+        self._ping_action_id = self._ping_sent_at = None
+
+    def received(self, received_at: float) -> None:
+        self._received_at = received_at
+
+    def resumed(self) -> None:
+        """The connection is read again after a pause, e.g. a full event queue.
+
+        The silence of the connection during the pause is not held against it.
+        """
+        self._resumed_at = self._clock()
+        if self._ping_sent_at is not None:
+            self._ping_sent_at = self._resumed_at
+
+    def ping_due(self) -> bool:
+        if not self.enabled or self._ping_sent_at is not None:
+            return False
+        silent_since = self._silent_since()
+        if silent_since is None:
+            return True
+        return self._clock() - silent_since >= self.ping_interval
+
+    def ping_sent(self) -> str:
+        """Record a Ping action sent now, return its ActionID"""
+        self._ping_action_id = f'{PING_ACTION_ID_PREFIX}{next(self._action_ids)}'
+        self._ping_sent_at = self._clock()
+        return self._ping_action_id
+
+    def response_received(self, action_id: str | None) -> None:
+        if action_id is None or action_id != self._ping_action_id:
+            return
+        assert self._ping_sent_at is not None
+        self._ping_rtt = self._clock() - self._ping_sent_at
+        metrics.ami_ping_rtt_seconds.observe(self._ping_rtt, self._node)
+        self._ping_action_id = self._ping_sent_at = None
+
+    def expired(self) -> bool:
+        """Whether the connection is dead, the pending Ping is then forgotten"""
+        if self._ping_sent_at is None:
+            return False
+        if self._clock() - self._last_sign_of_life() < self.ping_timeout:
+            return False
+        self._ping_timeouts += 1
+        self._ping_action_id = self._ping_sent_at = None
+        return True
+
+    def next_check(self) -> float:
+        """Seconds until a Ping is due or the pending one expires"""
+        now = self._clock()
+        if self._ping_sent_at is not None:
+            return max(self._last_sign_of_life() + self.ping_timeout - now, 0)
+        silent_since = self._silent_since()
+        if silent_since is None:
+            return 0
+        return max(silent_since + self.ping_interval - now, 0)
+
+    def _silent_since(self) -> float | None:
+        times = [at for at in (self._received_at, self._resumed_at) if at is not None]
+        return max(times) if times else None
+
+    def _last_sign_of_life(self) -> float:
+        assert self._ping_sent_at is not None
+        silent_since = self._silent_since()
+        if silent_since is None:
+            return self._ping_sent_at
+        return max(self._ping_sent_at, silent_since)
+
+    def status(self) -> dict[str, Any]:
+        last_received = None
+        if self._received_at is not None:
+            elapsed = timedelta(seconds=self._clock() - self._received_at)
+            last_received = (datetime.now(timezone.utc) - elapsed).isoformat()
+        return {
+            'last_received': last_received,
+            'ping_rtt': self._ping_rtt,
+            'ping_timeouts': self._ping_timeouts,
+        }
+
+
+def set_tcp_keepalive(
+    sock: socket.socket, config: TcpKeepaliveConfigDict | None
+) -> None:
+    if not config or not config['enabled']:
+        return
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    options = (
+        ('TCP_KEEPIDLE', config['idle']),
+        ('TCP_KEEPINTVL', config['interval']),
+        ('TCP_KEEPCNT', config['count']),
+    )
+    # the probe timings are not available on every platform
+    for option_name, value in options:
+        option = getattr(socket, option_name, None)
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, value)
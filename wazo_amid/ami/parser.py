@@ -3,15 +3,20 @@
 
 from __future__ import annotations
 
-import functools
 import logging
-from collections.abc import Callable
-from typing import Any, TypedDict, Union
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, Union
+
+if TYPE_CHECKING:
+    from xivo.status import StatusDict
+
+    from .filters import EventFilter
 
 logger = logging.getLogger(__name__)
 
 
 ParserCallback = Callable[[str, Union[str, None], dict[str, Any]], None]
+RawEventCallback = Callable[[str, bytes], None]
 
 
 class AMIParsingError(Exception):
@@ -22,54 +27,339 @@ class ChanVariableDict(TypedDict):
     ChanVariable: dict[str, str]
 
 
+MESSAGE_DELIMITER = b'\r\n\r\n'
+LINE_DELIMITER = b'\r\n'
+# before Asterisk 14, the output of the Command action is sent unformatted
+FOLLOWS_RESPONSE = b'Response: Follows\r\n'
+END_COMMAND = b'--END COMMAND--'
+FOLLOWS_HEADERS = frozenset(('Response', 'Privilege', 'ActionID'))
+
+# headers whose values come from a small set, e.g. "Privilege: call,all"
+INTERNED_VALUE_HEADERS = frozenset(
+    (
+        'Event',
+        'Response',
+        'Privilege',
+        'ChannelState',
+        'ChannelStateDesc',
+        'Context',
+        'Language',
+        'Cause',
+        'Cause-txt',
+    )
+)
+
+
+class InternTable:
+    """Map equal strings to a single shared instance.
+
+    Once `max_size` distinct strings are known, unknown strings are returned
+    as is, so that unexpected high cardinality values cannot grow the table
+    forever. On the hot path of event decoding, the parser looks up strings
+    with `lookup_function`, adds the unknown ones with `add` and counts its
+    lookups once per frame with `count_lookups`.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._strings: dict[str, str] = {}
+        self._lookups = 0
+        self._misses = 0
+
+    def intern(self, string: str) -> str:
+        self._lookups += 1
+        interned = self._strings.get(string)
+        return interned if interned is not None else self.add(string)
+
+    def lookup_function(self) -> Callable[[str], str | None]:
+        """Return the shared instance of a known string, None otherwise.
+
+        Lookups are not counted.
+        """
+        return self._strings.get
+
+    def add(self, string: str) -> str:
+        """Record a missed lookup of `string` and intern it if there is room"""
+        self._misses += 1
+        if len(self._strings) < self._max_size:
+            self._strings[string] = string
+        return string
+
+    def count_lookups(self, count: int) -> None:
+        self._lookups += count
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._lookups
+        hits = lookups - self._misses
+        return {
+            'size': len(self._strings),
+            'hits': hits,
+            'misses': self._misses,
+            'hit_ratio': hits / lookups if lookups else 0.0,
+        }
+
+
+_header_names = InternTable(max_size=4096)
+_header_values = InternTable(max_size=4096)
+
+
+def provide_status(status: StatusDict) -> None:
+    status['ami_parser']['header_names'] = _header_names.stats()
+    status['ami_parser']['header_values'] = _header_values.stats()
+
+
+class StreamParser:
+    """Incremental AMI parser owning its receive buffer.
+
+    Data is appended to a growable bytearray, frames are located by offset and
+    the consumed bytes are compacted once per call to `feed`. When a raw event
+    callback is given, events are not parsed: it receives their name and the
+    raw frame, to be decoded later with `parse_frame_headers`.
+    """
+
+    def __init__(
+        self,
+        event_callback: ParserCallback,
+        response_callback: ParserCallback | None,
+        event_filter: EventFilter | None = None,
+        raw_event_callback: RawEventCallback | None = None,
+    ) -> None:
+        self._event_callback = event_callback
+        self._response_callback = response_callback
+        self._event_filter = event_filter
+        self._raw_event_callback = raw_event_callback
+        self._buffer = bytearray()
+
+    @property
+    def buffer(self) -> bytes:
+        return bytes(self._buffer)
+
+    def feed(self, data: bytes) -> None:
+        self._buffer += data
+        consumed = _parse_frames(
+            self._buffer,
+            self._event_callback,
+            self._response_callback,
+            self._event_filter,
+            self._raw_event_callback,
+        )
+        if consumed:
+            del self._buffer[:consumed]
+
+    def clear(self) -> None:
+        self._buffer.clear()
+
+
+class FrameBuffer:
+    """Split an AMI stream into raw frames, without parsing them"""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        frames = []
+        start = 0
+        while True:
+            end, next_start = _find_frame_end(self._buffer, start)
+            if end == -1:
+                break
+            frames.append(bytes(self._buffer[start:end]))
+            start = next_start
+        if start:
+            del self._buffer[:start]
+        return frames
+
+    def clear(self) -> None:
+        self._buffer.clear()
+
+
+class ParsedMessage(NamedTuple):
+    type: Literal['event', 'response']
+    name: str
+    action_id: str | None
+    headers: dict[str, Any]
+    output: list[str]
+
+
+def iter_messages(chunks: Iterable[bytes]) -> Iterator[ParsedMessage]:
+    """Parse a stream of AMI data, yielding each message once it is complete.
+
+    `chunks` may be split anywhere, e.g. socket reads, `iter_content` of an
+    AJAM response or file reads. Data left when `chunks` is exhausted is
+    parsed as a last message. Command output, with either the `Output:` or
+    the `Response: Follows` format, is returned in the `output` field.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end, next_start = _find_frame_end(buffer, start)
+            if end == -1:
+                break
+            message = _parse_message(buffer[start:end])
+            start = next_start
+            if message is not None:
+                yield message
+        if start:
+            del buffer[:start]
+
+    remaining = bytes(buffer).rstrip(LINE_DELIMITER)
+    if remaining:
+        message = _parse_message(remaining)
+        if message is not None:
+            yield message
+
+
+def _parse_message(frame: bytes | bytearray) -> ParsedMessage | None:
+    try:
+        if frame.startswith(FOLLOWS_RESPONSE):
+            headers, output = _parse_follows_frame(frame)
+        else:
+            headers = parse_frame_headers(frame)
+            output = _get_output(frame) if 'Output' in headers else []
+    except AMIParsingError as e:
+        logger.exception('Could not parse message: %s', e)
+        return None
+
+    first_header, first_value = next(iter(headers.items()))
+    if first_header.startswith('Event'):
+        type_: Literal['event', 'response'] = 'event'
+    elif first_header.startswith('Response'):
+        type_ = 'response'
+    else:
+        logger.error('Could not parse message: unexpected first header: %r', frame)
+        return None
+    return ParsedMessage(type_, first_value, headers.get('ActionID'), headers, output)
+
+
+def _get_output(frame: bytes | bytearray) -> list[str]:
+    lines = frame.decode('utf8', 'replace').split('\r\n')
+    return [line[8:] for line in lines if line.startswith('Output: ')]
+
+
+def _parse_follows_frame(
+    frame: bytes | bytearray,
+) -> tuple[dict[str, Any], list[str]]:
+    lines = frame.decode('utf8', 'replace').splitlines()
+    if lines and lines[-1] == END_COMMAND.decode():
+        lines.pop()
+
+    headers: dict[str, Any] = {}
+    for index, line in enumerate(lines):
+        header, separator, value = line.partition(': ')
+        if not separator or header not in FOLLOWS_HEADERS:
+            return headers, lines[index:]
+        headers[header] = value
+    return headers, []
+
+
+def _find_frame_end(buffer: bytes | bytearray, start: int) -> tuple[int, int]:
+    """Return the end of the frame at `start` and the start of the next one"""
+    if buffer.startswith(FOLLOWS_RESPONSE, start):
+        end = buffer.find(END_COMMAND + MESSAGE_DELIMITER, start)
+        if end == -1:
+            return -1, -1
+        end += len(END_COMMAND)
+    else:
+        end = buffer.find(MESSAGE_DELIMITER, start)
+        if end == -1:
+            return -1, -1
+    return end, end + len(MESSAGE_DELIMITER)
+
+
+def get_frame_header(frame: bytes, header: bytes) -> bytes | None:
+    prefix = header + b': '
+    if frame.startswith(prefix):
+        start = len(prefix)
+    else:
+        start = frame.find(LINE_DELIMITER + prefix)
+        if start == -1:
+            return None
+        start += len(LINE_DELIMITER) + len(prefix)
+    end = frame.find(LINE_DELIMITER, start)
+    return frame[start:] if end == -1 else frame[start:end]
+
+
 def parse_buffer(
     raw_buffer: bytes,
     event_callback: ParserCallback,
     response_callback: ParserCallback | None,
 ) -> bytes:
-    unparsed_buffer = raw_buffer
-    while unparsed_buffer:
-        head, sep, unparsed_buffer = unparsed_buffer.partition(b'\r\n\r\n')
-        if not sep:
-            unparsed_buffer = head
+    consumed = _parse_frames(raw_buffer, event_callback, response_callback)
+    return raw_buffer[consumed:]
+
+
+def _parse_frames(
+    buffer: bytes | bytearray,
+    event_callback: ParserCallback,
+    response_callback: ParserCallback | None,
+    event_filter: EventFilter | None = None,
+    raw_event_callback: RawEventCallback | None = None,
+) -> int:
+    peek_event_name = event_filter is not None or raw_event_callback is not None
+    start = 0
+    while True:
+        end, next_start = _find_frame_end(buffer, start)
+        if end == -1:
             break
 
-        try:
-            _parse_msg(head, event_callback, response_callback)
-        except AMIParsingError as e:
-            logger.exception('Could not parse message: %s', e)
+        frame_start, start = start, next_start
+        event_name = (
+            _get_event_name(buffer, frame_start, end) if peek_event_name else None
+        )
+        if event_name is not None:
+            if event_filter is not None and not event_filter.accepts(event_name):
+                continue
+            if raw_event_callback is not None:
+                raw_event_callback(event_name, bytes(buffer[frame_start:end]))
+                continue
+
+        message = _parse_message(buffer[frame_start:end])
+        if message is None:
             continue
+        callback = event_callback if message.type == 'event' else response_callback
+        if callback is not None:
+            callback(message.name, message.action_id, message.headers)
+
+    return start
+
 
-    return unparsed_buffer
+def _get_event_name(buffer: bytes | bytearray, start: int, end: int) -> str | None:
+    line_end = buffer.find(LINE_DELIMITER, start, end)
+    if line_end == -1:
+        line_end = end
+    first_line = buffer[start:line_end]
+    if not first_line.startswith(b'Event'):
+        return None
+
+    try:
+        header, event_name = _parse_line(first_line.decode('utf8', 'replace'))
+    except AMIParsingError:
+        return None
+    if header != 'Event':
+        return None
+    return event_name
 
 
 def parse_command_response(raw_buffer: bytes) -> list[str]:
-    lines = raw_buffer.decode('utf8', 'replace').split('\r\n')
-    return [line[8:] for line in lines if line.startswith('Output: ')]
+    return [line for message in iter_messages([raw_buffer]) for line in message.output]
 
 
-def _parse_msg(
-    data: bytes,
-    event_callback: ParserCallback,
-    response_callback: ParserCallback | None,
-) -> None:
+def parse_frame_headers(data: bytes | bytearray) -> dict[str, Any]:
+    if data.startswith(FOLLOWS_RESPONSE):
+        headers, _ = _parse_follows_frame(data)
+        return headers
+
     lines = data.decode('utf8', 'replace').split('\r\n')
 
     try:
         first_header, first_value = _parse_line(lines.pop(0))
         headers: dict[str, Any] = _parse_msg_body(lines, first_header, first_value)  # type: ignore
     except AMIParsingError as e:
-        raise AMIParsingError(f'unexpected data: {data!r}. Details: {e}')
-
-    if first_header.startswith('Event'):
-        callback: ParserCallback | None = event_callback
-    elif first_header.startswith('Response'):
-        callback = response_callback
-    else:
-        raise AMIParsingError('unexpected first header: %r' % data)
-
-    if callback is not None:
-        callback(first_value, headers.get('ActionID'), dict(headers.items()))
+        raise AMIParsingError(f'unexpected data: {bytes(data)!r}. Details: {e}')
+    return headers
 
 
 def _parse_msg_body(
@@ -77,24 +367,44 @@ def _parse_msg_body(
 ) -> dict[str, str] | ChanVariableDict:
     headers: dict[str, str] = {}
     chan_variables: dict[str, str] = {}
+    lookup_name = _header_names.lookup_function()
+    lookup_value = _header_values.lookup_function()
+    value_lookups = 0
 
     headers[first_header] = first_value
     for line in lines:
-        header, value = _parse_line(line)
+        header, separator, value = line.partition(': ')
+        if not separator:
+            header, value = _split_line(line)
+        interned = lookup_name(header)
+        header = interned if interned is not None else _header_names.add(header)
         if header == 'ChanVariable':
             variable, value = _parse_chan_variable(value)
             chan_variables[variable] = value
-        else:
-            headers[header] = value
+            continue
+        if header in INTERNED_VALUE_HEADERS:
+            value_lookups += 1
+            interned = lookup_value(value)
+            value = interned if interned is not None else _header_values.add(value)
+        headers[header] = value
 
+    _header_names.count_lookups(len(lines))
+    _header_values.count_lookups(value_lookups)
     if chan_variables:
         headers['ChanVariable'] = chan_variables  # type: ignore
 
     return headers
 
 
-@functools.lru_cache(maxsize=8192)
 def _parse_line(line: str) -> tuple[str, str]:
+    header, value = _split_line(line)
+    header = _header_names.intern(header)
+    if header in INTERNED_VALUE_HEADERS:
+        value = _header_values.intern(value)
+    return header, value
+
+
+def _split_line(line: str) -> tuple[str, str]:
     try:
         header, value = line.split(': ', 1)
     except ValueError:
@@ -105,10 +415,9 @@ def _parse_line(line: str) -> tuple[str, str]:
     return header, value
 
 
-@functools.lru_cache(maxsize=8192)
 def _parse_chan_variable(chan_variable: str) -> tuple[str, str]:
     try:
         variable, value = chan_variable.split('=', 1)
     except ValueError:
         raise AMIParsingError('unexpected channel variable: %r' % chan_variable)
-    return variable, value
+    return _header_names.intern(variable), value
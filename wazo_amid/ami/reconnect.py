@@ -0,0 +1,117 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from typing import Any
+
+from wazo_amid import metrics
+
+
+class ReconnectBackoff:
+    """Delays between the reconnection attempts of an AMI client.
+
+    The first attempt after losing a healthy connection is immediate. The
+    next ones wait `min_delay`, then `multiplier` times longer each time, up
+    to `max_delay`, minus a random part of up to `jitter` of the delay so that
+    several wazo-amid do not reconnect all at once. A connection is healthy
+    once Asterisk sent FullyBooted, or after `max_delay` seconds, so that an
+    Asterisk closing connections while booting is not retried in a loop.
+    """
+
+    def __init__(
+        self,
+        name: str | None = None,
+        min_delay: float = 0.5,
+        max_delay: float = 30,
+        multiplier: float = 2,
+        jitter: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self._node = name or ''
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._clock = clock
+        self._random = rand
+        self._attempts = 0
+        self._next_delay = 0.0
+        self._connected_at: float | None = None
+        self._fully_booted = False
+        self._lost_at: float | None = None
+        self._disconnected_seconds = 0.0
+        self._last_connected: datetime | None = None
+        self._last_disconnected: datetime | None = None
+        self._last_fully_booted: datetime | None = None
+
+    @property
+    def fully_booted(self) -> bool:
+        return self._fully_booted
+
+    def connected(self) -> None:
+        if self._connected_at is not None:
+            return
+        now = self._clock()
+        self._connected_at = now
+        self._fully_booted = False
+        self._last_connected = datetime.now(timezone.utc)
+        if self._lost_at is not None:
+            outage = now - self._lost_at
+            metrics.ami_outage_seconds.observe(outage, self._node)
+            self._disconnected_seconds += outage
+            self._lost_at = None
+
+    def booted(self) -> None:
+        """Asterisk sent FullyBooted on the current connection"""
+        if self._fully_booted or self._connected_at is None:
+            return
+        self._fully_booted = True
+        self._last_fully_booted = datetime.now(timezone.utc)
+        metrics.ami_fully_booted_seconds.observe(
+            self._clock() - self._connected_at, self._node
+        )
+
+    def disconnected(self) -> float:
+        """Record a lost or refused connection, return the delay before retrying"""
+        now = self._clock()
+        metrics.ami_reconnects.inc(self._node)
+        if self._connected_at is not None:
+            healthy = self._fully_booted or now - self._connected_at >= self._max_delay
+            if healthy:
+                self._attempts = 0
+                self._next_delay = 0.0
+            self._connected_at = None
+            self._fully_booted = False
+        if self._lost_at is None:
+            self._lost_at = now
+            self._last_disconnected = datetime.now(timezone.utc)
+
+        self._attempts += 1
+        delay = self._next_delay
+        self._next_delay = min(
+            max(delay * self._multiplier, self._min_delay), self._max_delay
+        )
+        return delay * (1 - self._jitter * self._random())
+
+    def status(self) -> dict[str, Any]:
+        disconnected_seconds = self._disconnected_seconds
+        if self._lost_at is not None:
+            disconnected_seconds += self._clock() - self._lost_at
+        return {
+            'attempts': self._attempts,
+            'fully_booted': self._fully_booted,
+            'disconnected_seconds': disconnected_seconds,
+            'last_connected': _isoformat(self._last_connected),
+            'last_disconnected': _isoformat(self._last_disconnected),
+            'last_fully_booted': _isoformat(self._last_fully_booted),
+        }
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
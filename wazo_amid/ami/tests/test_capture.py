@@ -0,0 +1,87 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_length
+
+from wazo_amid.ami.capture import CaptureWriter, capture_files, read_capture
+
+
+class TestCapture(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def read_all(self) -> list[tuple[float, bytes]]:
+        return [
+            chunk
+            for path in capture_files(self.directory)
+            for chunk in read_capture(path)
+        ]
+
+    def test_chunks_read_back_with_their_reception_time(self) -> None:
+        writer = CaptureWriter(self.directory, 'node-1')
+
+        writer.write(1.5, b'Event: Hangup\r\n')
+        writer.write(2.25, b'Channel: PJSIP/foo\r\n\r\n')
+        writer.close()
+
+        assert_that(
+            self.read_all(),
+            contains_exactly(
+                (1.5, b'Event: Hangup\r\n'), (2.25, b'Channel: PJSIP/foo\r\n\r\n')
+            ),
+        )
+
+    def test_files_rotated_and_oldest_removed(self) -> None:
+        writer = CaptureWriter(self.directory, 'node-1', max_file_size=50, max_files=2)
+
+        for index in range(10):
+            writer.write(float(index), b'x' * 40)
+        writer.close()
+
+        assert_that(capture_files(self.directory), has_length(2))
+        assert_that(
+            [received_at for received_at, _ in self.read_all()],
+            contains_exactly(8.0, 9.0),
+        )
+
+    def test_unclosed_file_read_until_last_flush(self) -> None:
+        now = [0.0]
+        writer = CaptureWriter(self.directory, clock=lambda: now[0])
+        writer.write(1.0, b'first')
+        now[0] = 2.0
+        writer.write(2.0, b'second')
+
+        (path,) = capture_files(self.directory)
+        assert_that(list(read_capture(path)), has_length(2))
+        writer.close()
+
+    def test_prefix_made_safe_for_file_names(self) -> None:
+        writer = CaptureWriter(self.directory, '10.0.0.1:5038')
+        writer.write(1.0, b'data')
+        writer.close()
+
+        (filename,) = os.listdir(self.directory)
+        assert_that(filename.startswith('10.0.0.1_5038-'), equal_to(True))
+
+    def test_rotation_keeps_files_of_other_prefixes(self) -> None:
+        other = CaptureWriter(self.directory, 'node')
+        other.write(1.0, b'data')
+        other.close()
+        writer = CaptureWriter(self.directory, 'node-1', max_file_size=10, max_files=1)
+
+        for index in range(3):
+            writer.write(float(index), b'x' * 20)
+        writer.close()
+
+        assert_that(capture_files(self.directory, 'node'), has_length(1))
+        assert_that(capture_files(self.directory, 'node-1'), has_length(1))
@@ -5,14 +5,26 @@ from __future__ import annotations
 
 import socket
 import unittest
+from collections import defaultdict
 from collections.abc import Callable
 from functools import wraps
 from typing import TYPE_CHECKING, Any
 from unittest.mock import Mock, patch, sentinel
 
-from hamcrest import assert_that, empty, equal_to, instance_of
-
-from wazo_amid.ami.client import AMIClient, AMIConnectionError
+from hamcrest import (
+    assert_that,
+    empty,
+    equal_to,
+    has_entries,
+    has_key,
+    instance_of,
+    not_,
+    same_instance,
+)
+from xivo.status import Status
+
+from wazo_amid.ami.client import AMIClient, AMIConnectionError, LazyMessage
+from wazo_amid.ami.liveness import LivenessMonitor
 
 if TYPE_CHECKING:
     from typing import ParamSpec
@@ -85,6 +97,67 @@ class TestAMIClient(unittest.TestCase):
 
         mock_socket.sendall.assert_called_once_with(expected_data)
 
+    @patch_return_value('socket.socket')
+    def test_given_event_mask_and_filters_when_connect_and_login_then_sent_after_login(
+        self, mock_socket: Mock
+    ) -> None:
+        ami_client = AMIClient(
+            self.hostname,
+            self.username,
+            self.password,
+            self.port,
+            event_mask='call,agent',
+            filters=['!Event: VarSet', 'Event: Hangup'],
+        )
+        expected_data = (
+            b'Action: Login\r\n'
+            b'Username: username\r\n'
+            b'Secret: password\r\n'
+            b'\r\n'
+            b'Action: Events\r\n'
+            b'EventMask: call,agent\r\n'
+            b'\r\n'
+            b'Action: Filter\r\n'
+            b'Operation: Add\r\n'
+            b'Filter: !Event: VarSet\r\n'
+            b'\r\n'
+            b'Action: Filter\r\n'
+            b'Operation: Add\r\n'
+            b'Filter: Event: Hangup\r\n'
+            b'\r\n'
+        )
+
+        ami_client.connect_and_login()
+        ami_client.disconnect()
+        ami_client.connect_and_login()
+
+        assert_that(mock_socket.sendall.call_count, equal_to(2))
+        mock_socket.sendall.assert_called_with(expected_data)
+
+    @patch_return_value('socket.socket')
+    def test_given_startup_actions_when_connect_and_login_then_sent_after_login(
+        self, mock_socket: Mock
+    ) -> None:
+        ami_client = AMIClient(
+            self.hostname,
+            self.username,
+            self.password,
+            self.port,
+            startup_actions=[{'Action': 'CoreShowChannels', 'ActionID': 'resync'}],
+        )
+
+        ami_client.connect_and_login()
+
+        mock_socket.sendall.assert_called_once_with(
+            b'Action: Login\r\n'
+            b'Username: username\r\n'
+            b'Secret: password\r\n'
+            b'\r\n'
+            b'Action: CoreShowChannels\r\n'
+            b'ActionID: resync\r\n'
+            b'\r\n'
+        )
+
     @patch_return_value('socket.socket')
     def test_given_recv_socket_error_when_connect_and_login_then_amiconnectionerror_raised(
         self, mock_socket: Mock
@@ -154,7 +227,7 @@ class TestAMIClient(unittest.TestCase):
         self, mock_socket: Mock
     ) -> None:
         self.ami_client.connect_and_login()
-        self.ami_client._buffer = b'Event: '
+        self.ami_client._parser.feed(b'Event: ')
         mock_socket.recv.return_value = b'complete\r\n\r\ndata\r\n\r\n'
 
         messages = self.ami_client.parse_next_messages()
@@ -210,3 +283,179 @@ class TestAMIClient(unittest.TestCase):
 
         mock_socket.shutdown.assert_called_once_with(socket.SHUT_RDWR)
         mock_socket.close.assert_called_once_with()
+
+    @patch_return_value('socket.socket')
+    def test_given_event_filter_when_parse_next_messages_then_filtered_events_dropped(
+        self, mock_socket: Mock
+    ) -> None:
+        ami_client = AMIClient(
+            self.hostname,
+            self.username,
+            self.password,
+            self.port,
+            event_filter={'allow': [], 'deny': ['VarSet']},
+        )
+        ami_client.connect_and_login()
+        mock_socket.recv.return_value = b'Event: VarSet\r\n\r\nEvent: Hangup\r\n\r\n'
+
+        messages = ami_client.parse_next_messages()
+        status: defaultdict = defaultdict(dict)
+        ami_client.provide_status(status)
+
+        assert_that([message.name for message in messages], equal_to(['Hangup']))
+        assert_that(status['ami_event_filter'], has_entries(dropped={'VarSet': 1}))
+
+    def test_given_no_event_filter_when_provide_status_then_no_filter_status(
+        self,
+    ) -> None:
+        status: defaultdict = defaultdict(dict)
+
+        self.ami_client.provide_status(status)
+
+        assert_that(status, not_(has_key('ami_event_filter')))
+
+    @patch_return_value('socket.socket')
+    def test_given_name_when_parse_next_messages_then_messages_tagged_with_node(
+        self, mock_socket: Mock
+    ) -> None:
+        ami_client = AMIClient(
+            self.hostname, self.username, self.password, self.port, name='node-1'
+        )
+        ami_client.connect_and_login()
+        mock_socket.recv.return_value = b'Event: Hangup\r\n\r\n'
+
+        messages = ami_client.parse_next_messages()
+
+        assert_that([message.node for message in messages], equal_to(['node-1']))
+
+    @patch_return_value('socket.socket')
+    def test_given_several_nodes_when_provide_status_then_any_failure_reported(
+        self, mock_socket: Mock
+    ) -> None:
+        connected = AMIClient(
+            self.hostname, self.username, self.password, self.port, name='node-1'
+        )
+        disconnected = AMIClient(
+            self.hostname, self.username, self.password, self.port, name='node-2'
+        )
+        connected.connect_and_login()
+        status: defaultdict = defaultdict(dict)
+
+        disconnected.provide_status(status)
+        connected.provide_status(status)
+
+        assert_that(
+            status['ami_socket'],
+            has_entries(
+                status=Status.fail,
+                nodes=has_entries(
+                    {
+                        'node-1': has_entries(status=Status.ok),
+                        'node-2': has_entries(status=Status.fail),
+                    }
+                ),
+            ),
+        )
+
+    @patch_return_value('socket.socket')
+    def test_given_capture_when_parse_next_messages_then_data_captured(
+        self, mock_socket: Mock
+    ) -> None:
+        capture = Mock()
+        ami_client = AMIClient(
+            self.hostname, self.username, self.password, self.port, capture=capture
+        )
+        ami_client.connect_and_login()
+        data = b'Event: Hangup\r\n\r\n'
+        mock_socket.recv.return_value = data
+
+        messages = ami_client.parse_next_messages()
+
+        capture.write.assert_called_once_with(messages[0].received_at, data)
+
+    @patch_return_value('socket.socket')
+    def test_given_fully_booted_event_when_parse_next_messages_then_backoff_notified(
+        self, mock_socket: Mock
+    ) -> None:
+        self.ami_client.connect_and_login()
+        mock_socket.recv.return_value = b'Event: FullyBooted\r\nStatus: ok\r\n\r\n'
+
+        self.ami_client.parse_next_messages()
+
+        assert_that(self.ami_client.backoff.fully_booted, equal_to(True))
+
+    @patch_return_value('socket.socket')
+    def test_given_tcp_keepalive_when_connect_and_login_then_socket_options_set(
+        self, mock_socket: Mock
+    ) -> None:
+        ami_client = AMIClient(
+            self.hostname,
+            self.username,
+            self.password,
+            self.port,
+            ping_interval=30,
+            ping_timeout=10,
+            tcp_keepalive={'enabled': True, 'idle': 60, 'interval': 10, 'count': 3},
+        )
+
+        ami_client.connect_and_login()
+
+        mock_socket.setsockopt.assert_any_call(
+            socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1
+        )
+        mock_socket.setsockopt.assert_any_call(
+            socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3
+        )
+        mock_socket.settimeout.assert_called_once_with(10)
+
+    @patch_return_value('socket.socket')
+    def test_given_recv_timeout_and_ping_due_when_parse_next_messages_then_ping_sent(
+        self, mock_socket: Mock
+    ) -> None:
+        self.ami_client.connect_and_login()
+        self.ami_client.liveness = liveness = Mock(LivenessMonitor)
+        liveness.expired.return_value = False
+        liveness.ping_due.return_value = True
+        liveness.ping_sent.return_value = 'wazo-amid-ping-1'
+        mock_socket.recv.side_effect = [
+            socket.timeout,
+            b'Response: Success\r\nActionID: wazo-amid-ping-1\r\nPing: Pong\r\n\r\n',
+        ]
+
+        messages = self.ami_client.parse_next_messages()
+
+        assert_that(messages, empty())
+        mock_socket.sendall.assert_called_with(
+            b'Action: Ping\r\nActionID: wazo-amid-ping-1\r\n\r\n'
+        )
+        liveness.response_received.assert_called_once_with('wazo-amid-ping-1')
+
+    @patch_return_value('socket.socket')
+    def test_given_recv_timeout_and_ping_expired_when_parse_next_messages_then_raise_amiconnectionerror(
+        self, mock_socket: Mock
+    ) -> None:
+        self.ami_client.connect_and_login()
+        self.ami_client.liveness = liveness = Mock(LivenessMonitor, ping_timeout=10)
+        liveness.expired.return_value = True
+        mock_socket.recv.side_effect = socket.timeout
+
+        self.assertRaises(AMIConnectionError, self.ami_client.parse_next_messages)
+
+
+class TestLazyMessage(unittest.TestCase):
+    @patch('wazo_amid.ami.parser.parse_frame_headers')
+    def test_when_created_then_headers_not_parsed(
+        self, parse_frame_headers: Mock
+    ) -> None:
+        message = LazyMessage('Hangup', b'Event: Hangup\r\nChannel: PJSIP/foo')
+
+        assert_that(message.name, equal_to('Hangup'))
+        parse_frame_headers.assert_not_called()
+
+    def test_when_headers_then_parsed_once(self) -> None:
+        message = LazyMessage('Hangup', b'Event: Hangup\r\nChannel: PJSIP/foo')
+
+        headers = message.headers
+
+        assert_that(headers, equal_to({'Event': 'Hangup', 'Channel': 'PJSIP/foo'}))
+        assert_that(message.headers, same_instance(headers))
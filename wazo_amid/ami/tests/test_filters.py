@@ -0,0 +1,41 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+
+from hamcrest import assert_that, equal_to
+
+from wazo_amid.ami.filters import EventFilter
+
+
+class TestEventFilter(unittest.TestCase):
+    def test_given_no_lists_then_disabled_and_accept_all(self) -> None:
+        event_filter = EventFilter()
+
+        assert_that(event_filter.enabled, equal_to(False))
+        assert_that(event_filter.accepts('VarSet'), equal_to(True))
+
+    def test_given_deny_list_then_denied_events_dropped(self) -> None:
+        event_filter = EventFilter(deny=['VarSet', 'RTCP*'])
+
+        assert_that(event_filter.accepts('VarSet'), equal_to(False))
+        assert_that(event_filter.accepts('RTCPSent'), equal_to(False))
+        assert_that(event_filter.accepts('Hangup'), equal_to(True))
+
+    def test_given_allow_list_then_only_allowed_events_kept(self) -> None:
+        event_filter = EventFilter(allow=['Hangup', 'Bridge*'], deny=['BridgeInfo*'])
+
+        assert_that(event_filter.accepts('Hangup'), equal_to(True))
+        assert_that(event_filter.accepts('BridgeEnter'), equal_to(True))
+        assert_that(event_filter.accepts('BridgeInfoComplete'), equal_to(False))
+        assert_that(event_filter.accepts('Newexten'), equal_to(False))
+
+    def test_when_events_dropped_then_counted_per_name(self) -> None:
+        event_filter = EventFilter(deny=['VarSet', 'Newexten'])
+
+        for name in ('VarSet', 'VarSet', 'Newexten', 'Hangup'):
+            event_filter.accepts(name)
+
+        assert_that(event_filter.dropped(), equal_to({'VarSet': 2, 'Newexten': 1}))
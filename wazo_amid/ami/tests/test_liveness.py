@@ -0,0 +1,88 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+
+from hamcrest import assert_that, equal_to, has_entries
+
+from wazo_amid.ami.liveness import LivenessMonitor
+
+
+class TestLivenessMonitor(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.liveness = LivenessMonitor(
+            'node-1', ping_interval=30, ping_timeout=10, clock=lambda: self.now
+        )
+        self.liveness.connected()
+
+    def test_ping_due_after_interval_without_data(self) -> None:
+        self.now += 20
+        self.liveness.received(self.now)
+        self.now += 29
+
+        assert_that(self.liveness.ping_due(), equal_to(False))
+        assert_that(self.liveness.next_check(), equal_to(1))
+
+        self.now += 1
+
+        assert_that(self.liveness.ping_due(), equal_to(True))
+
+    def test_given_ping_answered_then_round_trip_time_reported(self) -> None:
+        self.now += 30
+        action_id = self.liveness.ping_sent()
+        self.now += 0.5
+        self.liveness.received(self.now)
+        self.liveness.response_received(action_id)
+
+        assert_that(self.liveness.status(), has_entries(ping_rtt=0.5))
+        assert_that(self.liveness.ping_due(), equal_to(False))
+
+    def test_given_nothing_received_after_ping_then_expired(self) -> None:
+        self.now += 30
+        self.liveness.ping_sent()
+        self.now += 9
+
+        assert_that(self.liveness.expired(), equal_to(False))
+
+        self.now += 1
+
+        assert_that(self.liveness.expired(), equal_to(True))
+        assert_that(self.liveness.status(), has_entries(ping_timeouts=1))
+
+    def test_given_data_received_after_ping_then_deadline_extended(self) -> None:
+        self.now += 30
+        self.liveness.ping_sent()
+        self.now += 5
+        self.liveness.received(self.now)
+        self.now += 9
+
+        assert_that(self.liveness.expired(), equal_to(False))
+        assert_that(self.liveness.next_check(), equal_to(1))
+
+    def test_given_resumed_after_pause_then_deadline_restarted(self) -> None:
+        self.now += 30
+        self.liveness.ping_sent()
+        self.now += 60
+        self.liveness.resumed()
+
+        assert_that(self.liveness.expired(), equal_to(False))
+        self.now += 10
+        assert_that(self.liveness.expired(), equal_to(True))
+
+    def test_given_other_response_then_ping_still_pending(self) -> None:
+        self.now += 30
+        self.liveness.ping_sent()
+        self.liveness.response_received('other-action')
+        self.now += 10
+
+        assert_that(self.liveness.expired(), equal_to(True))
+
+    def test_given_no_interval_then_ping_never_due(self) -> None:
+        liveness = LivenessMonitor(clock=lambda: self.now)
+        self.now += 3600
+
+        assert_that(liveness.ping_due(), equal_to(False))
+        assert_that(liveness.poll_interval, equal_to(None))
@@ -7,9 +7,19 @@ import textwrap
 import unittest
 from unittest.mock import Mock
 
-from hamcrest import assert_that, contains_exactly, equal_to
-
-from wazo_amid.ami.parser import parse_buffer, parse_command_response
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries, same_instance
+
+from wazo_amid.ami.filters import EventFilter
+from wazo_amid.ami.parser import (
+    AMIParsingError,
+    InternTable,
+    ParsedMessage,
+    StreamParser,
+    iter_messages,
+    parse_buffer,
+    parse_command_response,
+    parse_frame_headers,
+)
 
 MESSAGE_DELIMITER = b'\r\n\r\n'
 EVENT_DELIMITER = b'Event: '
@@ -188,3 +198,251 @@ class TestParser(unittest.TestCase):
 
         assert_that(self.mock_event_callback.call_count, equal_to(1))
         assert_that(self.mock_response_callback.call_count, equal_to(0))
+
+
+class TestStreamParser(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mock_event_callback = Mock()
+        self.mock_response_callback = Mock()
+        self.parser = StreamParser(
+            self.mock_event_callback, self.mock_response_callback
+        )
+
+    def test_given_incomplete_message_when_feed_then_data_kept(self) -> None:
+        self.parser.feed(b'Event: foo\r\n')
+
+        assert_that(self.parser.buffer, equal_to(b'Event: foo\r\n'))
+        assert_that(self.mock_event_callback.call_count, equal_to(0))
+
+    def test_given_message_split_across_feeds_when_feed_then_callback(self) -> None:
+        self.parser.feed(b'Event: foo\r\nBar: ba')
+        self.parser.feed(b'z\r\n\r')
+        self.parser.feed(b'\nEvent: next')
+
+        self.mock_event_callback.assert_called_once_with(
+            'foo', None, {'Event': 'foo', 'Bar': 'baz'}
+        )
+        assert_that(self.parser.buffer, equal_to(b'Event: next'))
+
+    def test_given_many_messages_when_feed_then_callbacks_in_order(self) -> None:
+        data = b''.join(
+            EVENT_DELIMITER + str(i).encode() + MESSAGE_DELIMITER for i in range(5)
+        )
+
+        self.parser.feed(data)
+
+        assert_that(
+            [c.args[0] for c in self.mock_event_callback.call_args_list],
+            contains_exactly('0', '1', '2', '3', '4'),
+        )
+        assert_that(self.parser.buffer, equal_to(b''))
+
+    def test_given_same_stream_when_feed_then_same_messages_as_parse_buffer(
+        self,
+    ) -> None:
+        stream = (
+            b'Event: a\r\nX: 1\r\nChanVariable: FOO=bar\r\n\r\n'
+            b'Response: Success\r\nActionID: 42\r\n\r\n'
+            b'bogus\r\n\r\n'
+            b'Event: b\r\nY: \xc3\xa9\r\n\r\n'
+            b'Event: incomplete'
+        )
+        expected_event_callback = Mock()
+        expected_response_callback = Mock()
+        remaining = parse_buffer(
+            stream, expected_event_callback, expected_response_callback
+        )
+
+        for i in range(0, len(stream), 7):
+            self.parser.feed(stream[i : i + 7])
+
+        assert_that(
+            self.mock_event_callback.call_args_list,
+            equal_to(expected_event_callback.call_args_list),
+        )
+        assert_that(
+            self.mock_response_callback.call_args_list,
+            equal_to(expected_response_callback.call_args_list),
+        )
+        assert_that(self.parser.buffer, equal_to(remaining))
+
+    def test_when_clear_then_buffer_emptied(self) -> None:
+        self.parser.feed(b'Event: foo')
+
+        self.parser.clear()
+
+        assert_that(self.parser.buffer, equal_to(b''))
+
+    def test_given_event_filter_when_feed_then_filtered_events_skipped(self) -> None:
+        event_filter = EventFilter(deny=['VarSet'])
+        parser = StreamParser(
+            self.mock_event_callback, self.mock_response_callback, event_filter
+        )
+
+        parser.feed(
+            b'Event: VarSet\r\nVariable: FOO\r\n\r\n'
+            b'Event: Hangup\r\nChannel: PJSIP/foo\r\n\r\n'
+            b'Response: Success\r\n\r\n'
+        )
+
+        self.mock_event_callback.assert_called_once_with(
+            'Hangup', None, {'Event': 'Hangup', 'Channel': 'PJSIP/foo'}
+        )
+        assert_that(self.mock_response_callback.call_count, equal_to(1))
+        assert_that(event_filter.dropped(), equal_to({'VarSet': 1}))
+
+    def test_given_raw_event_callback_when_feed_then_events_not_parsed(self) -> None:
+        raw_event_callback = Mock()
+        parser = StreamParser(
+            self.mock_event_callback,
+            self.mock_response_callback,
+            raw_event_callback=raw_event_callback,
+        )
+
+        parser.feed(
+            b'Event: Hangup\r\nChannel: PJSIP/foo\r\n\r\n' b'Response: Success\r\n\r\n'
+        )
+
+        raw_event_callback.assert_called_once_with(
+            'Hangup', b'Event: Hangup\r\nChannel: PJSIP/foo'
+        )
+        assert_that(self.mock_event_callback.call_count, equal_to(0))
+        assert_that(self.mock_response_callback.call_count, equal_to(1))
+
+
+class TestParseFrameHeaders(unittest.TestCase):
+    def test_given_frame_when_parse_frame_headers_then_headers(self) -> None:
+        frame = b'Event: Hangup\r\nChannel: PJSIP/foo\r\nChanVariable: FOO=bar'
+
+        headers = parse_frame_headers(frame)
+
+        assert_that(
+            headers,
+            equal_to(
+                {
+                    'Event': 'Hangup',
+                    'Channel': 'PJSIP/foo',
+                    'ChanVariable': {'FOO': 'bar'},
+                }
+            ),
+        )
+
+    def test_given_invalid_line_when_parse_frame_headers_then_raise(self) -> None:
+        self.assertRaises(
+            AMIParsingError, parse_frame_headers, b'Event: Hangup\r\nbogus'
+        )
+
+    def test_given_two_frames_when_parse_frame_headers_then_strings_shared(
+        self,
+    ) -> None:
+        first = parse_frame_headers(b'Event: Newstate\r\nContext: default')
+        second = parse_frame_headers(b'Event: Newstate\r\nContext: default')
+
+        first_header, second_header = next(iter(first)), next(iter(second))
+        assert_that(second_header, same_instance(first_header))
+        assert_that(second['Context'], same_instance(first['Context']))
+
+
+class TestInternTable(unittest.TestCase):
+    def test_given_known_string_when_intern_then_first_instance_returned(
+        self,
+    ) -> None:
+        table = InternTable(max_size=10)
+        first = ''.join(['Chan', 'nel'])
+        second = ''.join(['Chan', 'nel'])
+
+        table.intern(first)
+
+        assert_that(table.intern(second), same_instance(first))
+        assert_that(table.stats(), has_entries(size=1, hits=1, misses=1, hit_ratio=0.5))
+
+    def test_given_full_table_when_intern_then_string_not_added(self) -> None:
+        table = InternTable(max_size=1)
+        table.intern('Channel')
+
+        table.intern('Uniqueid')
+        table.intern('Uniqueid')
+
+        assert_that(table.stats(), has_entries(size=1, hits=0, misses=3))
+
+    def test_given_empty_string_when_intern_twice_then_hit_counted(self) -> None:
+        table = InternTable(max_size=10)
+
+        table.intern('')
+        table.intern('')
+
+        assert_that(table.stats(), has_entries(size=1, hits=1, misses=1))
+
+
+class TestIterMessages(unittest.TestCase):
+    def test_given_chunks_when_iter_messages_then_message_yielded_once_complete(
+        self,
+    ) -> None:
+        chunks = iter([b'Event: foo\r\nBar: b', b'az\r\n\r\nEvent: ', b'next\r\n\r\n'])
+
+        messages = iter_messages(chunks)
+
+        first = next(messages)
+        assert_that(
+            first,
+            equal_to(
+                ParsedMessage('event', 'foo', None, {'Event': 'foo', 'Bar': 'baz'}, [])
+            ),
+        )
+        assert_that(next(chunks), equal_to(b'next\r\n\r\n'))
+
+    def test_given_response_when_iter_messages_then_response_with_action_id(
+        self,
+    ) -> None:
+        data = b'Response: Success\r\nActionID: 42\r\nMessage: Pong\r\n\r\n'
+
+        (message,) = iter_messages([data])
+
+        assert_that(message.type, equal_to('response'))
+        assert_that(message.name, equal_to('Success'))
+        assert_that(message.action_id, equal_to('42'))
+
+    def test_given_output_lines_when_iter_messages_then_output(self) -> None:
+        data = (
+            b'Response: Success\r\nMessage: Command output follows\r\n'
+            b'Output: line 1\r\nOutput: line 2\r\n\r\n'
+        )
+
+        (message,) = iter_messages([data])
+
+        assert_that(message.output, contains_exactly('line 1', 'line 2'))
+
+    def test_given_follows_response_when_iter_messages_then_output(self) -> None:
+        data = (
+            b'Response: Follows\r\nPrivilege: Command\r\nActionID: 42\r\n'
+            b'Channel: PJSIP/foo\r\n\r\nState: Up\n'
+            b'--END COMMAND--\r\n\r\n'
+            b'Event: Hangup\r\n\r\n'
+        )
+        chunks = [data[i : i + 5] for i in range(0, len(data), 5)]
+
+        follows, hangup = iter_messages(chunks)
+
+        assert_that(
+            follows.headers,
+            equal_to({'Response': 'Follows', 'Privilege': 'Command', 'ActionID': '42'}),
+        )
+        assert_that(follows.action_id, equal_to('42'))
+        assert_that(
+            follows.output, contains_exactly('Channel: PJSIP/foo', '', 'State: Up')
+        )
+        assert_that(hangup.name, equal_to('Hangup'))
+
+    def test_given_data_left_when_chunks_exhausted_then_last_message_yielded(
+        self,
+    ) -> None:
+        messages = list(iter_messages([b'Event: foo\r\n\r\nEvent: bar\r\n']))
+
+        assert_that(
+            [message.name for message in messages], contains_exactly('foo', 'bar')
+        )
+
+    def test_given_invalid_frame_when_iter_messages_then_frame_skipped(self) -> None:
+        messages = list(iter_messages([b'bogus\r\n\r\nEvent: foo\r\n\r\n']))
+
+        assert_that([message.name for message in messages], contains_exactly('foo'))
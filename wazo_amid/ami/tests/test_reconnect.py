@@ -0,0 +1,80 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries
+
+from wazo_amid.ami.reconnect import ReconnectBackoff
+
+
+class TestReconnectBackoff(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.random = 0.0
+        self.backoff = ReconnectBackoff(
+            'node-1',
+            min_delay=1,
+            max_delay=10,
+            multiplier=2,
+            jitter=0.5,
+            clock=lambda: self.now,
+            rand=lambda: self.random,
+        )
+
+    def test_delays_grow_exponentially_up_to_max(self) -> None:
+        delays = [self.backoff.disconnected() for _ in range(7)]
+
+        assert_that(delays, contains_exactly(0.0, 1.0, 2.0, 4.0, 8.0, 10.0, 10.0))
+
+    def test_jitter_removed_from_delay(self) -> None:
+        self.random = 1.0
+        self.backoff.disconnected()
+
+        assert_that(self.backoff.disconnected(), equal_to(0.5))
+
+    def test_given_fully_booted_when_disconnected_then_immediate_retry(self) -> None:
+        for _ in range(4):
+            self.backoff.disconnected()
+        self.backoff.connected()
+        self.backoff.booted()
+
+        assert_that(self.backoff.disconnected(), equal_to(0))
+        assert_that(self.backoff.disconnected(), equal_to(1))
+
+    def test_given_short_connection_not_booted_when_disconnected_then_backoff_continues(
+        self,
+    ) -> None:
+        for _ in range(3):
+            self.backoff.disconnected()
+        self.backoff.connected()
+        self.now += 1
+
+        assert_that(self.backoff.disconnected(), equal_to(4))
+
+    def test_given_long_connection_not_booted_when_disconnected_then_immediate_retry(
+        self,
+    ) -> None:
+        for _ in range(3):
+            self.backoff.disconnected()
+        self.backoff.connected()
+        self.now += 10
+
+        assert_that(self.backoff.disconnected(), equal_to(0))
+
+    def test_disconnected_time_includes_current_outage(self) -> None:
+        self.backoff.connected()
+        self.backoff.disconnected()
+        self.now += 3
+        self.backoff.disconnected()
+        self.now += 2
+        self.backoff.connected()
+        self.backoff.disconnected()
+        self.now += 4
+
+        assert_that(
+            self.backoff.status(),
+            has_entries(attempts=3, fully_booted=False, disconnected_seconds=9),
+        )
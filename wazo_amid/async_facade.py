@@ -0,0 +1,173 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Iterable
+
+from wazo_amid.action_cache import ActionCache
+from wazo_amid.ami.async_client import AsyncAMIClient
+from wazo_amid.ami.client import AMIConnectionError, AnyMessage
+from wazo_amid.bus.client import BusClient
+from wazo_amid.event_queue import EventQueue
+from wazo_amid.state_cache import StateCache
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEventHandlerFacade:
+    """asyncio flavour of EventHandlerFacade.
+
+    Every AMI connection gets a reader task and a ping task in a single event
+    loop. The ping task closes the connection when Asterisk stops answering.
+    Events are handed to the same EventQueue as the threaded facade. Waiting
+    for room in a full queue, waiting for events and publishing them are done
+    in the default executor, so that the loop never blocks.
+    """
+
+    def __init__(
+        self,
+        ami_clients: list[AsyncAMIClient],
+        bus_client: BusClient,
+        event_queue: EventQueue | None = None,
+        state_cache: StateCache | None = None,
+        action_cache: ActionCache | None = None,
+    ) -> None:
+        self._ami_clients = ami_clients
+        self._bus_client = bus_client
+        self._event_queue = event_queue or EventQueue()
+        self._state_cache = state_cache
+        self._action_cache = action_cache
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handoffs: dict[AsyncAMIClient, asyncio.Future[None]] = {}
+        self._main_task: asyncio.Task | None = None
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        try:
+            asyncio.run(self._run())
+        except asyncio.CancelledError:
+            logger.debug('AMI event loop cancelled')
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+            if self._loop is not None and self._main_task is not None:
+                self._loop.call_soon_threadsafe(self._main_task.cancel)
+
+    async def _run(self) -> None:
+        with self._lock:
+            if self._stopping:
+                return
+            self._loop = asyncio.get_running_loop()
+            self._main_task = asyncio.current_task()
+
+        publisher = asyncio.create_task(self._publish_messages_indefinitely())
+        readers = [
+            asyncio.create_task(self._read_messages_indefinitely(ami_client))
+            for ami_client in self._ami_clients
+        ]
+        try:
+            await asyncio.gather(*readers)
+        finally:
+            for reader in readers:
+                reader.cancel()
+            await asyncio.gather(*readers, return_exceptions=True)
+            for ami_client in self._ami_clients:
+                ami_client.stop()
+            self._event_queue.close()
+            await publisher
+
+    async def _read_messages_indefinitely(self, ami_client: AsyncAMIClient) -> None:
+        while True:
+            try:
+                await ami_client.connect_and_login()
+                if self._state_cache is not None:
+                    self._state_cache.reset(ami_client.name)
+                await self._process_messages_indefinitely(ami_client)
+            except AMIConnectionError as e:
+                ami_client.disconnect(reason=e.error)
+                self._forget_state(ami_client)
+                await asyncio.sleep(ami_client.backoff.disconnected())
+            except Exception as e:
+                ami_client.disconnect(reason=f'Unexpected error: {e}')
+                self._forget_state(ami_client)
+                raise
+
+    def _forget_state(self, ami_client: AsyncAMIClient) -> None:
+        if self._state_cache is not None:
+            self._state_cache.disconnected(ami_client.name)
+
+    async def _process_messages_indefinitely(self, ami_client: AsyncAMIClient) -> None:
+        pinger = asyncio.create_task(self._ping_indefinitely(ami_client))
+        try:
+            while True:
+                messages = await ami_client.parse_next_messages()
+                if self._action_cache is not None:
+                    self._action_cache.invalidate(messages)
+                if self._state_cache is None:
+                    await self._hand_off(ami_client, messages)
+                else:
+                    await self._hand_off(ami_client, self._state_cache.update(messages))
+        finally:
+            pinger.cancel()
+
+    async def _hand_off(
+        self, ami_client: AsyncAMIClient, messages: Iterable[AnyMessage]
+    ) -> None:
+        if not self._event_queue.may_block:
+            self._event_queue.put_batch(messages)
+            return
+        loop = asyncio.get_running_loop()
+        handoff = loop.run_in_executor(None, self._event_queue.put_batch, messages)
+        self._handoffs[ami_client] = handoff
+        try:
+            await handoff
+        finally:
+            del self._handoffs[ami_client]
+
+    async def _ping_indefinitely(self, ami_client: AsyncAMIClient) -> None:
+        liveness = ami_client.liveness
+        if not liveness.enabled:
+            return
+        while True:
+            await asyncio.sleep(liveness.next_check())
+            handoff = self._handoffs.get(ami_client)
+            if handoff is not None:
+                # the connection is not read while the event queue is full
+                await asyncio.wait([handoff])
+                liveness.resumed()
+                continue
+            if liveness.expired():
+                logger.error(
+                    'No data received from AMI %s seconds after a Ping',
+                    liveness.ping_timeout,
+                )
+                # the reader then sees the connection closed and reconnects
+                ami_client.disconnect(reason='Ping timeout')
+                return
+            if liveness.ping_due():
+                try:
+                    await ami_client.ping()
+                except AMIConnectionError:
+                    return
+
+    async def _publish_messages_indefinitely(self) -> None:
+        loop = asyncio.get_running_loop()
+        while await loop.run_in_executor(None, self._publish_next_messages):
+            pass
+
+    def _publish_next_messages(self) -> bool:
+        messages = self._event_queue.get_batch()
+        if messages is None:
+            return False
+        logger.debug('Publishing %d messages', len(messages))
+        try:
+            self._bus_client.publish(*messages)
+        except Exception:
+            logger.exception('Could not publish %d messages', len(messages))
+        return True
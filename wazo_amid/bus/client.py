@@ -3,28 +3,114 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import logging
+import time
+from typing import TYPE_CHECKING, Any
 
 from wazo_bus.publisher import BusPublisherWithQueue
 from wazo_bus.resources.ami.event import AMIEvent
 from xivo.status import Status, StatusDict
 
+from .. import metrics
+from ..ami.parser import AMIParsingError
+from .spool import SpoolReplayer
+
 if TYPE_CHECKING:
-    from ..ami.client import Message
+    from ..ami.client import AnyMessage
     from ..config import BusConfigDict
+    from .spool import EventSpool, SpooledEvent
+
+logger = logging.getLogger(__name__)
 
 
 class BusClient(BusPublisherWithQueue):
+    def __init__(
+        self,
+        *args: Any,
+        spool: EventSpool | None = None,
+        spool_replay_rate: float = 1000,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._spool = spool
+        self._spool_replay_rate = spool_replay_rate
+        self._spool_replayer: SpoolReplayer | None = None
+
     @classmethod
-    def from_config(cls, service_uuid: str, bus_config: BusConfigDict) -> BusClient:
+    def from_config(
+        cls,
+        service_uuid: str,
+        bus_config: BusConfigDict,
+        spool: EventSpool | None = None,
+        spool_replay_rate: float = 1000,
+    ) -> BusClient:
         name = 'wazo-amid'
-        return cls(name=name, service_uuid=service_uuid, **bus_config)
+        return cls(
+            name=name,
+            service_uuid=service_uuid,
+            spool=spool,
+            spool_replay_rate=spool_replay_rate,
+            **bus_config,
+        )
+
+    def __enter__(self) -> BusClient:
+        super().__enter__()
+        if self._spool is not None:
+            self._spool_replayer = SpoolReplayer(
+                self._spool,
+                self._publish_event,
+                self.queue_publisher_connected,
+                self._spool_replay_rate,
+            )
+            self._spool_replayer.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._spool_replayer is not None:
+            self._spool_replayer.stop()
+            self._spool_replayer = None
+        if self._spool is not None:
+            self._spool.close()
+        super().__exit__(*args)
 
     def provide_status(self, status: StatusDict) -> None:
         status['bus_publisher']['status'] = (
             Status.ok if self.queue_publisher_connected() else Status.fail
         )
 
-    def publish(self, *messages: Message) -> None:
+    def publish(self, *messages: AnyMessage) -> None:
+        """Queue the events of the messages for publishing, in order.
+
+        Each event is queued on its own with `publish_soon`. The wazo-bus
+        publisher thread then sends them one by one on its AMQP connection.
+        """
+        now = time.monotonic()
+        # once events are spooled, the next ones follow them to keep the order
+        spooled: list[SpooledEvent] | None = None
+        if self._spool is not None and (
+            self._spool.depth or not self.queue_publisher_connected()
+        ):
+            spooled = []
         for message in messages:
-            super().publish_soon(AMIEvent(message.name, message.headers))
+            if message.received_at is not None:
+                metrics.event_publish_latency_seconds.observe(now - message.received_at)
+            try:
+                headers = message.headers
+            except AMIParsingError as e:
+                logger.exception('Could not parse message: %s', e)
+                continue
+            if spooled is None:
+                self._publish_event(message.name, headers, message.node)
+            else:
+                spooled.append((message.name, headers, message.node))
+        if spooled:
+            self._spool.append(spooled)  # type: ignore[union-attr]
+
+    def _publish_event(
+        self, name: str, headers: dict[str, Any], node: str | None
+    ) -> None:
+        event = AMIEvent(name, headers)
+        if node is None:
+            super().publish_soon(event)
+        else:
+            super().publish_soon(event, headers={'asterisk_node': node})
@@ -0,0 +1,446 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, BinaryIO, Literal, Optional
+
+if TYPE_CHECKING:
+    from xivo.status import StatusDict
+
+logger = logging.getLogger(__name__)
+
+OverflowPolicy = Literal['drop_oldest', 'drop_newest']
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest')
+
+# event name, headers and asterisk node
+SpooledEvent = tuple[str, dict[str, Any], Optional[str]]
+
+SEGMENT_SUFFIX = '.spool'
+CURSOR_FILENAME = 'cursor'
+WRITE_BUFFER_SIZE = 65536
+
+# payload length and spooling time, followed by the JSON payload
+_RECORD_HEADER = struct.Struct('<Id')
+
+
+class _Segment:
+    def __init__(self, directory: str, sequence: int) -> None:
+        self.sequence = sequence
+        self.path = os.path.join(directory, f'{sequence:020d}{SEGMENT_SUFFIX}')
+        self.size = 0
+        self.count = 0
+        self.last_timestamp = 0.0
+
+
+class EventSpool:
+    """Append-only store of the events that could not be published.
+
+    Events are appended to segment files of about `segment_size` bytes and
+    read back in order. A segment is deleted once read, and the read position
+    in the first segment is saved in a cursor file, so that a restart resumes
+    the replay where it stopped. When the spool would exceed `max_size` bytes,
+    the overflow policy drops either the oldest segment or the new events.
+    Events older than `max_age` seconds are dropped instead of being read.
+
+    The spool is written by the bus publisher and read by a SpoolReplayer,
+    with at most one batch being read at once.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 16777216,
+        max_size: int = 1073741824,
+        max_age: float = 86400,
+        overflow_policy: OverflowPolicy = 'drop_oldest',
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f'unknown overflow policy: {overflow_policy}')
+        if not 0 < segment_size <= max_size:
+            raise ValueError(f'invalid segment size: {segment_size}')
+        self._directory = directory
+        self._segment_size = segment_size
+        self._max_size = max_size
+        self._max_age = max_age
+        self._overflow_policy = overflow_policy
+        self._clock = clock
+        self._segments: list[_Segment] = []
+        self._size = 0
+        self._depth = 0
+        self._next_sequence = 0
+        self._writer: BinaryIO | None = None
+        self._reader: BinaryIO | None = None
+        # position in the first segment, and of the end of the batch being read
+        self._read_offset = 0
+        self._read_count = 0
+        self._pending: tuple[int, int, int] | None = None
+        self._dropped = 0
+        self._expired = 0
+        self._appended = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @property
+    def appended(self) -> int:
+        """Number of events appended since the spool was opened"""
+        return self._appended
+
+    def append(self, events: Iterable[SpooledEvent]) -> None:
+        with self._lock:
+            checkpoint = self._checkpoint()
+            try:
+                for event in events:
+                    self._append(event)
+                if self._writer is not None:
+                    self._writer.flush()
+            except OSError as e:
+                logger.error('Could not write to the event spool: %s', e)
+                self._rollback(checkpoint)
+
+    def read_batch(self, max_events: int) -> list[SpooledEvent]:
+        """Read the next events, they are kept until `commit_batch` is called"""
+        with self._lock:
+            if not self._segments:
+                return []
+
+            segment = self._segments[0]
+            if self._reader is None:
+                self._reader = open(segment.path, 'rb')
+            self._reader.seek(self._read_offset)
+            events: list[SpooledEvent] = []
+            offset = self._read_offset
+            count = self._read_count
+            expired_before = self._clock() - self._max_age if self._max_age else 0
+            while len(events) < max_events and offset < segment.size:
+                try:
+                    timestamp, payload = self._read_record(self._reader)
+                except EOFError:
+                    self._truncate_segment(segment, offset, count)
+                    break
+                offset += _RECORD_HEADER.size + len(payload)
+                count += 1
+                if timestamp < expired_before:
+                    self._expired += 1
+                    continue
+                name, headers, node = json.loads(payload)
+                events.append((name, headers, node))
+            self._pending = (segment.sequence, offset, count)
+            return events
+
+    def commit_batch(self) -> None:
+        with self._lock:
+            if self._pending is None:
+                return
+            sequence, offset, count = self._pending
+            self._pending = None
+            if not self._segments or self._segments[0].sequence != sequence:
+                # the segment was dropped while being read
+                return
+
+            segment = self._segments[0]
+            self._depth -= count - self._read_count
+            self._read_offset = offset
+            self._read_count = count
+            if offset < segment.size:
+                self._save_cursor()
+            elif len(self._segments) > 1:
+                self._remove_first_segment()
+                self._save_cursor()
+            else:
+                self._clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_writer()
+            self._close_reader()
+
+    def provide_status(self, status: StatusDict) -> None:
+        with self._lock:
+            status['event_spool']['depth'] = self._depth
+            status['event_spool']['size'] = self._size
+            status['event_spool']['max_size'] = self._max_size
+            status['event_spool']['segments'] = len(self._segments)
+            status['event_spool']['dropped'] = self._dropped
+            status['event_spool']['expired'] = self._expired
+
+    def _append(self, event: SpooledEvent) -> None:
+        now = self._clock()
+        self._drop_expired_segments(now)
+        payload = json.dumps(event, separators=(',', ':')).encode()
+        record_size = _RECORD_HEADER.size + len(payload)
+        if not self._make_room(record_size):
+            self._dropped += 1
+            return
+
+        segment = self._writable_segment(record_size)
+        assert self._writer is not None
+        self._writer.write(_RECORD_HEADER.pack(len(payload), now))
+        self._writer.write(payload)
+        segment.size += record_size
+        segment.count += 1
+        segment.last_timestamp = now
+        self._size += record_size
+        self._depth += 1
+        self._appended += 1
+
+    def _checkpoint(self) -> tuple[int, int, int, float]:
+        if not self._segments:
+            return -1, 0, 0, 0.0
+        segment = self._segments[-1]
+        return segment.sequence, segment.size, segment.count, segment.last_timestamp
+
+    def _rollback(self, checkpoint: tuple[int, int, int, float]) -> None:
+        # the events of a failed append may be partially written: forget them
+        try:
+            self._close_writer()
+        except OSError:
+            self._writer = None
+        sequence, size, count, last_timestamp = checkpoint
+        while self._segments and self._segments[-1].sequence > sequence:
+            segment = self._segments.pop()
+            if not self._segments:
+                self._close_reader()
+            self._forget_records(segment, 0, 0)
+            try:
+                os.unlink(segment.path)
+            except OSError:
+                pass
+        if self._segments and self._segments[-1].sequence == sequence:
+            segment = self._segments[-1]
+            self._truncate_segment(segment, size, count)
+            segment.last_timestamp = last_timestamp
+
+    def _truncate_segment(self, segment: _Segment, size: int, count: int) -> None:
+        if segment.size > size:
+            logger.error('Event spool: dropping unreadable events of %s', segment.path)
+        self._forget_records(segment, size, count)
+        try:
+            os.truncate(segment.path, size)
+        except OSError as e:
+            logger.error('Could not truncate the event spool: %s', e)
+
+    def _forget_records(self, segment: _Segment, size: int, count: int) -> None:
+        lost = segment.count - count
+        self._dropped += lost
+        self._depth -= lost
+        self._size -= segment.size - size
+        segment.size = size
+        segment.count = count
+
+    def _make_room(self, record_size: int) -> bool:
+        while self._size + record_size > self._max_size:
+            if self._overflow_policy == 'drop_newest' or len(self._segments) < 2:
+                return False
+            self._drop_first_segment()
+        return True
+
+    def _drop_expired_segments(self, now: float) -> None:
+        if not self._max_age:
+            return
+        while (
+            len(self._segments) > 1
+            and self._segments[0].last_timestamp < now - self._max_age
+        ):
+            self._expired += self._segments[0].count - self._read_count
+            self._drop_first_segment(count_as_dropped=False)
+
+    def _drop_first_segment(self, count_as_dropped: bool = True) -> None:
+        dropped = self._segments[0].count - self._read_count
+        logger.warning('Event spool: dropping %d events', dropped)
+        if count_as_dropped:
+            self._dropped += dropped
+        self._depth -= dropped
+        self._remove_first_segment()
+        self._save_cursor()
+
+    def _remove_first_segment(self) -> None:
+        self._close_reader()
+        segment = self._segments.pop(0)
+        self._size -= segment.size
+        self._read_offset = 0
+        self._read_count = 0
+        os.unlink(segment.path)
+
+    def _writable_segment(self, record_size: int) -> _Segment:
+        if (
+            self._writer is None
+            or not self._segments
+            or self._segments[-1].size + record_size > self._segment_size
+        ):
+            self._close_writer()
+            self._segments.append(_Segment(self._directory, self._next_sequence))
+            self._next_sequence += 1
+            self._writer = open(self._segments[-1].path, 'ab', WRITE_BUFFER_SIZE)
+        return self._segments[-1]
+
+    def _clear(self) -> None:
+        # every event was read: start again from empty files
+        self._close_writer()
+        while self._segments:
+            self._remove_first_segment()
+        self._remove_cursor()
+
+    def _save_cursor(self) -> None:
+        if not self._segments or not self._read_offset:
+            self._remove_cursor()
+            return
+        cursor_path = os.path.join(self._directory, CURSOR_FILENAME)
+        tmp_path = f'{cursor_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(f'{self._segments[0].sequence} {self._read_offset}\n')
+        os.replace(tmp_path, cursor_path)
+
+    def _remove_cursor(self) -> None:
+        try:
+            os.unlink(os.path.join(self._directory, CURSOR_FILENAME))
+        except FileNotFoundError:
+            pass
+
+    def _load(self) -> None:
+        sequences = sorted(
+            int(filename[: -len(SEGMENT_SUFFIX)])
+            for filename in os.listdir(self._directory)
+            if filename.endswith(SEGMENT_SUFFIX)
+        )
+        cursor_sequence, cursor_offset = self._load_cursor()
+        for sequence in sequences:
+            segment = _Segment(self._directory, sequence)
+            is_first = not self._segments
+            read_until = (
+                cursor_offset if is_first and sequence == cursor_sequence else 0
+            )
+            self._scan_segment(segment, read_until)
+            if not segment.size:
+                os.unlink(segment.path)
+                continue
+            self._segments.append(segment)
+            self._size += segment.size
+            self._depth += segment.count
+        if self._segments:
+            self._next_sequence = self._segments[-1].sequence + 1
+            self._depth -= self._read_count
+            logger.info('Event spool: %d events to replay', self._depth)
+
+    def _load_cursor(self) -> tuple[int | None, int]:
+        try:
+            with open(os.path.join(self._directory, CURSOR_FILENAME)) as f:
+                sequence, offset = f.read().split()
+            return int(sequence), int(offset)
+        except (OSError, ValueError):
+            return None, 0
+
+    def _scan_segment(self, segment: _Segment, read_until: int) -> None:
+        with open(segment.path, 'r+b') as f:
+            offset = 0
+            while True:
+                try:
+                    timestamp, payload = self._read_record(f)
+                except EOFError:
+                    break
+                offset += _RECORD_HEADER.size + len(payload)
+                segment.count += 1
+                segment.last_timestamp = timestamp
+                if offset <= read_until:
+                    self._read_offset = offset
+                    self._read_count = segment.count
+            # drop a record partially written before a crash
+            f.truncate(offset)
+        segment.size = offset
+
+    @staticmethod
+    def _read_record(f: BinaryIO) -> tuple[float, bytes]:
+        header = f.read(_RECORD_HEADER.size)
+        if len(header) < _RECORD_HEADER.size:
+            raise EOFError()
+        length, timestamp = _RECORD_HEADER.unpack(header)
+        payload = f.read(length)
+        if len(payload) < length:
+            raise EOFError()
+        return timestamp, payload
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+class SpoolReplayer:
+    """Publish the spooled events in order.
+
+    While events are spooled, the new ones are spooled after them to keep the
+    order. So that the spool drains whatever the rate of the new events, they
+    are replayed as they come, on top of at most `rate` events per second of
+    the backlog.
+    """
+
+    INTERVAL = 0.1
+
+    def __init__(
+        self,
+        spool: EventSpool,
+        publish: Callable[[str, dict[str, Any], str | None], None],
+        is_connected: Callable[[], bool],
+        rate: float,
+    ) -> None:
+        self._spool = spool
+        self._publish = publish
+        self._is_connected = is_connected
+        self._batch_size = max(int(rate * self.INTERVAL), 1)
+        self._appended = spool.appended
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._replay_indefinitely, name='spool_replayer'
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _replay_indefinitely(self) -> None:
+        while not self._stop_event.wait(timeout=self.INTERVAL):
+            if not self._spool.depth or not self._is_connected():
+                self._appended = self._spool.appended
+                continue
+            try:
+                self.replay_batch()
+            except Exception:
+                logger.exception('Could not replay the spooled events')
+
+    def replay_batch(self) -> None:
+        # events spooled since the last batch, while connected
+        appended = self._spool.appended
+        remaining = self._batch_size + appended - self._appended
+        self._appended = appended
+        while remaining > 0:
+            events = self._spool.read_batch(min(remaining, self._batch_size))
+            for event in events:
+                self._publish(*event)
+            self._spool.commit_batch()
+            if not events:
+                break
+            remaining -= len(events)
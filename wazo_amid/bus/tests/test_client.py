@@ -0,0 +1,103 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import Mock, patch
+
+from hamcrest import assert_that, contains_exactly, equal_to
+
+from wazo_amid.ami.client import LazyMessage, Message
+from wazo_amid.bus.client import BusClient
+
+
+@patch('wazo_amid.bus.client.BusPublisherWithQueue.publish_soon')
+@patch('wazo_amid.bus.client.AMIEvent')
+class TestBusClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bus_client = BusClient(name='wazo-amid', service_uuid='uuid')
+
+    def test_given_lazy_message_when_publish_then_headers_decoded(
+        self, ami_event: Mock, publish_soon: Mock
+    ) -> None:
+        message = LazyMessage('Hangup', b'Event: Hangup\r\nChannel: PJSIP/foo')
+
+        self.bus_client.publish(message)
+
+        ami_event.assert_called_once_with(
+            'Hangup', {'Event': 'Hangup', 'Channel': 'PJSIP/foo'}
+        )
+        publish_soon.assert_called_once_with(ami_event.return_value)
+
+    def test_given_node_when_publish_then_node_header(
+        self, ami_event: Mock, publish_soon: Mock
+    ) -> None:
+        message = Message('Hangup', {'Event': 'Hangup'}, 'node-1')
+
+        self.bus_client.publish(message)
+
+        publish_soon.assert_called_once_with(
+            ami_event.return_value, headers={'asterisk_node': 'node-1'}
+        )
+
+    def test_given_invalid_lazy_message_when_publish_then_message_skipped(
+        self, ami_event: Mock, publish_soon: Mock
+    ) -> None:
+        invalid = LazyMessage('Hangup', b'Event: Hangup\r\nbogus')
+        valid = Message('Newchannel', {'Event': 'Newchannel'})
+
+        self.bus_client.publish(invalid, valid)
+
+        assert_that(
+            [mock_call.args[0] for mock_call in ami_event.call_args_list],
+            contains_exactly('Newchannel'),
+        )
+        assert_that(publish_soon.call_count, equal_to(1))
+
+
+@patch('wazo_amid.bus.client.BusPublisherWithQueue.queue_publisher_connected')
+@patch('wazo_amid.bus.client.BusPublisherWithQueue.publish_soon')
+@patch('wazo_amid.bus.client.AMIEvent')
+class TestBusClientSpool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.spool = Mock(depth=0)
+        self.bus_client = BusClient(
+            name='wazo-amid', service_uuid='uuid', spool=self.spool
+        )
+
+    def test_given_bus_disconnected_when_publish_then_spooled(
+        self, ami_event: Mock, publish_soon: Mock, connected: Mock
+    ) -> None:
+        connected.return_value = False
+        message = Message('Hangup', {'Event': 'Hangup'}, 'node-1')
+
+        self.bus_client.publish(message)
+
+        self.spool.append.assert_called_once_with(
+            [('Hangup', {'Event': 'Hangup'}, 'node-1')]
+        )
+        publish_soon.assert_not_called()
+
+    def test_given_spooled_events_when_publish_then_spooled_after_them(
+        self, ami_event: Mock, publish_soon: Mock, connected: Mock
+    ) -> None:
+        connected.return_value = True
+        self.spool.depth = 3
+
+        self.bus_client.publish(Message('Hangup', {'Event': 'Hangup'}))
+
+        self.spool.append.assert_called_once_with(
+            [('Hangup', {'Event': 'Hangup'}, None)]
+        )
+        publish_soon.assert_not_called()
+
+    def test_given_bus_connected_and_empty_spool_when_publish_then_published(
+        self, ami_event: Mock, publish_soon: Mock, connected: Mock
+    ) -> None:
+        connected.return_value = True
+
+        self.bus_client.publish(Message('Hangup', {'Event': 'Hangup'}))
+
+        publish_soon.assert_called_once_with(ami_event.return_value)
+        self.spool.append.assert_not_called()
@@ -0,0 +1,199 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from typing import Any
+from unittest.mock import Mock
+
+from hamcrest import (
+    assert_that,
+    contains_exactly,
+    empty,
+    equal_to,
+    greater_than,
+    has_entries,
+)
+
+from wazo_amid.bus.spool import EventSpool, SpooledEvent, SpoolReplayer
+
+
+def event(index: int) -> SpooledEvent:
+    return ('UserEvent', {'Event': 'UserEvent', 'Index': str(index)}, None)
+
+
+class TestEventSpool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.tmp_dir.name
+        self.now = 1000.0
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def spool(self, **kwargs: Any) -> EventSpool:
+        kwargs.setdefault('segment_size', 1000)
+        kwargs.setdefault('max_size', 10000)
+        return EventSpool(self.directory, clock=lambda: self.now, **kwargs)
+
+    def read_all(self, spool: EventSpool) -> list[SpooledEvent]:
+        events: list[SpooledEvent] = []
+        while spool.depth:
+            events.extend(spool.read_batch(7))
+            spool.commit_batch()
+        return events
+
+    def status(self, spool: EventSpool) -> dict[str, Any]:
+        status: dict[str, Any] = {'event_spool': {}}
+        spool.provide_status(status)
+        return status['event_spool']
+
+    def test_events_read_in_order_across_segments(self) -> None:
+        spool = self.spool()
+        events = [event(i) for i in range(100)]
+
+        spool.append(events[:50])
+        spool.append(events[50:])
+
+        assert_that(self.status(spool)['segments'], greater_than(1))
+        assert_that(self.read_all(spool), equal_to(events))
+        assert_that(os.listdir(self.directory), empty())
+
+    def test_uncommitted_batch_read_again(self) -> None:
+        spool = self.spool()
+        spool.append([event(0), event(1)])
+
+        first = spool.read_batch(1)
+        second = spool.read_batch(1)
+
+        assert_that(second, equal_to(first))
+        assert_that(spool.depth, equal_to(2))
+
+    def test_replay_resumed_after_restart(self) -> None:
+        spool = self.spool()
+        spool.append([event(i) for i in range(10)])
+        spool.read_batch(4)
+        spool.commit_batch()
+        spool.read_batch(3)  # not committed
+        spool.close()
+
+        spool = self.spool()
+
+        assert_that(spool.depth, equal_to(6))
+        assert_that(self.read_all(spool), equal_to([event(i) for i in range(4, 10)]))
+
+    def test_partially_written_record_dropped_on_restart(self) -> None:
+        spool = self.spool()
+        spool.append([event(0), event(1)])
+        spool.close()
+        (filename,) = os.listdir(self.directory)
+        with open(os.path.join(self.directory, filename), 'ab') as f:
+            f.write(b'\x10\x00')
+
+        spool = self.spool()
+        spool.append([event(2)])
+
+        assert_that(self.read_all(spool), equal_to([event(0), event(1), event(2)]))
+
+    def test_drop_oldest_when_full(self) -> None:
+        spool = self.spool(max_size=2000)
+
+        spool.append([event(i) for i in range(40)])
+
+        events = self.read_all(spool)
+        assert_that(events[-1], equal_to(event(39)))
+        assert_that(len(events), equal_to(40 - self.status(spool)['dropped']))
+        assert_that(int(events[0][1]['Index']), equal_to(self.status(spool)['dropped']))
+
+    def test_drop_newest_when_full(self) -> None:
+        spool = self.spool(max_size=2000, overflow_policy='drop_newest')
+
+        spool.append([event(i) for i in range(40)])
+
+        events = self.read_all(spool)
+        assert_that(events[0], equal_to(event(0)))
+        assert_that(len(events), equal_to(40 - self.status(spool)['dropped']))
+
+    def test_expired_events_not_read(self) -> None:
+        spool = self.spool(max_age=60)
+        spool.append([event(0)])
+        self.now += 61
+        spool.append([event(1)])
+
+        assert_that(self.read_all(spool), contains_exactly(event(1)))
+        assert_that(
+            self.status(spool), has_entries(depth=0, expired=1, size=0, segments=0)
+        )
+
+    def test_failed_write_rolled_back(self) -> None:
+        spool = self.spool()
+        spool.append([event(0)])
+        writer = spool._writer
+        spool._writer = Mock(wraps=writer)
+        spool._writer.flush.side_effect = OSError('No space left on device')
+
+        spool.append([event(1), event(2)])
+        spool.append([event(3)])
+
+        assert_that(self.status(spool), has_entries(depth=2, dropped=2))
+        assert_that(self.read_all(spool), contains_exactly(event(0), event(3)))
+
+    def test_unreadable_events_dropped(self) -> None:
+        spool = self.spool()
+        spool.append([event(0), event(1)])
+        (filename,) = [name for name in os.listdir(self.directory)]
+        path = os.path.join(self.directory, filename)
+        os.truncate(path, os.path.getsize(path) - 1)
+
+        assert_that(self.read_all(spool), contains_exactly(event(0)))
+        assert_that(self.status(spool), has_entries(depth=0, dropped=1))
+
+    def test_invalid_overflow_policy(self) -> None:
+        self.assertRaises(ValueError, self.spool, overflow_policy='block')
+
+
+class TestSpoolReplayer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.spool = EventSpool(self.tmp_dir.name)
+        self.publish = Mock()
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def replayer(self) -> SpoolReplayer:
+        return SpoolReplayer(self.spool, self.publish, lambda: True, rate=20)
+
+    def published(self) -> list[Any]:
+        return [mock_call.args for mock_call in self.publish.call_args_list]
+
+    def test_replay_batch_limited_by_rate(self) -> None:
+        self.spool.append([event(i) for i in range(5)])
+        replayer = self.replayer()
+
+        replayer.replay_batch()
+
+        assert_that(self.published(), contains_exactly(event(0), event(1)))
+        assert_that(self.spool.depth, equal_to(3))
+
+    def test_events_spooled_while_replaying_not_limited_by_rate(self) -> None:
+        self.spool.append([event(i) for i in range(5)])
+        replayer = self.replayer()
+        replayer.replay_batch()
+
+        self.spool.append([event(i) for i in range(5, 15)])
+        replayer.replay_batch()
+
+        assert_that(self.published(), equal_to([event(i) for i in range(14)]))
+        assert_that(self.spool.depth, equal_to(1))
+
+    def test_publish_error_keeps_batch(self) -> None:
+        self.spool.append([event(0)])
+        self.publish.side_effect = Exception('bus error')
+
+        self.assertRaises(Exception, self.replayer().replay_batch)
+
+        assert_that(self.spool.depth, equal_to(1))
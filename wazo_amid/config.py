@@ -18,8 +18,29 @@ class ServiceConfigDict(TypedDict):
     password: str
 
 
+class AjamExecutorConfigDict(TypedDict):
+    max_workers: int
+    max_pending: int
+
+
+class CircuitBreakerConfigDict(TypedDict):
+    failure_threshold: int
+    retry_interval: float
+
+
 class AjamCofigDict(ServiceConfigDict):
     https: bool
+    connect_timeout: float
+    read_timeout: float
+    executor: AjamExecutorConfigDict
+    circuit_breaker: CircuitBreakerConfigDict
+
+
+class ActionClientConfigDict(TypedDict):
+    transport: Literal['ajam', 'ami']
+    timeout: float
+    coalesced_actions: list[str]
+    batch_max_workers: int
 
 
 class AuthConfigDict(TypedDict):
@@ -30,12 +51,81 @@ class AuthConfigDict(TypedDict):
     key_file: str
 
 
+class EventFilterConfigDict(TypedDict):
+    allow: list[str]
+    deny: list[str]
+
+
+class AmiConfigDict(ServiceConfigDict):
+    name: str | None
+    event_filter: EventFilterConfigDict
+    event_mask: str | None
+    filters: list[str]
+
+
+class AmiReconnectConfigDict(TypedDict):
+    min_delay: float
+    max_delay: float
+    multiplier: float
+    jitter: float
+
+
+class AmiCaptureConfigDict(TypedDict):
+    enabled: bool
+    directory: str
+    max_file_size: int
+    max_files: int
+
+
+class TcpKeepaliveConfigDict(TypedDict):
+    enabled: bool
+    idle: int
+    interval: int
+    count: int
+
+
+class AmiEngineConfigDict(TypedDict):
+    type: Literal['threads', 'asyncio']
+    ping_interval: float
+    ping_timeout: float
+    tcp_keepalive: TcpKeepaliveConfigDict
+
+
 class BusConfigDict(ServiceConfigDict):
     vhost: str
     exchange_name: str
     exchange_type: Literal['headers']
 
 
+class EventQueueConfigDict(TypedDict):
+    max_size: int
+    overflow_policy: Literal['block', 'drop_oldest', 'drop_priority']
+    priorities: dict[str, int]
+
+
+class EventSpoolConfigDict(TypedDict):
+    enabled: bool
+    directory: str
+    segment_size: int
+    max_size: int
+    max_age: float
+    overflow_policy: Literal['drop_oldest', 'drop_newest']
+    replay_rate: float
+
+
+class StateCacheConfigDict(TypedDict):
+    enabled: bool
+
+
+class CachedActionConfigDict(TypedDict, total=False):
+    ttl: float
+    invalidated_by: list[str]
+
+
+class ActionCacheConfigDict(TypedDict):
+    actions: dict[str, CachedActionConfigDict]
+
+
 class CorsConfigDict(TypedDict):
     enabled: bool
     allow_headers: list[str]
@@ -60,14 +150,36 @@ class AmidConfigDict(TypedDict):
     extra_config_files: str
     publish_ami_events: bool
     ajam: AjamCofigDict
-    ami: ServiceConfigDict
+    action_client: ActionClientConfigDict
+    action_cache: ActionCacheConfigDict
+    ami: AmiConfigDict | list[AmiConfigDict]
+    ami_engine: AmiEngineConfigDict
+    ami_reconnect: AmiReconnectConfigDict
+    ami_capture: AmiCaptureConfigDict
     auth: AuthConfigDict
     bus: BusConfigDict
+    event_queue: EventQueueConfigDict
+    event_spool: EventSpoolConfigDict
+    state_cache: StateCacheConfigDict
     rest_api: RestApiConfigDict
     enabled_plugins: dict[str, bool]
 
 
 _DAEMONNAME = 'wazo-amid'
+_DEFAULT_AMI_CONFIG: AmiConfigDict = {
+    'name': None,
+    'host': 'localhost',
+    'port': 5038,
+    'username': 'wazo_amid',
+    'password': 'default',
+    'event_filter': {
+        'allow': [],
+        'deny': [],
+    },
+    'event_mask': None,
+    'filters': [],
+}
+
 _DEFAULT_CONFIG: AmidConfigDict = {  # type: ignore
     'user': 'wazo-amid',
     'debug': False,
@@ -82,12 +194,57 @@ _DEFAULT_CONFIG: AmidConfigDict = {  # type: ignore
         'https': False,
         'username': 'wazo_amid',
         'password': 'default_password',
+        'connect_timeout': 5,
+        'read_timeout': 30,
+        'executor': {
+            'max_workers': 6,
+            'max_pending': 2,
+        },
+        'circuit_breaker': {
+            'failure_threshold': 5,
+            'retry_interval': 10,
+        },
     },
-    'ami': {
-        'host': 'localhost',
-        'port': 5038,
-        'username': 'wazo_amid',
-        'password': 'default',
+    'action_client': {
+        'transport': 'ajam',
+        'timeout': 30,
+        'coalesced_actions': [
+            'CoreShowChannels',
+            'CoreStatus',
+            'PJSIPShowContacts',
+            'PJSIPShowEndpoints',
+            'QueueStatus',
+            'QueueSummary',
+            'Status',
+        ],
+        'batch_max_workers': 4,
+    },
+    'action_cache': {
+        'actions': {},
+    },
+    'ami': _DEFAULT_AMI_CONFIG,
+    'ami_engine': {
+        'type': 'threads',
+        'ping_interval': 30,
+        'ping_timeout': 10,
+        'tcp_keepalive': {
+            'enabled': True,
+            'idle': 60,
+            'interval': 10,
+            'count': 3,
+        },
+    },
+    'ami_reconnect': {
+        'min_delay': 0.5,
+        'max_delay': 30,
+        'multiplier': 2,
+        'jitter': 0.5,
+    },
+    'ami_capture': {
+        'enabled': False,
+        'directory': f'/var/lib/{_DAEMONNAME}/captures',
+        'max_file_size': 104857600,
+        'max_files': 10,
     },
     'auth': {
         'host': 'localhost',
@@ -105,6 +262,23 @@ _DEFAULT_CONFIG: AmidConfigDict = {  # type: ignore
         'exchange_name': 'wazo-headers',
         'exchange_type': 'headers',
     },
+    'event_queue': {
+        'max_size': 10000,
+        'overflow_policy': 'block',
+        'priorities': {},
+    },
+    'event_spool': {
+        'enabled': False,
+        'directory': f'/var/lib/{_DAEMONNAME}/spool',
+        'segment_size': 16777216,
+        'max_size': 1073741824,
+        'max_age': 86400,
+        'overflow_policy': 'drop_oldest',
+        'replay_rate': 1000,
+    },
+    'state_cache': {
+        'enabled': False,
+    },
     'rest_api': {
         'listen': '127.0.0.1',
         'port': 9491,
@@ -118,6 +292,8 @@ _DEFAULT_CONFIG: AmidConfigDict = {  # type: ignore
         'actions': True,
         'commands': True,
         'config': True,
+        'metrics': True,
+        'state': True,
         'status': True,
     },
 }
@@ -193,4 +369,22 @@ def _get_reinterpreted_raw_values(config: dict[str, Any]) -> dict[str, Any]:
     if log_level:
         result['log_level'] = get_log_level_by_name(log_level)
 
+    ami = config.get('ami')
+    if isinstance(ami, list):
+        result['ami'] = [_get_ami_endpoint_config(endpoint) for endpoint in ami]
+
     return result
+
+
+def _get_ami_endpoint_config(endpoint: dict[str, Any]) -> dict[str, Any]:
+    endpoint_config = ChainMap(endpoint, _DEFAULT_AMI_CONFIG)
+    if not endpoint_config.get('name'):
+        endpoint_config['name'] = f"{endpoint_config['host']}:{endpoint_config['port']}"
+    return endpoint_config
+
+
+def get_ami_configs(config: AmidConfigDict) -> list[AmiConfigDict]:
+    ami = config['ami']
+    if isinstance(ami, list):
+        return ami
+    return [ami]
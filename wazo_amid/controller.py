@@ -11,13 +11,22 @@ from wazo_auth_client import Client as AuthClient
 from xivo.status import StatusAggregator, TokenStatus
 from xivo.token_renewer import TokenRenewer
 
-from wazo_amid import auth, rest_api
+from wazo_amid import auth, metrics, rest_api
+from wazo_amid.action_cache import ActionCache
+from wazo_amid.ami import parser
+from wazo_amid.ami.async_client import AsyncAMIClient
+from wazo_amid.ami.capture import CaptureWriter
 from wazo_amid.ami.client import AMIClient
+from wazo_amid.async_facade import AsyncEventHandlerFacade
 from wazo_amid.bus.client import BusClient
+from wazo_amid.bus.spool import EventSpool
+from wazo_amid.config import get_ami_configs
+from wazo_amid.event_queue import EventQueue
 from wazo_amid.facade import EventHandlerFacade
+from wazo_amid.state_cache import RESYNC_ACTIONS, StateCache
 
 if TYPE_CHECKING:
-    from wazo_amid.config import AmidConfigDict
+    from wazo_amid.config import AmiConfigDict, AmidConfigDict
 
 logger = logging.getLogger(__name__)
 
@@ -29,19 +38,82 @@ class Controller:
         self._token_status = TokenStatus()
         self._status_aggregator = StatusAggregator()
         self._stopping_thread: Thread | None = None
+        self._state_cache: StateCache | None = None
+        self._action_cache: ActionCache | None = None
 
     def run(self) -> None:
         self._token_renewer.subscribe_to_token_change(
             self._token_status.token_change_callback
         )
         self._status_aggregator.add_provider(self._token_status.provide_status)
+        if self._config['action_cache']['actions']:
+            self._action_cache = ActionCache(self._config['action_cache']['actions'])
+            self._status_aggregator.add_provider(self._action_cache.provide_status)
         if self._config['publish_ami_events']:
             uuid = self._config['uuid']
-            ami_client = AMIClient(**self._config['ami'])
-            bus_client = BusClient.from_config(uuid, self._config['bus'])
-            facade = EventHandlerFacade(ami_client, bus_client)
-            self._status_aggregator.add_provider(ami_client.provide_status)
+            spool_config = self._config['event_spool']
+            spool = self._create_event_spool() if spool_config['enabled'] else None
+            bus_client = BusClient.from_config(
+                uuid, self._config['bus'], spool, spool_config['replay_rate']
+            )
+            event_queue = EventQueue(**self._config['event_queue'])
+            metrics.event_queue_depth.set_function(lambda: event_queue.depth)
+            ami_engine = self._config['ami_engine']
+            ami_configs = get_ami_configs(self._config)
+            startup_actions = None
+            if self._config['state_cache']['enabled']:
+                self._state_cache = StateCache()
+                startup_actions = RESYNC_ACTIONS
+                self._status_aggregator.add_provider(self._state_cache.provide_status)
+            captures = [self._create_capture(ami_config) for ami_config in ami_configs]
+            facade: EventHandlerFacade | AsyncEventHandlerFacade
+            ami_clients: list[AMIClient]
+            if ami_engine['type'] == 'asyncio':
+                async_ami_clients = [
+                    AsyncAMIClient(
+                        **ami_config,
+                        startup_actions=startup_actions,
+                        capture=capture,
+                        reconnect=self._config['ami_reconnect'],
+                        ping_interval=ami_engine['ping_interval'],
+                        ping_timeout=ami_engine['ping_timeout'],
+                        tcp_keepalive=ami_engine['tcp_keepalive'],
+                    )
+                    for ami_config, capture in zip(ami_configs, captures)
+                ]
+                ami_clients = list(async_ami_clients)
+                facade = AsyncEventHandlerFacade(
+                    async_ami_clients,
+                    bus_client,
+                    event_queue,
+                    state_cache=self._state_cache,
+                    action_cache=self._action_cache,
+                )
+            else:
+                ami_clients = [
+                    AMIClient(
+                        **ami_config,
+                        startup_actions=startup_actions,
+                        capture=capture,
+                        reconnect=self._config['ami_reconnect'],
+                        ping_interval=ami_engine['ping_interval'],
+                        ping_timeout=ami_engine['ping_timeout'],
+                        tcp_keepalive=ami_engine['tcp_keepalive'],
+                    )
+                    for ami_config, capture in zip(ami_configs, captures)
+                ]
+                facade = EventHandlerFacade(
+                    ami_clients,
+                    bus_client,
+                    event_queue,
+                    self._state_cache,
+                    self._action_cache,
+                )
+            for ami_client in ami_clients:
+                self._status_aggregator.add_provider(ami_client.provide_status)
+            self._status_aggregator.add_provider(parser.provide_status)
             self._status_aggregator.add_provider(bus_client.provide_status)
+            self._status_aggregator.add_provider(event_queue.provide_status)
             ami_thread = Thread(target=facade.run, name='ami_thread')
             ami_thread.start()
             try:
@@ -54,11 +126,43 @@ class Controller:
                 logger.debug('joining ami thread...')
                 ami_thread.join()
                 logger.debug('ami thread joined')
+                for capture in captures:
+                    if capture is not None:
+                        capture.close()
         else:
             self._run_rest_api()
 
+    def _create_event_spool(self) -> EventSpool:
+        spool_config = self._config['event_spool']
+        spool = EventSpool(
+            spool_config['directory'],
+            spool_config['segment_size'],
+            spool_config['max_size'],
+            spool_config['max_age'],
+            spool_config['overflow_policy'],
+        )
+        metrics.event_spool_depth.set_function(lambda: spool.depth)
+        self._status_aggregator.add_provider(spool.provide_status)
+        return spool
+
+    def _create_capture(self, ami_config: AmiConfigDict) -> CaptureWriter | None:
+        capture_config = self._config['ami_capture']
+        if not capture_config['enabled']:
+            return None
+        return CaptureWriter(
+            capture_config['directory'],
+            ami_config['name'] or 'ami',
+            capture_config['max_file_size'],
+            capture_config['max_files'],
+        )
+
     def _run_rest_api(self) -> None:
-        rest_api.configure(self._config, self._status_aggregator)
+        rest_api.configure(
+            self._config,
+            self._status_aggregator,
+            self._state_cache,
+            self._action_cache,
+        )
         if not rest_api.app.config['auth'].get('master_tenant_uuid'):
             self._token_renewer.subscribe_to_next_token_details_change(
                 auth.init_master_tenant
@@ -0,0 +1,169 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import fnmatch
+import heapq
+import itertools
+import threading
+from collections import Counter, deque
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from xivo.status import StatusDict
+
+    from .ami.client import AnyMessage
+
+OverflowPolicy = Literal['block', 'drop_oldest', 'drop_priority']
+OVERFLOW_POLICIES = ('block', 'drop_oldest', 'drop_priority')
+DEFAULT_PRIORITY = 0
+
+
+class EventQueue:
+    """Bounded queue between the AMI reader and the bus publisher.
+
+    When the queue is full, the overflow policy either blocks the reader,
+    drops the oldest queued event, or drops the oldest event among the lowest
+    priority ones (the incoming event itself if nothing queued is less
+    important). Events are always dequeued in the order they were queued.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        overflow_policy: OverflowPolicy = 'block',
+        priorities: dict[str, int] | None = None,
+    ) -> None:
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f'unknown overflow policy: {overflow_policy}')
+        if max_size < 1:
+            raise ValueError(f'invalid max size: {max_size}')
+        self._max_size = max_size
+        self._overflow_policy = overflow_policy
+        self._priorities = dict(priorities or {})
+        self._priority_cache: dict[str, int] = {}
+        self._levels: dict[int, deque[tuple[int, AnyMessage]]] = {}
+        self._size = 0
+        self._sequence = itertools.count()
+        self._dropped: Counter[str] = Counter()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    @property
+    def depth(self) -> int:
+        return self._size
+
+    @property
+    def may_block(self) -> bool:
+        """Whether `put_batch` waits for room when the queue is full"""
+        return self._overflow_policy == 'block'
+
+    def put(self, message: AnyMessage) -> None:
+        self.put_batch((message,))
+
+    def put_batch(self, messages: Iterable[AnyMessage]) -> None:
+        with self._lock:
+            for message in messages:
+                self._put(message)
+            if self._size:
+                self._not_empty.notify()
+
+    def get_batch(self) -> list[AnyMessage] | None:
+        """Wait for events and return all of them, or None once closed and empty"""
+        with self._lock:
+            while not self._size and not self._closed:
+                self._not_empty.wait()
+            if not self._size:
+                return None
+
+            batch = self._pop_all()
+            self._not_full.notify_all()
+            return batch
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def provide_status(self, status: StatusDict) -> None:
+        with self._lock:
+            status['event_queue']['depth'] = self._size
+            status['event_queue']['max_size'] = self._max_size
+            status['event_queue']['overflow_policy'] = self._overflow_policy
+            status['event_queue']['dropped'] = dict(self._dropped)
+
+    def _put(self, message: AnyMessage) -> None:
+        priority = self._priority(message.name)
+        if self._size >= self._max_size and not self._make_room(priority):
+            self._dropped[message.name] += 1
+            return
+        if self._closed:
+            return
+
+        level = self._levels.setdefault(priority, deque())
+        level.append((next(self._sequence), message))
+        self._size += 1
+
+    def _make_room(self, priority: int) -> bool:
+        if self._overflow_policy == 'block':
+            # the batch being put is only notified at its end, wake the
+            # publisher thread waiting in get_batch up now so that it makes room
+            self._not_empty.notify()
+            while self._size >= self._max_size and not self._closed:
+                self._not_full.wait()
+            return True
+
+        if self._overflow_policy == 'drop_oldest':
+            victim_priority = DEFAULT_PRIORITY
+        else:
+            victim_priority = min(
+                level_priority
+                for level_priority, level in self._levels.items()
+                if level
+            )
+            if victim_priority > priority:
+                return False
+
+        _, victim = self._levels[victim_priority].popleft()
+        self._size -= 1
+        self._dropped[victim.name] += 1
+        return True
+
+    def _pop_all(self) -> list[AnyMessage]:
+        levels = [level for level in self._levels.values() if level]
+        if len(levels) == 1:
+            batch = [message for _, message in levels[0]]
+        else:
+            batch = [message for _, message in heapq.merge(*levels)]
+        for level in levels:
+            level.clear()
+        self._size = 0
+        return batch
+
+    def _priority(self, event_name: str) -> int:
+        if self._overflow_policy != 'drop_priority':
+            return DEFAULT_PRIORITY
+
+        try:
+            return self._priority_cache[event_name]
+        except KeyError:
+            pass
+
+        priority = self._priorities.get(event_name)
+        if priority is None:
+            priority = next(
+                (
+                    pattern_priority
+                    for pattern, pattern_priority in self._priorities.items()
+                    if fnmatch.fnmatchcase(event_name, pattern)
+                ),
+                DEFAULT_PRIORITY,
+            )
+        self._priority_cache[event_name] = priority
+        return priority
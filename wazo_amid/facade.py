@@ -6,51 +6,114 @@ from __future__ import annotations
 import logging
 import threading
 from collections import deque
-from typing import NoReturn
 
-from wazo_amid.ami.client import AMIClient, AMIConnectionError, Message
+from wazo_amid.action_cache import ActionCache
+from wazo_amid.ami.client import AMIClient, AMIConnectionError, AnyMessage
 from wazo_amid.bus.client import BusClient
+from wazo_amid.event_queue import EventQueue
+from wazo_amid.state_cache import StateCache
 
 logger = logging.getLogger(__name__)
 
 
 class EventHandlerFacade:
-    RECONNECTION_DELAY = 5
-
-    def __init__(self, ami_client: AMIClient, bus_client: BusClient) -> None:
-        self._ami_client = ami_client
+    def __init__(
+        self,
+        ami_clients: list[AMIClient],
+        bus_client: BusClient,
+        event_queue: EventQueue | None = None,
+        state_cache: StateCache | None = None,
+        action_cache: ActionCache | None = None,
+    ) -> None:
+        self._ami_clients = ami_clients
         self._bus_client = bus_client
+        self._event_queue = event_queue or EventQueue()
+        self._state_cache = state_cache
+        self._action_cache = action_cache
         self._stop_event = threading.Event()
 
     def run(self) -> None:
+        publisher_thread = threading.Thread(
+            target=self._publish_messages_indefinitely, name='publisher_thread'
+        )
+        publisher_thread.start()
+        errors: list[Exception] = []
+        reader_threads = [
+            threading.Thread(
+                target=self._read_messages_indefinitely,
+                args=(ami_client, errors),
+                name=f'ami_reader_{index}',
+            )
+            for index, ami_client in enumerate(self._ami_clients)
+        ]
+        try:
+            for reader_thread in reader_threads:
+                reader_thread.start()
+            for reader_thread in reader_threads:
+                reader_thread.join()
+        finally:
+            self._event_queue.close()
+            publisher_thread.join()
+
+        if errors:
+            raise errors[0]
+
+    def _read_messages_indefinitely(
+        self, ami_client: AMIClient, errors: list[Exception]
+    ) -> None:
         while not self._stop_event.is_set():
             try:
-                self._ami_client.connect_and_login()
-                self._process_messages_indefinitely()
+                ami_client.connect_and_login()
+                if self._state_cache is not None:
+                    self._state_cache.reset(ami_client.name)
+                self._process_messages_indefinitely(ami_client)
             except AMIConnectionError as e:
-                self._handle_ami_connection_error(e)
+                self._handle_ami_connection_error(ami_client, e)
             except Exception as e:
-                self._handle_unexpected_error(e)
+                self._handle_unexpected_error(ami_client, e)
+                errors.append(e)
+                self.stop()
+                return
 
-    def _handle_ami_connection_error(self, e: AMIConnectionError) -> None:
-        self._ami_client.disconnect(reason=e.error)
-        self._stop_event.wait(timeout=self.RECONNECTION_DELAY)
+    def _handle_ami_connection_error(
+        self, ami_client: AMIClient, e: AMIConnectionError
+    ) -> None:
+        ami_client.disconnect(reason=e.error)
+        if self._state_cache is not None:
+            self._state_cache.disconnected(ami_client.name)
+        self._stop_event.wait(timeout=ami_client.backoff.disconnected())
 
-    def _handle_unexpected_error(self, e: Exception) -> NoReturn:
-        self._ami_client.disconnect(reason=f'Unexpected error: {e}')
-        raise
+    def _handle_unexpected_error(self, ami_client: AMIClient, e: Exception) -> None:
+        ami_client.disconnect(reason=f'Unexpected error: {e}')
+        if self._state_cache is not None:
+            self._state_cache.disconnected(ami_client.name)
 
-    def _process_messages_indefinitely(self) -> None:
+    def _process_messages_indefinitely(self, ami_client: AMIClient) -> None:
         while not self._stop_event.is_set():
-            new_messages = self._ami_client.parse_next_messages()
+            new_messages = ami_client.parse_next_messages()
             self._process_messages(new_messages)
 
-    def _process_messages(self, messages: deque[Message]) -> None:
-        while len(messages):
-            message = messages.pop()
-            logger.debug('Processing message %s', message)
-            self._bus_client.publish(message)
+    def _process_messages(self, messages: deque[AnyMessage]) -> None:
+        if self._action_cache is not None:
+            self._action_cache.invalidate(messages)
+        if self._state_cache is None:
+            self._event_queue.put_batch(messages)
+        else:
+            self._event_queue.put_batch(self._state_cache.update(messages))
+        messages.clear()
+
+    def _publish_messages_indefinitely(self) -> None:
+        while True:
+            messages = self._event_queue.get_batch()
+            if messages is None:
+                break
+            logger.debug('Publishing %d messages', len(messages))
+            try:
+                self._bus_client.publish(*messages)
+            except Exception:
+                logger.exception('Could not publish %d messages', len(messages))
 
     def stop(self) -> None:
         self._stop_event.set()
-        self._ami_client.stop()
+        for ami_client in self._ami_clients:
+            ami_client.stop()
@@ -0,0 +1,281 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import bisect
+import threading
+from collections.abc import Callable, Iterator, Sequence
+from typing import Any
+
+LabelValues = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class _Metric:
+    """Metric whose values are written by each thread in its own dict.
+
+    Writers never take a lock: a thread only updates its own shard, and the
+    shards are copied and summed when the metrics are collected.
+    """
+
+    type_ = ''
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Registry | None = None,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: list[dict[LabelValues, Any]] = []
+        self._shards_lock = threading.Lock()
+        (registry or _default_registry).register(self)
+
+    def _shard(self) -> dict[LabelValues, Any]:
+        try:
+            return self._local.values
+        except AttributeError:
+            values: dict[LabelValues, Any] = {}
+            self._local.values = values
+            with self._shards_lock:
+                self._shards.append(values)
+            return values
+
+    def _shard_copies(self) -> list[dict[LabelValues, Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+    def _labels(self, values: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError()
+
+
+class Counter(_Metric):
+    type_ = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        values = self._shard()
+        values[labels] = values.get(labels, 0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        totals: dict[LabelValues, float] = {}
+        for shard in self._shard_copies():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0) + value
+        for labels, total in sorted(totals.items()):
+            yield self.name, self._labels(labels), total
+
+
+class Histogram(_Metric):
+    type_ = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: Registry | None = None,
+    ) -> None:
+        super().__init__(name, documentation, labelnames, registry)
+        self._buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        values = self._shard()
+        # one count per bucket, then the +Inf bucket, then the sum
+        state = values.get(labels)
+        if state is None:
+            state = values[labels] = [0] * (len(self._buckets) + 1) + [0.0]
+        state[bisect.bisect_left(self._buckets, value)] += 1
+        state[-1] += value
+
+    def samples(self) -> Iterator[Sample]:
+        totals: dict[LabelValues, list[float]] = {}
+        for shard in self._shard_copies():
+            for labels, state in shard.items():
+                total = totals.setdefault(labels, [0] * len(state))
+                for index, value in enumerate(list(state)):
+                    total[index] += value
+
+        bounds = [*(_format_value(bucket) for bucket in self._buckets), '+Inf']
+        for labels, total in sorted(totals.items()):
+            cumulative = 0.0
+            for bound, count in zip(bounds, total):
+                cumulative += count
+                yield f'{self.name}_bucket', {
+                    **self._labels(labels),
+                    'le': bound,
+                }, cumulative
+            yield f'{self.name}_sum', self._labels(labels), total[-1]
+            yield f'{self.name}_count', self._labels(labels), cumulative
+
+
+class Gauge(_Metric):
+    """Gauge read from a function when the metrics are collected"""
+
+    type_ = 'gauge'
+
+    def __init__(
+        self, name: str, documentation: str, registry: Registry | None = None
+    ) -> None:
+        super().__init__(name, documentation, registry=registry)
+        self._function: Callable[[], float] | None = None
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def samples(self) -> Iterator[Sample]:
+        if self._function is not None:
+            yield self.name, {}, self._function()
+
+
+class BoundedLabel:
+    """Values of a label, limited to the first `max_values` distinct ones.
+
+    Any later value is replaced by `other`, so that values coming from
+    clients cannot create an unbounded number of series.
+    """
+
+    def __init__(self, max_values: int, other: str = 'other') -> None:
+        self._max_values = max_values
+        self._other = other
+        self._values: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(self, value: str) -> str:
+        if value in self._values:
+            return value
+        with self._lock:
+            if len(self._values) < self._max_values:
+                self._values.add(value)
+                return value
+        return self._other
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def exposition(self) -> str:
+        """Metrics in the Prometheus text format, version 0.0.4"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return f'{{{pairs}}}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+_default_registry = Registry()
+
+
+def exposition() -> str:
+    return _default_registry.exposition()
+
+
+ami_received_events = Counter(
+    'wazo_amid_ami_received_events_total',
+    'AMI events received and not filtered out',
+    ['event'],
+)
+ami_received_bytes = Counter(
+    'wazo_amid_ami_received_bytes_total',
+    'Size of the AMI events received and not filtered out',
+    ['event'],
+)
+ami_parse_seconds = Histogram(
+    'wazo_amid_ami_parse_seconds',
+    'Time spent splitting each chunk of AMI data into events',
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05),
+)
+ami_reconnects = Counter(
+    'wazo_amid_ami_reconnects_total',
+    'AMI connections lost or refused, each followed by a reconnection',
+    ['node'],
+)
+ami_outage_seconds = Histogram(
+    'wazo_amid_ami_outage_seconds',
+    'Time between the loss of an AMI connection and the next successful login',
+    ['node'],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+ami_fully_booted_seconds = Histogram(
+    'wazo_amid_ami_fully_booted_seconds',
+    'Time between an AMI login and the FullyBooted event',
+    ['node'],
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+ami_ping_rtt_seconds = Histogram(
+    'wazo_amid_ami_ping_rtt_seconds',
+    'Time between an AMI Ping action and its response',
+    ['node'],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+event_queue_depth = Gauge(
+    'wazo_amid_event_queue_depth',
+    'AMI events waiting to be published on the bus',
+)
+event_spool_depth = Gauge(
+    'wazo_amid_event_spool_depth',
+    'AMI events written to disk while the bus is unreachable, waiting to be published',
+)
+event_publish_latency_seconds = Histogram(
+    'wazo_amid_event_publish_latency_seconds',
+    'Time between the reception of an AMI event and its publication on the bus',
+)
+ajam_request_seconds = Histogram(
+    'wazo_amid_ajam_request_seconds',
+    'Duration of the AJAM requests, until the response headers',
+    ['action'],
+)
+rest_request_seconds = Histogram(
+    'wazo_amid_rest_request_seconds',
+    'Duration of the REST API requests, until the response body is sent',
+    ['method', 'resource'],
+)
@@ -3,13 +3,44 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
+import logging
+import threading
+import time
+from collections.abc import Callable, Generator, Iterator
 from contextlib import contextmanager
+from typing import TYPE_CHECKING, TypeVar
 
 import requests
+from xivo.status import Status
 
+from wazo_amid import metrics
 from wazo_amid.exceptions import APIException
 
+from .bulkhead import Bulkhead, BulkheadFull
+from .circuit_breaker import CircuitBreaker, CircuitOpen
+
+if TYPE_CHECKING:
+    from xivo.status import StatusDict
+
+    from wazo_amid.config import AjamExecutorConfigDict, CircuitBreakerConfigDict
+
+    from .ami import ActionArgs
+
+T = TypeVar('T')
+
+logger = logging.getLogger(__name__)
+
+SESSION_EXPIRED_RESPONSE = b'Response: Error\r\nMessage: Permission denied'
+STREAM_CHUNK_SIZE = 65536
+DEFAULT_EXECUTOR: AjamExecutorConfigDict = {'max_workers': 6, 'max_pending': 2}
+DEFAULT_CIRCUIT_BREAKER: CircuitBreakerConfigDict = {
+    'failure_threshold': 5,
+    'retry_interval': 10,
+}
+# the action names of the request metrics come from the REST API, only the
+# first ones are reported, the next as "other", to bound the number of series
+_metric_action = metrics.BoundedLabel(max_values=100)
+
 
 class AJAMUnreachable(APIException):
     def __init__(self, ajam_url: str, error: str | Exception) -> None:
@@ -21,8 +52,97 @@ class AJAMUnreachable(APIException):
         )
 
 
+class AJAMSessionPool:
+    """Thread-safe pool of logged-in HTTP sessions.
+
+    At most `size` sessions exist at once; callers wait for a session to be
+    released when all of them are in use. Sessions are created lazily.
+    """
+
+    def __init__(self, factory: Callable[[], requests.Session], size: int) -> None:
+        self._factory = factory
+        self._idle: list[requests.Session] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def acquire(self) -> requests.Session:
+        self._slots.acquire()
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, session: requests.Session) -> None:
+        with self._lock:
+            self._idle.append(session)
+        self._slots.release()
+
+    def discard(self, session: requests.Session) -> None:
+        session.close()
+        self._slots.release()
+
+
+class AJAMStream:
+    """Body of an AJAM response, read chunk by chunk while iterating.
+
+    The session of the response is kept out of the pool until the stream is
+    closed. The body is only a success for the circuit breaker once it is
+    fully read.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool: AJAMSessionPool,
+        session: requests.Session,
+        response: requests.Response,
+        head: bytes,
+        chunks: Iterator[bytes],
+        circuit_breaker: CircuitBreaker,
+    ) -> None:
+        self._url = url
+        self._pool = pool
+        self._session: requests.Session | None = session
+        self._response = response
+        self._head = head
+        self._chunks = chunks
+        self._circuit_breaker = circuit_breaker
+        self._failed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._head:
+            yield self._head
+        try:
+            yield from self._chunks
+        except requests.RequestException as e:
+            self._failed = True
+            self._circuit_breaker.record_failure()
+            raise AJAMUnreachable(self._url, e)
+        self._circuit_breaker.record_success()
+
+    def close(self) -> None:
+        session, self._session = self._session, None
+        if session is None:
+            return
+        self._response.close()
+        if self._failed:
+            self._pool.discard(session)
+        else:
+            self._pool.release(session)
+
+
 class AJAMClient:
-    logoff_params = {'action': 'logoff'}
+    """Send AMI actions over HTTP, with the rawman interface of Asterisk.
+
+    Requests run on a Bulkhead, with connect and read timeouts. Connection
+    errors are counted by a CircuitBreaker: once it is open, requests fail
+    with AJAMUnreachable without reaching Asterisk, until a background Ping
+    succeeds.
+    """
 
     def __init__(
         self,
@@ -32,6 +152,11 @@ class AJAMClient:
         password: str | None = None,
         https: bool = True,
         verify_certificate: bool = True,
+        pool_size: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 30,
+        executor: AjamExecutorConfigDict | None = None,
+        circuit_breaker: CircuitBreakerConfigDict | None = None,
     ):
         scheme = 'https' if https else 'http'
         self.url = f'{scheme}://{host}:{port}/rawman'
@@ -41,22 +166,156 @@ class AJAMClient:
             'secret': password,
         }
         self.verify = verify_certificate if https else None
+        self.timeout = (connect_timeout, read_timeout)
+        self._pool = AJAMSessionPool(self._new_session, pool_size)
+        executor = executor or DEFAULT_EXECUTOR
+        self._bulkhead = Bulkhead(
+            'ajam', executor['max_workers'], executor['max_pending']
+        )
+        circuit_breaker = circuit_breaker or DEFAULT_CIRCUIT_BREAKER
+        self._circuit_breaker = CircuitBreaker(
+            'ajam',
+            circuit_breaker['failure_threshold'],
+            circuit_breaker['retry_interval'],
+            probe=lambda: self._get('Ping', {}),
+        )
 
-    def get(self, action: str, ami_args: dict[str, str]) -> requests.Response:
+    def close(self) -> None:
+        self._circuit_breaker.stop()
+        self._bulkhead.shutdown()
+
+    def get(self, action: str, ami_args: ActionArgs) -> requests.Response:
+        return self._call(self._get, action, ami_args)
+
+    def _call(
+        self,
+        function: Callable[[str, ActionArgs], T],
+        action: str,
+        ami_args: ActionArgs,
+        record_success: bool = True,
+    ) -> T:
+        try:
+            self._circuit_breaker.check()
+            result = self._bulkhead.call(self._timed, function, action, ami_args)
+        except CircuitOpen:
+            raise AJAMUnreachable(self.url, 'circuit breaker open')
+        except BulkheadFull:
+            raise AJAMUnreachable(self.url, 'too many concurrent requests')
+        except requests.RequestException as e:
+            self._circuit_breaker.record_failure()
+            raise AJAMUnreachable(self.url, e)
+        if record_success:
+            self._circuit_breaker.record_success()
+        return result
+
+    @staticmethod
+    def _timed(
+        function: Callable[[str, ActionArgs], T], action: str, ami_args: ActionArgs
+    ) -> T:
+        start = time.perf_counter()
+        try:
+            return function(action, ami_args)
+        finally:
+            metrics.ajam_request_seconds.observe(
+                time.perf_counter() - start, _metric_action(action.lower())
+            )
+
+    def _get(self, action: str, ami_args: ActionArgs) -> requests.Response:
         params = self._build_params(action, ami_args)
         with self._session() as session:
-            return session.get(self.url, params=params)
+            response = self._request(session, params)
+            if response.content.startswith(SESSION_EXPIRED_RESPONSE):
+                logger.debug('AJAM session expired, logging in again')
+                self._login(session)
+                response = self._request(session, params)
+            return response
+
+    def stream(self, action: str, ami_args: ActionArgs) -> AJAMStream:
+        # the stream records its success once its body is read
+        return self._call(self._stream, action, ami_args, record_success=False)
+
+    def _stream(self, action: str, ami_args: ActionArgs) -> AJAMStream:
+        params = self._build_params(action, ami_args)
+        session = self._pool.acquire()
+        try:
+            response = self._request(session, params, stream=True)
+            chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            head = self._read_head(chunks, len(SESSION_EXPIRED_RESPONSE))
+            if head.startswith(SESSION_EXPIRED_RESPONSE):
+                logger.debug('AJAM session expired, logging in again')
+                response.close()
+                self._login(session)
+                response = self._request(session, params, stream=True)
+                chunks = response.iter_content(STREAM_CHUNK_SIZE)
+                head = b''
+        except BaseException:
+            self._pool.discard(session)
+            raise
+        return AJAMStream(
+            self.url,
+            self._pool,
+            session,
+            response,
+            head,
+            chunks,
+            self._circuit_breaker,
+        )
+
+    @staticmethod
+    def _read_head(chunks: Iterator[bytes], size: int) -> bytes:
+        head = b''
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= size:
+                break
+        return head
 
     @contextmanager
     def _session(self) -> Generator[requests.Session, None, None]:
-        with requests.Session() as session:
-            session.get(self.url, params=self.login_params, verify=self.verify)
+        session = self._pool.acquire()
+        try:
             yield session
-            session.get(self.url, params=self.logoff_params, verify=self.verify)
+        except BaseException:
+            self._pool.discard(session)
+            raise
+        else:
+            self._pool.release(session)
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        try:
+            self._login(session)
+        except BaseException:
+            session.close()
+            raise
+        return session
+
+    def _login(self, session: requests.Session) -> None:
+        self._request(session, self.login_params)
+
+    def _request(
+        self,
+        session: requests.Session,
+        params: dict[str, str | None] | list[tuple[str, str]],
+        stream: bool = False,
+    ) -> requests.Response:
+        return session.get(
+            self.url,
+            params=params,
+            verify=self.verify,
+            timeout=self.timeout,
+            stream=stream,
+        )
+
+    def provide_status(self, status: StatusDict) -> None:
+        circuit_breaker = self._circuit_breaker.stats()
+        status['ajam']['status'] = (
+            Status.fail if circuit_breaker['state'] == 'open' else Status.ok
+        )
+        status['ajam']['circuit_breaker'] = circuit_breaker
+        status['ajam']['executor'] = self._bulkhead.stats()
 
-    def _build_params(
-        self, action: str, ami_args: dict[str, str]
-    ) -> list[tuple[str, str]]:
+    def _build_params(self, action: str, ami_args: ActionArgs) -> list[tuple[str, str]]:
         result = [('action', action)]
         for extra_arg_key, extra_arg_value in ami_args.items():
             if isinstance(extra_arg_value, list):
@@ -0,0 +1,254 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import itertools
+import logging
+import socket
+import threading
+import uuid
+from collections.abc import Iterator
+from typing import NamedTuple, Protocol, Union
+
+from wazo_amid.ami import parser
+from wazo_amid.exceptions import APIException, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ActionArgs = dict[str, Union[str, list[str]]]
+ArgsKey = tuple[tuple[str, Union[str, tuple[str, ...]]], ...]
+
+
+class ActionResponse(Protocol):
+    @property
+    def content(self) -> bytes:
+        ...
+
+
+class ActionStream(Protocol):
+    def __iter__(self) -> Iterator[bytes]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class ActionClient(Protocol):
+    def get(self, action: str, ami_args: ActionArgs) -> ActionResponse:
+        ...
+
+    def stream(self, action: str, ami_args: ActionArgs) -> ActionStream:
+        ...
+
+
+def args_key(ami_args: ActionArgs) -> ArgsKey:
+    """Hashable form of action arguments, with case-insensitive names"""
+    return tuple(
+        sorted(
+            (name.lower(), value if isinstance(value, str) else tuple(value))
+            for name, value in ami_args.items()
+        )
+    )
+
+
+class AMIUnreachable(APIException):
+    def __init__(self, ami_address: str, error: str | Exception) -> None:
+        super().__init__(
+            status_code=503,
+            message='AMI server unreachable',
+            error_id='ami-unreachable',
+            details={'ami_address': ami_address, 'original_error': str(error)},
+        )
+
+
+class AMIActionResponse(NamedTuple):
+    content: bytes
+
+
+class AMIActionStream:
+    def __init__(self, content: bytes) -> None:
+        self._content = content
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield self._content
+
+    def close(self) -> None:
+        pass
+
+
+class _PendingAction:
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self.frames: list[bytes] = []
+        self.error: str | Exception | None = None
+        self.done = threading.Event()
+
+    def add_frame(self, frame: bytes) -> None:
+        self.frames.append(frame)
+        event_list = parser.get_frame_header(frame, b'EventList')
+        if len(self.frames) == 1:
+            if event_list is None or event_list.lower() != b'start':
+                self.done.set()
+        elif event_list is not None and event_list.lower() == b'complete':
+            self.done.set()
+
+    def fail(self, error: str | Exception) -> None:
+        self.error = error
+        self.done.set()
+
+
+class AMIActionClient:
+    """Send AMI actions over a persistent AMI connection.
+
+    Concurrent actions share the same socket and are told apart by their
+    ActionID. A reader thread routes each response, and the events of its
+    event list, back to the waiting caller. The connection is opened on the
+    first action and reopened on the next action after an error.
+    """
+
+    _BUFSIZE = 65536
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        timeout: float = 30,
+    ) -> None:
+        self.address = f'{host}:{port}'
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._timeout = timeout
+        self._action_id_prefix = uuid.uuid4().hex[:8]
+        self._action_ids = itertools.count()
+        self._pending: dict[bytes, _PendingAction] = {}
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._sock: socket.socket | None = None
+
+    def get(self, action: str, ami_args: ActionArgs) -> AMIActionResponse:
+        with self._connect_lock:
+            sock = self._sock or self._connect_and_login()
+        frames = self._send_action(sock, action, ami_args)
+        return AMIActionResponse(b''.join(frame + b'\r\n\r\n' for frame in frames))
+
+    def stream(self, action: str, ami_args: ActionArgs) -> AMIActionStream:
+        # the reader thread already collects the whole event list
+        return AMIActionStream(self.get(action, ami_args).content)
+
+    def _connect_and_login(self) -> socket.socket:
+        logger.info('Connecting AMI action client to %s', self.address)
+        try:
+            sock = socket.create_connection(
+                (self._host, self._port), timeout=self._timeout
+            )
+            # discard the AMI protocol version
+            sock.recv(self._BUFSIZE)
+            sock.settimeout(None)
+        except OSError as e:
+            raise AMIUnreachable(self.address, e)
+
+        threading.Thread(
+            target=self._read_indefinitely,
+            args=(sock,),
+            name='ami_action_reader',
+            daemon=True,
+        ).start()
+
+        login_args: ActionArgs = {
+            'Username': self._username,
+            'Secret': self._password,
+            'Events': 'off',
+        }
+        try:
+            frames = self._send_action(sock, 'Login', login_args)
+        except AMIUnreachable:
+            self._disconnect(sock, 'login failed')
+            raise
+        if parser.get_frame_header(frames[0], b'Response') != b'Success':
+            self._disconnect(sock, 'authentication failed')
+            raise AMIUnreachable(self.address, 'authentication failed')
+
+        self._sock = sock
+        return sock
+
+    def _send_action(
+        self, sock: socket.socket, action: str, ami_args: ActionArgs
+    ) -> list[bytes]:
+        action_id = f'{self._action_id_prefix}-{next(self._action_ids)}'
+        data = self._build_action_msg(action, action_id, ami_args)
+        key = action_id.encode()
+        pending = _PendingAction(sock)
+        with self._lock:
+            self._pending[key] = pending
+        try:
+            try:
+                with self._send_lock:
+                    sock.sendall(data)
+            except OSError as e:
+                self._disconnect(sock, e)
+                raise AMIUnreachable(self.address, e)
+
+            if not pending.done.wait(timeout=self._timeout):
+                raise AMIUnreachable(self.address, f'no response to {action}')
+            if pending.error is not None:
+                raise AMIUnreachable(self.address, pending.error)
+            return pending.frames
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    @staticmethod
+    def _build_action_msg(action: str, action_id: str, ami_args: ActionArgs) -> bytes:
+        lines = [f'Action: {action}', f'ActionID: {action_id}']
+        for key, values in ami_args.items():
+            if key.lower() in ('action', 'actionid'):
+                continue
+            if not isinstance(values, list):
+                values = [values]
+            lines.extend(f'{key}: {value}' for value in values)
+
+        if any('\r' in line or '\n' in line for line in lines):
+            raise ValidationError(['AMI action arguments cannot contain newlines'])
+        return '\r\n'.join([*lines, '\r\n']).encode('UTF-8')
+
+    def _read_indefinitely(self, sock: socket.socket) -> None:
+        frame_buffer = parser.FrameBuffer()
+        while True:
+            try:
+                data = sock.recv(self._BUFSIZE)
+            except OSError as e:
+                self._disconnect(sock, e)
+                return
+            if not data:
+                self._disconnect(sock, 'connection closed from remote')
+                return
+
+            for frame in frame_buffer.feed(data):
+                self._dispatch(frame)
+
+    def _dispatch(self, frame: bytes) -> None:
+        action_id = parser.get_frame_header(frame, b'ActionID')
+        if action_id is None:
+            return
+        with self._lock:
+            pending = self._pending.get(action_id)
+        if pending is not None:
+            pending.add_frame(frame)
+
+    def _disconnect(self, sock: socket.socket, reason: str | Exception) -> None:
+        with self._lock:
+            if self._sock is sock:
+                logger.info('Disconnecting AMI action client. Reason: %s', reason)
+                self._sock = None
+            pending_actions = [
+                pending for pending in self._pending.values() if pending.sock is sock
+            ]
+        sock.close()
+        for pending in pending_actions:
+            pending.fail(reason)
@@ -0,0 +1,70 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar('T')
+
+
+class BulkheadFull(Exception):
+    pass
+
+
+class Bulkhead:
+    """Run calls on a dedicated, bounded pool of worker threads.
+
+    At most `max_workers` calls run at once and `max_pending` more wait for a
+    worker. Further calls are rejected with BulkheadFull instead of waiting,
+    so that a slow backend cannot tie up every thread of the caller.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+        self._max_workers = max_workers
+        self._max_calls = max_workers + max_pending
+        self._slots = threading.BoundedSemaphore(self._max_calls)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._rejected = 0
+
+    def call(self, function: Callable[..., T], *args: Any) -> T:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise BulkheadFull()
+
+        with self._lock:
+            self._calls += 1
+        try:
+            future = self._executor.submit(function, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future.result()
+
+    def _release(self, future: Future | None = None) -> None:
+        with self._lock:
+            self._calls -= 1
+        self._slots.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'max_workers': self._max_workers,
+                'running': min(self._calls, self._max_workers),
+                'pending': max(self._calls - self._max_workers, 0),
+                'rejected': self._rejected,
+                'saturated': self._calls >= self._max_calls,
+            }
+
+    def shutdown(self) -> None:
+        """Wait for the running and pending calls, then join the workers"""
+        self._executor.shutdown(wait=True)
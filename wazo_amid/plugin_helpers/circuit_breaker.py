@@ -0,0 +1,102 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+CircuitState = Literal['closed', 'open']
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Fail fast after `failure_threshold` consecutive failures.
+
+    Once open, `check` raises CircuitOpen and `probe` is called every
+    `retry_interval` seconds from a background thread. The circuit closes
+    again as soon as a probe does not raise.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        retry_interval: float,
+        probe: Callable[[], Any],
+    ) -> None:
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._retry_interval = retry_interval
+        self._probe = probe
+        self._state: CircuitState = 'closed'
+        self._failures = 0
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._probe_thread: threading.Thread | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+
+    def check(self) -> None:
+        if self._state == 'open':
+            raise CircuitOpen()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == 'open' or self._failures < self._failure_threshold:
+                return
+            self._state = 'open'
+            self._opened += 1
+
+        logger.warning(
+            '%s circuit breaker opened after %d failures',
+            self._name,
+            self._failure_threshold,
+        )
+        self._probe_thread = threading.Thread(
+            target=self._probe_until_success,
+            name=f'{self._name}_probe',
+            daemon=True,
+        )
+        self._probe_thread.start()
+
+    def _probe_until_success(self) -> None:
+        while not self._stop_event.wait(timeout=self._retry_interval):
+            try:
+                self._probe()
+            except Exception as e:
+                logger.debug('%s probe failed: %s', self._name, e)
+                continue
+            with self._lock:
+                self._state = 'closed'
+                self._failures = 0
+            logger.info('%s circuit breaker closed', self._name)
+            return
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'opened': self._opened,
+            }
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._probe_thread:
+            self._probe_thread.join()
@@ -0,0 +1,233 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import functools
+import itertools
+import logging
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING
+
+from .ami import AMIActionResponse, args_key
+
+if TYPE_CHECKING:
+    from .ami import ActionArgs, ActionClient, ActionResponse, ActionStream, ArgsKey
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.content: bytes = b''
+        self.error: Exception | None = None
+        self.waiters = 0
+        self.done = threading.Event()
+
+
+class _SharedStream:
+    """Upstream response stream read once on behalf of several readers.
+
+    The reader asking for a chunk that was not received yet reads it from
+    upstream, the others get it from the chunks already received. A chunk is
+    dropped once every reader got it, and callers can only join while the
+    first chunk is still kept. The upstream stream is closed once it is
+    exhausted or once every reader is closed.
+    """
+
+    def __init__(self, open_stream: Callable[[], ActionStream]) -> None:
+        self._open_stream = open_stream
+        self._stream: ActionStream | None = None
+        self._chunks_iterator: Iterator[bytes] | None = None
+        self._chunks: deque[bytes] = deque()
+        self._first_index = 0
+        self._positions: dict[int, int] = {}
+        self._reader_ids = itertools.count()
+        self._done = False
+        self._error: Exception | None = None
+        # `_read_lock` is held while waiting for upstream, `_lock` is not
+        self._read_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def attach(self) -> int | None:
+        """Add a reader, None when the response is too far along to join"""
+        with self._lock:
+            if self._first_index or self._done:
+                return None
+            reader = next(self._reader_ids)
+            self._positions[reader] = 0
+            return reader
+
+    def detach(self, reader: int) -> int:
+        """Remove a reader, return the number of readers left"""
+        with self._lock:
+            del self._positions[reader]
+            self._drop_read_chunks()
+            return len(self._positions)
+
+    def open(self) -> None:
+        """Send the action upstream, its error is raised to every reader"""
+        with self._read_lock:
+            if self._error is not None:
+                raise self._error
+            if self._chunks_iterator is not None:
+                return
+            try:
+                self._stream = self._open_stream()
+                self._chunks_iterator = iter(self._stream)
+            except Exception as e:
+                self._finish(e)
+                raise
+
+    def chunk(self, reader: int, index: int) -> bytes | None:
+        """Chunk number `index` of the response, None after the last one"""
+        with self._read_lock:
+            if index == self._first_index + len(self._chunks):
+                if self._error is not None:
+                    raise self._error
+                if self._done:
+                    return None
+                assert self._chunks_iterator is not None
+                try:
+                    chunk = next(self._chunks_iterator)
+                except StopIteration:
+                    self._finish(None)
+                    return None
+                except Exception as e:
+                    self._finish(e)
+                    raise
+                with self._lock:
+                    self._chunks.append(chunk)
+            with self._lock:
+                chunk = self._chunks[index - self._first_index]
+                self._positions[reader] = index + 1
+                self._drop_read_chunks()
+            return chunk
+
+    def _drop_read_chunks(self) -> None:
+        if not self._positions:
+            return
+        read_by_all = min(self._positions.values())
+        while self._first_index < read_by_all:
+            self._chunks.popleft()
+            self._first_index += 1
+
+    def _finish(self, error: Exception | None) -> None:
+        with self._lock:
+            self._done = True
+            self._error = error
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            stream, self._stream = self._stream, None
+        if stream is not None:
+            stream.close()
+
+
+class _CoalescedStream:
+    def __init__(
+        self, shared: _SharedStream, reader: int, release: Callable[[], None]
+    ) -> None:
+        self._shared = shared
+        self._reader = reader
+        self._release: Callable[[], None] | None = release
+
+    def __iter__(self) -> Iterator[bytes]:
+        index = 0
+        while (chunk := self._shared.chunk(self._reader, index)) is not None:
+            yield chunk
+            index += 1
+
+    def close(self) -> None:
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+
+class CoalescingActionClient:
+    """Share one upstream call between identical concurrent actions.
+
+    While an action listed in `actions` is in flight, the same action with
+    the same arguments waits for its response instead of being sent again.
+    Streamed responses are shared while they are received, so they are still
+    streamed to every caller. Actions with side effects must not be listed.
+    """
+
+    def __init__(self, action_client: ActionClient, actions: Iterable[str]) -> None:
+        self._action_client = action_client
+        self._actions = frozenset(action.lower() for action in actions)
+        self._calls: dict[tuple[str, ArgsKey], _Call] = {}
+        self._streams: dict[tuple[str, ArgsKey], _SharedStream] = {}
+        self._lock = threading.Lock()
+
+    def get(self, action: str, ami_args: ActionArgs) -> ActionResponse:
+        if action.lower() not in self._actions:
+            return self._action_client.get(action, ami_args)
+        return AMIActionResponse(self._coalesced_call(action, ami_args))
+
+    def stream(self, action: str, ami_args: ActionArgs) -> ActionStream:
+        if action.lower() not in self._actions:
+            return self._action_client.stream(action, ami_args)
+        key = (action.lower(), args_key(ami_args))
+        with self._lock:
+            shared = self._streams.get(key)
+            reader = shared.attach() if shared is not None else None
+            if shared is None or reader is None:
+                shared = self._streams[key] = _SharedStream(
+                    functools.partial(self._action_client.stream, action, ami_args)
+                )
+                reader = shared.attach()
+                assert reader is not None
+            else:
+                logger.debug('%s response shared with another caller', action)
+        release = functools.partial(self._release_stream, key, shared, reader)
+        # errors are raised here, before the caller starts sending a response
+        try:
+            shared.open()
+        except Exception:
+            release()
+            raise
+        return _CoalescedStream(shared, reader, release)
+
+    def _release_stream(
+        self, key: tuple[str, ArgsKey], shared: _SharedStream, reader: int
+    ) -> None:
+        with self._lock:
+            if shared.detach(reader):
+                return
+            if self._streams.get(key) is shared:
+                del self._streams[key]
+        shared.close()
+
+    def _coalesced_call(self, action: str, ami_args: ActionArgs) -> bytes:
+        key = (action.lower(), args_key(ami_args))
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.content
+
+        try:
+            call.content = self._action_client.get(action, ami_args).content
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        if call.waiters:
+            logger.debug('%s response shared with %d callers', action, call.waiters)
+        return call.content
@@ -0,0 +1,301 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from collections import defaultdict
+from collections.abc import Iterator
+from unittest.mock import Mock, call, patch
+
+import requests
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+from xivo.status import Status
+
+from wazo_amid.metrics import BoundedLabel
+from wazo_amid.plugin_helpers.ajam import AJAMClient, AJAMUnreachable
+
+URL = 'http://localhost:5039/rawman'
+LOGIN_PARAMS = {'action': 'login', 'username': 'user', 'secret': 'pass'}
+SUCCESS = b'Response: Success\r\nPing: Pong\r\n\r\n'
+TIMEOUT = (5, 30)
+EXPIRED = b'Response: Error\r\nMessage: Permission denied\r\n\r\n'
+
+
+def response(content: bytes) -> Mock:
+    return Mock(content=content)
+
+
+class TestAJAMClient(unittest.TestCase):
+    def setUp(self) -> None:
+        session_patch = patch('wazo_amid.plugin_helpers.ajam.requests.Session')
+        self.session_constructor = session_patch.start()
+        self.addCleanup(session_patch.stop)
+        self.session = self.session_constructor.return_value
+        self.session.get.return_value = response(SUCCESS)
+        self.client = AJAMClient(
+            'localhost', 5039, 'user', 'pass', https=False, pool_size=2
+        )
+
+    def test_when_get_twice_then_session_logged_in_once_and_reused(self) -> None:
+        self.client.get('Ping', {})
+        self.client.get('Ping', {})
+
+        self.session_constructor.assert_called_once_with()
+        assert_that(
+            self.session.get.call_args_list,
+            equal_to(
+                [
+                    call(
+                        URL,
+                        params=LOGIN_PARAMS,
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                    call(
+                        URL,
+                        params=[('action', 'Ping')],
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                    call(
+                        URL,
+                        params=[('action', 'Ping')],
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                ]
+            ),
+        )
+
+    def test_given_expired_session_when_get_then_login_and_retry(self) -> None:
+        self.client.get('Ping', {})
+        self.session.get.reset_mock()
+        self.session.get.side_effect = [
+            response(EXPIRED),
+            response(SUCCESS),
+            response(SUCCESS),
+        ]
+
+        result = self.client.get('Ping', {})
+
+        assert_that(result.content, equal_to(SUCCESS))
+        assert_that(
+            self.session.get.call_args_list,
+            equal_to(
+                [
+                    call(
+                        URL,
+                        params=[('action', 'Ping')],
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                    call(
+                        URL,
+                        params=LOGIN_PARAMS,
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                    call(
+                        URL,
+                        params=[('action', 'Ping')],
+                        verify=None,
+                        timeout=TIMEOUT,
+                        stream=False,
+                    ),
+                ]
+            ),
+        )
+
+    def test_given_request_error_when_get_then_session_discarded(self) -> None:
+        self.client.get('Ping', {})
+        self.session.get.side_effect = requests.ConnectionError()
+
+        assert_that(
+            calling(self.client.get).with_args('Ping', {}),
+            raises(AJAMUnreachable),
+        )
+
+        self.session.close.assert_called_once_with()
+        self.session.get.side_effect = None
+        self.client.get('Ping', {})
+        assert_that(self.session_constructor.call_count, equal_to(2))
+
+    def test_when_stream_then_chunks_yielded_and_session_released(self) -> None:
+        self.session.get.return_value = streamed_response(SUCCESS[:10], SUCCESS[10:])
+
+        stream = self.client.stream('Ping', {})
+        content = b''.join(stream)
+        stream.close()
+
+        assert_that(content, equal_to(SUCCESS))
+        self.session.get.assert_called_with(
+            URL, params=[('action', 'Ping')], verify=None, timeout=TIMEOUT, stream=True
+        )
+        self.session.get.return_value = response(SUCCESS)
+        self.client.get('Ping', {})
+        self.client.get('Ping', {})
+        self.session_constructor.assert_called_once_with()
+
+    def test_given_expired_session_when_stream_then_login_and_retry(self) -> None:
+        self.client.get('Ping', {})
+        self.session.get.reset_mock()
+        self.session.get.side_effect = [
+            streamed_response(EXPIRED),
+            response(SUCCESS),
+            streamed_response(SUCCESS),
+        ]
+
+        stream = self.client.stream('Ping', {})
+
+        assert_that(b''.join(stream), equal_to(SUCCESS))
+        assert_that(self.session.get.call_count, equal_to(3))
+
+    def test_given_error_while_streaming_when_close_then_session_discarded(
+        self,
+    ) -> None:
+        broken = streamed_response(SUCCESS)
+        broken.iter_content.return_value = failing_chunks(SUCCESS * 2)
+        self.session.get.return_value = broken
+        stream = self.client.stream('Ping', {})
+
+        assert_that(calling(b''.join).with_args(stream), raises(AJAMUnreachable))
+        stream.close()
+
+        self.session.close.assert_called_once_with()
+
+    def test_given_repeated_errors_while_streaming_then_fail_fast(self) -> None:
+        client = AJAMClient(
+            'localhost',
+            5039,
+            https=False,
+            circuit_breaker={'failure_threshold': 2, 'retry_interval': 3600},
+        )
+        self.addCleanup(client.close)
+        for _ in range(2):
+            broken = streamed_response(SUCCESS)
+            broken.iter_content.return_value = failing_chunks(SUCCESS * 2)
+            self.session.get.return_value = broken
+            stream = client.stream('Ping', {})
+            assert_that(calling(b''.join).with_args(stream), raises(AJAMUnreachable))
+            stream.close()
+
+        assert_that(
+            calling(client.stream).with_args('Ping', {}),
+            raises(AJAMUnreachable, 'circuit breaker open'),
+        )
+
+    def test_given_repeated_errors_when_get_then_fail_fast(self) -> None:
+        client = AJAMClient(
+            'localhost',
+            5039,
+            https=False,
+            circuit_breaker={'failure_threshold': 2, 'retry_interval': 3600},
+        )
+        self.session.get.side_effect = requests.ConnectionError()
+        for _ in range(2):
+            assert_that(
+                calling(client.get).with_args('Ping', {}), raises(AJAMUnreachable)
+            )
+        self.session.get.reset_mock()
+
+        assert_that(
+            calling(client.get).with_args('Ping', {}),
+            raises(AJAMUnreachable, 'circuit breaker open'),
+        )
+        self.session.get.assert_not_called()
+        status: dict = defaultdict(dict)
+        client.provide_status(status)
+        assert_that(status['ajam']['status'], equal_to(Status.fail))
+        assert_that(
+            status['ajam']['circuit_breaker'], has_entries(state='open', opened=1)
+        )
+
+    @patch('wazo_amid.plugin_helpers.ajam._metric_action', BoundedLabel(1))
+    @patch('wazo_amid.plugin_helpers.ajam.metrics.ajam_request_seconds')
+    def test_when_get_then_duration_observed_per_bounded_action(
+        self, request_seconds: Mock
+    ) -> None:
+        self.client.get('QueueStatus', {})
+        self.client.get('CoreStatus', {})
+        self.client.get('queuestatus', {})
+
+        assert_that(
+            [observe.args[1] for observe in request_seconds.observe.call_args_list],
+            equal_to(['queuestatus', 'other', 'queuestatus']),
+        )
+
+    @patch('wazo_amid.plugin_helpers.ajam.metrics.ajam_request_seconds')
+    def test_given_circuit_open_when_get_then_duration_not_observed(
+        self, request_seconds: Mock
+    ) -> None:
+        client = AJAMClient(
+            'localhost',
+            5039,
+            https=False,
+            circuit_breaker={'failure_threshold': 1, 'retry_interval': 3600},
+        )
+        self.session.get.side_effect = requests.ConnectionError()
+        assert_that(calling(client.get).with_args('Ping', {}), raises(AJAMUnreachable))
+        request_seconds.reset_mock()
+
+        assert_that(calling(client.get).with_args('Ping', {}), raises(AJAMUnreachable))
+
+        request_seconds.observe.assert_not_called()
+
+    def test_given_executor_full_when_get_then_fail_fast(self) -> None:
+        release = threading.Event()
+        self.session.get.side_effect = lambda *args, **kwargs: (
+            release.wait(timeout=5) and response(SUCCESS)
+        )
+        client = AJAMClient(
+            'localhost',
+            5039,
+            https=False,
+            executor={'max_workers': 1, 'max_pending': 0},
+        )
+        thread = threading.Thread(target=client.get, args=('Ping', {}))
+        thread.start()
+        try:
+            while not client._bulkhead.stats()['saturated']:
+                time.sleep(0.01)
+
+            assert_that(
+                calling(client.get).with_args('Ping', {}),
+                raises(AJAMUnreachable, 'too many concurrent requests'),
+            )
+        finally:
+            release.set()
+            thread.join()
+        status: dict = defaultdict(dict)
+        client.provide_status(status)
+        assert_that(
+            status['ajam']['executor'],
+            has_entries(running=0, pending=0, rejected=1, saturated=False),
+        )
+
+    def test_when_close_then_worker_threads_joined(self) -> None:
+        self.client.get('Ping', {})
+
+        self.client.close()
+
+        workers = self.client._bulkhead._executor._threads
+        assert_that([worker.is_alive() for worker in workers], equal_to([False]))
+
+
+def streamed_response(*chunks: bytes) -> Mock:
+    mock = Mock()
+    mock.iter_content.return_value = iter(chunks)
+    return mock
+
+
+def failing_chunks(*chunks: bytes) -> Iterator[bytes]:
+    yield from chunks
+    raise requests.ConnectionError()
@@ -0,0 +1,125 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import socket
+import threading
+import unittest
+from collections.abc import Callable
+from unittest.mock import patch
+
+from hamcrest import assert_that, calling, contains_string, equal_to, raises
+
+from wazo_amid.ami.parser import FrameBuffer, get_frame_header
+from wazo_amid.plugin_helpers.ami import AMIActionClient, AMIUnreachable
+
+Responder = Callable[[bytes, bytes], bytes]
+
+
+class FakeAsterisk(threading.Thread):
+    def __init__(self, sock: socket.socket, responder: Responder) -> None:
+        super().__init__(daemon=True)
+        self.sock = sock
+        self.responder = responder
+        self.actions: list[bytes] = []
+
+    def run(self) -> None:
+        self.sock.sendall(b'Asterisk Call Manager/5.0.1\r\n')
+        frame_buffer = FrameBuffer()
+        while data := self.sock.recv(4096):
+            for frame in frame_buffer.feed(data):
+                self.actions.append(frame)
+                action = get_frame_header(frame, b'Action') or b''
+                action_id = get_frame_header(frame, b'ActionID') or b''
+                if action == b'Login':
+                    response = b'Response: Success\r\nActionID: %s\r\n\r\n' % action_id
+                else:
+                    response = self.responder(action, action_id)
+                if response:
+                    self.sock.sendall(response)
+
+
+class TestAMIActionClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client_sock, self.server_sock = socket.socketpair()
+        self.addCleanup(self.client_sock.close)
+        self.addCleanup(self.server_sock.close)
+        create_connection_patch = patch(
+            'wazo_amid.plugin_helpers.ami.socket.create_connection',
+            return_value=self.client_sock,
+        )
+        create_connection_patch.start()
+        self.addCleanup(create_connection_patch.stop)
+        self.client = AMIActionClient('localhost', 5038, 'user', 'pass', timeout=1)
+
+    def start_asterisk(self, responder: Responder) -> FakeAsterisk:
+        asterisk = FakeAsterisk(self.server_sock, responder)
+        asterisk.start()
+        return asterisk
+
+    def test_when_get_then_login_once_and_response_returned(self) -> None:
+        asterisk = self.start_asterisk(
+            lambda action, action_id: b'Response: Success\r\nActionID: %s\r\n'
+            b'Ping: Pong\r\n\r\n' % action_id
+        )
+
+        self.client.get('Ping', {})
+        response = self.client.get('Ping', {})
+
+        assert_that(response.content.decode(), contains_string('Ping: Pong\r\n\r\n'))
+        actions = [get_frame_header(frame, b'Action') for frame in asterisk.actions]
+        assert_that(actions, equal_to([b'Login', b'Ping', b'Ping']))
+        assert_that(asterisk.actions[0].decode(), contains_string('Events: off'))
+
+    def test_given_event_list_when_get_then_events_until_complete_returned(
+        self,
+    ) -> None:
+        def responder(action: bytes, action_id: bytes) -> bytes:
+            return (
+                b'Event: Unrelated\r\n\r\n'
+                b'Response: Success\r\nActionID: %(id)s\r\nEventList: start\r\n\r\n'
+                b'Event: QueueParams\r\nActionID: %(id)s\r\nQueue: q\r\n\r\n'
+                b'Event: QueueStatusComplete\r\nActionID: %(id)s\r\n'
+                b'EventList: Complete\r\n\r\n'
+            ) % {b'id': action_id}
+
+        self.start_asterisk(responder)
+
+        response = self.client.get('QueueStatus', {'Queue': 'q'})
+
+        frames = FrameBuffer().feed(response.content)
+        assert_that(
+            [frame.split(b'\r\n')[0] for frame in frames],
+            equal_to(
+                [
+                    b'Response: Success',
+                    b'Event: QueueParams',
+                    b'Event: QueueStatusComplete',
+                ]
+            ),
+        )
+
+    def test_given_multiple_values_when_get_then_header_repeated(self) -> None:
+        asterisk = self.start_asterisk(
+            lambda action, action_id: b'Response: Success\r\nActionID: %s\r\n\r\n'
+            % action_id
+        )
+
+        self.client.get('Originate', {'Variable': ['A=1', 'B=2']})
+
+        assert_that(
+            asterisk.actions[1].decode(),
+            contains_string('Variable: A=1\r\nVariable: B=2'),
+        )
+
+    def test_given_connection_closed_when_get_then_ami_unreachable(self) -> None:
+        def responder(action: bytes, action_id: bytes) -> bytes:
+            self.server_sock.shutdown(socket.SHUT_RDWR)
+            return b''
+
+        self.start_asterisk(responder)
+
+        assert_that(
+            calling(self.client.get).with_args('Ping', {}), raises(AMIUnreachable)
+        )
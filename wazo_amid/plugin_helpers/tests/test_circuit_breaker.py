@@ -0,0 +1,67 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, calling, equal_to, has_entries, raises
+
+from wazo_amid.plugin_helpers.circuit_breaker import CircuitBreaker, CircuitOpen
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.probed = threading.Event()
+        self.probe = Mock(side_effect=self._probe)
+        self.breaker = CircuitBreaker(
+            'test', failure_threshold=2, retry_interval=0.01, probe=self.probe
+        )
+        self.addCleanup(self.breaker.stop)
+
+    def _probe(self) -> None:
+        if self.probe.call_count == 1:
+            raise Exception('still down')
+        self.probed.set()
+
+    def test_given_failures_below_threshold_then_closed(self) -> None:
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.breaker.check()
+        assert_that(self.breaker.state, equal_to('closed'))
+
+    def test_given_consecutive_failures_then_open_until_probe_succeeds(self) -> None:
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        assert_that(calling(self.breaker.check).with_args(), raises(CircuitOpen))
+
+        self.probed.wait(timeout=5)
+        for _ in range(500):
+            if self.breaker.state == 'closed':
+                break
+            self.probed.wait(timeout=0.01)
+        self.breaker.check()
+        assert_that(
+            self.breaker.stats(),
+            has_entries(state='closed', consecutive_failures=0, opened=1),
+        )
+        assert_that(self.probe.call_count, equal_to(2))
+
+    def test_given_open_when_stop_then_probe_thread_joined(self) -> None:
+        breaker = CircuitBreaker(
+            'stopped', failure_threshold=1, retry_interval=3600, probe=self.probe
+        )
+        breaker.record_failure()
+
+        breaker.stop()
+
+        probe_threads = [
+            thread for thread in threading.enumerate() if thread.name == 'stopped_probe'
+        ]
+        assert_that(probe_threads, equal_to([]))
+        self.probe.assert_not_called()
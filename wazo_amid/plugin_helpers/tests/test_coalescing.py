@@ -0,0 +1,226 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+from collections.abc import Iterator
+from unittest.mock import Mock
+
+from hamcrest import assert_that, calling, contains_exactly, equal_to, raises
+
+from wazo_amid.plugin_helpers.ami import ActionArgs, AMIActionResponse
+from wazo_amid.plugin_helpers.coalescing import CoalescingActionClient
+
+QUEUES = b'Response: Success\r\nEventList: start\r\n\r\n'
+
+
+class SlowActionClient:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, ActionArgs]] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error: Exception | None = None
+
+    def get(self, action: str, ami_args: ActionArgs) -> AMIActionResponse:
+        self.calls.append((action, ami_args))
+        self.started.set()
+        self.release.wait(timeout=5)
+        if self.error is not None:
+            raise self.error
+        return AMIActionResponse(QUEUES)
+
+    def stream(self, action: str, ami_args: ActionArgs) -> Mock:
+        return Mock()
+
+
+class ChunkedStream:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = chunks
+        self.released = threading.Semaphore(0)
+        self.closed = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.chunks:
+            self.released.acquire(timeout=5)
+            yield chunk
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+class StreamingActionClient:
+    def __init__(self, stream: ChunkedStream) -> None:
+        self.stream_calls = 0
+        self.error: Exception | None = None
+        self._stream = stream
+
+    def get(self, action: str, ami_args: ActionArgs) -> AMIActionResponse:
+        raise NotImplementedError()
+
+    def stream(self, action: str, ami_args: ActionArgs) -> ChunkedStream:
+        self.stream_calls += 1
+        if self.error is not None:
+            raise self.error
+        return self._stream
+
+
+class TestCoalescingActionClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.upstream = SlowActionClient()
+        self.client = CoalescingActionClient(self.upstream, ['QueueStatus'])
+
+    def _get_concurrently(self, *calls: tuple[str, ActionArgs]) -> list:
+        results: list = [None] * len(calls)
+
+        def get(index: int, action: str, ami_args: ActionArgs) -> None:
+            try:
+                results[index] = self.client.get(action, ami_args).content
+            except Exception as e:
+                results[index] = e
+
+        first, *others = [
+            threading.Thread(target=get, args=(index, *call))
+            for index, call in enumerate(calls)
+        ]
+        first.start()
+        self.upstream.started.wait(timeout=5)
+        for thread in others:
+            thread.start()
+        call = next(iter(self.client._calls.values()))
+        for _ in range(500):
+            if call.waiters == len(others):
+                break
+            time.sleep(0.01)
+        self.upstream.release.set()
+        for thread in [first, *others]:
+            thread.join(timeout=5)
+        return results
+
+    def test_given_identical_concurrent_actions_then_sent_once(self) -> None:
+        results = self._get_concurrently(
+            ('QueueStatus', {'Queue': 'q1'}),
+            ('queuestatus', {'queue': 'q1'}),
+            ('QueueStatus', {'Queue': 'q1'}),
+        )
+
+        assert_that(results, equal_to([QUEUES] * 3))
+        assert_that(len(self.upstream.calls), equal_to(1))
+
+    def test_given_upstream_error_then_raised_to_every_caller(self) -> None:
+        self.upstream.error = error = RuntimeError('unreachable')
+
+        results = self._get_concurrently(
+            ('QueueStatus', {}),
+            ('QueueStatus', {}),
+        )
+
+        assert_that(results, equal_to([error, error]))
+        assert_that(len(self.upstream.calls), equal_to(1))
+        assert_that(self.client._calls, equal_to({}))
+
+    def test_given_action_not_coalesced_then_sent_each_time(self) -> None:
+        self.upstream.release.set()
+
+        self.client.get('Originate', {'Channel': 'PJSIP/a'})
+        self.client.get('Originate', {'Channel': 'PJSIP/a'})
+
+        assert_that(len(self.upstream.calls), equal_to(2))
+
+    def test_given_sequential_actions_then_not_shared(self) -> None:
+        self.upstream.release.set()
+        self.client.get('QueueStatus', {})
+        self.upstream.error = RuntimeError()
+
+        assert_that(
+            calling(self.client.get).with_args('QueueStatus', {}),
+            raises(RuntimeError),
+        )
+
+
+class TestCoalescingActionClientStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.upstream_stream = ChunkedStream([b'first', b'second'])
+        self.upstream = StreamingActionClient(self.upstream_stream)
+        self.client = CoalescingActionClient(self.upstream, ['CoreShowChannels'])
+
+    def test_given_coalesced_action_when_stream_then_chunks_streamed(self) -> None:
+        stream = self.client.stream('CoreShowChannels', {})
+        chunks = iter(stream)
+
+        self.upstream_stream.released.release()
+        first = next(chunks)
+
+        assert_that(first, equal_to(b'first'))
+        assert_that(
+            self.upstream_stream.released.acquire(blocking=False), equal_to(False)
+        )
+        self.upstream_stream.released.release()
+        assert_that(list(chunks), contains_exactly(b'second'))
+        stream.close()
+
+    def test_given_identical_concurrent_streams_then_upstream_read_once(
+        self,
+    ) -> None:
+        first = self.client.stream('CoreShowChannels', {})
+        second = self.client.stream('coreshowchannels', {})
+        self.upstream_stream.released.release(2)
+
+        first_chunks = list(first)
+        second_chunks = list(second)
+        first.close()
+        second.close()
+
+        assert_that(first_chunks, contains_exactly(b'first', b'second'))
+        assert_that(second_chunks, contains_exactly(b'first', b'second'))
+        assert_that(self.upstream.stream_calls, equal_to(1))
+        assert_that(self.upstream_stream.closed, equal_to(1))
+        assert_that(self.client._streams, equal_to({}))
+
+    def test_given_stream_closed_early_then_upstream_closed(self) -> None:
+        stream = self.client.stream('CoreShowChannels', {})
+        self.upstream_stream.released.release()
+        next(iter(stream))
+
+        stream.close()
+
+        assert_that(self.upstream_stream.closed, equal_to(1))
+        assert_that(self.client._streams, equal_to({}))
+
+    def test_given_upstream_error_when_stream_then_raised_before_iterating(
+        self,
+    ) -> None:
+        self.upstream.error = RuntimeError('unreachable')
+
+        assert_that(
+            calling(self.client.stream).with_args('CoreShowChannels', {}),
+            raises(RuntimeError, 'unreachable'),
+        )
+        assert_that(self.client._streams, equal_to({}))
+
+    def test_given_single_reader_then_read_chunks_not_kept(self) -> None:
+        stream = self.client.stream('CoreShowChannels', {})
+        shared = self.client._streams[('coreshowchannels', ())]
+        self.upstream_stream.released.release(2)
+
+        chunks = iter(stream)
+        next(chunks)
+        kept_after_first = len(shared._chunks)
+        next(chunks)
+
+        assert_that(kept_after_first, equal_to(0))
+        assert_that(len(shared._chunks), equal_to(0))
+        stream.close()
+
+    def test_given_first_chunk_read_by_every_reader_then_not_joined(self) -> None:
+        first = self.client.stream('CoreShowChannels', {})
+        self.upstream_stream.released.release(3)
+        next(iter(first))
+
+        second = self.client.stream('CoreShowChannels', {})
+
+        assert_that(self.upstream.stream_calls, equal_to(2))
+        first.close()
+        second.close()
@@ -0,0 +1,106 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any
+
+from wazo_amid.ami import parser
+from wazo_amid.exceptions import APIException
+
+from .exceptions import ActionNotAuthorized, UnsupportedAction
+
+if TYPE_CHECKING:
+    from wazo_amid.plugin_helpers.ami import ActionArgs, ActionClient
+
+logger = logging.getLogger(__name__)
+
+# the format of these responses is suited for display, not parsing
+UNSUPPORTED_ACTIONS = frozenset(('queues', 'command'))
+
+BatchItemDict = dict[str, Any]
+BatchResult = dict[str, Any]
+
+
+class BatchRunner:
+    """Send the actions of batches on a shared, bounded pool of threads.
+
+    All batches share the same `max_workers` threads, so that concurrent
+    batches cannot use up the connections to Asterisk needed by single
+    actions. Each item gets its own result, an error does not stop the batch.
+    """
+
+    def __init__(self, action_client: ActionClient, max_workers: int) -> None:
+        self._action_client = action_client
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='action_batch'
+        )
+
+    def submit(
+        self, items: list[BatchItemDict], is_authorized: Callable[[str], bool]
+    ) -> list[Future[BatchResult]]:
+        """Start sending the actions, `is_authorized` is called from this thread"""
+        authorized = {
+            action: is_authorized(action)
+            for action in {item['action'] for item in items}
+        }
+        return [
+            self._executor.submit(
+                self._run_item,
+                index,
+                item['action'],
+                item['args'],
+                authorized[item['action']],
+            )
+            for index, item in enumerate(items)
+        ]
+
+    @staticmethod
+    def iter_completed(futures: list[Future[BatchResult]]) -> Iterator[BatchResult]:
+        """Yield the results as soon as they are available"""
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _run_item(
+        self, index: int, action: str, ami_args: ActionArgs, authorized: bool
+    ) -> BatchResult:
+        result: BatchResult = {'index': index, 'action': action}
+        try:
+            if not authorized:
+                raise ActionNotAuthorized(action)
+            if action.lower() in UNSUPPORTED_ACTIONS:
+                raise UnsupportedAction(action)
+            content = self._action_client.get(action, ami_args).content
+        except APIException as e:
+            result['status_code'] = e.status_code
+            result['error'] = {
+                'message': e.message,
+                'error_id': e.id_,
+                'details': e.details,
+            }
+            return result
+        except Exception:
+            logger.exception('Unexpected error while sending action %s', action)
+            result['status_code'] = 500
+            result['error'] = {
+                'message': 'Unexpected error',
+                'error_id': 'unexpected-error',
+                'details': {},
+            }
+            return result
+
+        result['status_code'] = 200
+        result['response'] = [
+            message.headers for message in parser.iter_messages([content])
+        ]
+        return result
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
@@ -14,3 +14,23 @@ class UnsupportedAction(APIException):
             error_id='incompatible-action',
             details={'action': action},
         )
+
+
+class ActionNotAuthorized(APIException):
+    def __init__(self, action: str) -> None:
+        super().__init__(
+            status_code=401,
+            message='Unauthorized action',
+            error_id='unauthorized',
+            details={'required_acl': f'amid.action.{action}.create'},
+        )
+
+
+class AuthServerUnreachable(APIException):
+    def __init__(self, error: Exception) -> None:
+        super().__init__(
+            status_code=503,
+            message='Authentication server unreachable',
+            error_id='authentication-server-unreachable',
+            details={'original_error': str(error)},
+        )
@@ -3,47 +3,88 @@
 
 from __future__ import annotations
 
-from typing import Any
+import io
+import json
+from collections.abc import Iterable, Iterator
 
 import requests
-from flask import request
+from flask import Response, request
+from xivo.tenant_flask_helpers import auth_client, token
 
 from wazo_amid.ami import parser
 from wazo_amid.auth import required_acl, required_master_tenant
-from wazo_amid.plugin_helpers.ajam import AJAMClient, AJAMUnreachable
+from wazo_amid.exceptions import ValidationError
+from wazo_amid.plugin_helpers.ami import ActionClient
 from wazo_amid.rest_api import AuthResource
 
-from .exceptions import UnsupportedAction
+from .batch import UNSUPPORTED_ACTIONS, BatchResult, BatchRunner
+from .exceptions import AuthServerUnreachable, UnsupportedAction
+from .schema import MAX_BATCH_SIZE, batch_item_schema
+
+JSON_FLUSH_SIZE = 65536
 
 
 class ActionResource(AuthResource):
-    def __init__(self, ajam_client: AJAMClient) -> None:
-        self.ajam_client = ajam_client
+    def __init__(self, action_client: ActionClient) -> None:
+        self.action_client = action_client
 
     @required_master_tenant()
     @required_acl('amid.action.{action}.create')
-    def post(self, action: str) -> tuple[list[dict[str, Any]], int]:
-        if action.lower() in ('queues', 'command'):
+    def post(self, action: str) -> Response:
+        if action.lower() in UNSUPPORTED_ACTIONS:
             raise UnsupportedAction(action)
 
         extra_args = request.get_json(force=True, silent=True) or {}
 
-        try:
-            response = self.ajam_client.get(action, extra_args)
-        except requests.RequestException as e:
-            raise AJAMUnreachable(self.ajam_client.url, e)
+        stream = self.action_client.stream(action, extra_args)
+        response = Response(_iter_json_array(stream), mimetype='application/json')
+        response.call_on_close(stream.close)
+        return response
+
+
+class ActionsResource(AuthResource):
+    def __init__(self, batch_runner: BatchRunner) -> None:
+        self.batch_runner = batch_runner
+
+    @required_master_tenant()
+    @required_acl('amid.actions.create')
+    def post(self) -> Response:
+        body = request.get_json(force=True)
+        if not isinstance(body, list):
+            raise ValidationError(['Expected a list of actions'])
+        if len(body) > MAX_BATCH_SIZE:
+            raise ValidationError([f'At most {MAX_BATCH_SIZE} actions are accepted'])
+        items = batch_item_schema.load(body, many=True)
+
+        futures = self.batch_runner.submit(items, _is_authorized)
+        if request.args.get('stream', 'false').lower() == 'true':
+            results = self.batch_runner.iter_completed(futures)
+            return Response(_iter_json_lines(results), mimetype='application/x-ndjson')
+        results_in_order = [future.result() for future in futures]
+        return Response(json.dumps(results_in_order), mimetype='application/json')
+
 
-        return self._parse_ami(response.content), 200
+def _is_authorized(action: str) -> bool:
+    try:
+        return auth_client.token.is_valid(token.uuid, f'amid.action.{action}.create')
+    except requests.RequestException as e:
+        raise AuthServerUnreachable(e)
 
-    @staticmethod
-    def _parse_ami(buffer_: bytes) -> list[dict[str, Any]]:
-        result = []
 
-        def aux(
-            event_name: str, action_id: str | None, message: dict[str, Any]
-        ) -> None:
-            result.append(message)
+def _iter_json_lines(results: Iterable[BatchResult]) -> Iterator[str]:
+    for result in results:
+        yield json.dumps(result) + '\n'
 
-        parser.parse_buffer(buffer_, aux, aux)
 
-        return result
+def _iter_json_array(chunks: Iterable[bytes]) -> Iterator[str]:
+    buffer = io.StringIO()
+    buffer.write('[')
+    for index, message in enumerate(parser.iter_messages(chunks)):
+        if index:
+            buffer.write(',')
+        buffer.write(json.dumps(message.headers))
+        if buffer.tell() >= JSON_FLUSH_SIZE:
+            yield buffer.getvalue()
+            buffer = io.StringIO()
+    buffer.write(']')
+    yield buffer.getvalue()
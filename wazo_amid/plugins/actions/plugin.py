@@ -5,7 +5,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from .http import ActionResource
+from .batch import BatchRunner
+from .http import ActionResource, ActionsResource
 
 if TYPE_CHECKING:
     from wazo_amid.rest_api import PluginDependencies
@@ -14,10 +15,20 @@ if TYPE_CHECKING:
 class Plugin:
     def load(self, dependencies: PluginDependencies) -> None:
         api = dependencies['api']
-        ajam_client = dependencies['ajam_client']
+        action_client = dependencies['action_client']
+        config = dependencies['config']
+        batch_runner = BatchRunner(
+            action_client, config['action_client']['batch_max_workers']
+        )
+        dependencies['teardown'].callback(batch_runner.shutdown)
 
         api.add_resource(
             ActionResource,
             '/action/<action>',
-            resource_class_args=[ajam_client],
+            resource_class_args=[action_client],
+        )
+        api.add_resource(
+            ActionsResource,
+            '/actions',
+            resource_class_args=[batch_runner],
         )
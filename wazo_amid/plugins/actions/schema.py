@@ -0,0 +1,16 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from marshmallow import validate
+from xivo.mallow import fields
+from xivo.mallow_helpers import Schema
+
+MAX_BATCH_SIZE = 1000
+
+
+class BatchItem(Schema):
+    action = fields.String(required=True, validate=validate.Length(min=1))
+    args = fields.Dict(keys=fields.String(), load_default=dict)
+
+
+batch_item_schema = BatchItem()
@@ -0,0 +1,118 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from hamcrest import assert_that, contains_exactly, has_entries
+
+from wazo_amid.plugin_helpers.ajam import AJAMUnreachable
+from wazo_amid.plugin_helpers.ami import ActionArgs, AMIActionResponse, AMIActionStream
+from wazo_amid.plugins.actions.batch import BatchRunner
+
+PONG = b'Response: Success\r\nPing: Pong\r\n\r\n'
+
+
+class FakeActionClient:
+    def __init__(self) -> None:
+        self.slow_released = threading.Event()
+
+    def get(self, action: str, ami_args: ActionArgs) -> AMIActionResponse:
+        if action == 'Slow':
+            self.slow_released.wait(timeout=5)
+        if action == 'Down':
+            raise AJAMUnreachable('http://localhost:5039/rawman', 'refused')
+        return AMIActionResponse(PONG)
+
+    def stream(self, action: str, ami_args: ActionArgs) -> AMIActionStream:
+        return AMIActionStream(self.get(action, ami_args).content)
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.action_client = FakeActionClient()
+        self.runner = BatchRunner(self.action_client, max_workers=2)
+        self.addCleanup(self.runner.shutdown)
+
+    def test_that_results_are_in_order_with_per_item_errors(self) -> None:
+        items = [
+            {'action': 'Ping', 'args': {}},
+            {'action': 'Down', 'args': {}},
+            {'action': 'Queues', 'args': {}},
+            {'action': 'DBPut', 'args': {'Family': 'f'}},
+        ]
+
+        futures = self.runner.submit(items, lambda action: action != 'DBPut')
+
+        assert_that(
+            [future.result() for future in futures],
+            contains_exactly(
+                has_entries(
+                    index=0,
+                    action='Ping',
+                    status_code=200,
+                    response=[{'Response': 'Success', 'Ping': 'Pong'}],
+                ),
+                has_entries(
+                    index=1,
+                    status_code=503,
+                    error=has_entries(error_id='ajam-unreachable'),
+                ),
+                has_entries(
+                    index=2,
+                    status_code=501,
+                    error=has_entries(error_id='incompatible-action'),
+                ),
+                has_entries(
+                    index=3,
+                    status_code=401,
+                    error=has_entries(error_id='unauthorized'),
+                ),
+            ),
+        )
+
+    def test_given_slow_action_when_iter_completed_then_others_first(self) -> None:
+        items = [{'action': 'Slow', 'args': {}}, {'action': 'Ping', 'args': {}}]
+        futures = self.runner.submit(items, lambda action: True)
+
+        results = self.runner.iter_completed(futures)
+        first = next(results)
+        self.action_client.slow_released.set()
+
+        assert_that(
+            [first, *results],
+            contains_exactly(has_entries(index=1), has_entries(index=0)),
+        )
+
+    def test_that_authorization_is_checked_once_per_action(self) -> None:
+        checked: list[str] = []
+
+        def is_authorized(action: str) -> bool:
+            checked.append(action)
+            return True
+
+        items = [{'action': 'Ping', 'args': {}}] * 3
+        for future in self.runner.submit(items, is_authorized):
+            future.result()
+
+        assert_that(checked, contains_exactly('Ping'))
+
+    def test_given_busy_workers_when_shutdown_then_pending_items_cancelled(
+        self,
+    ) -> None:
+        items = [{'action': 'Slow', 'args': {}}] * 2 + [{'action': 'Ping', 'args': {}}]
+        futures = self.runner.submit(items, lambda action: True)
+
+        shutdown = threading.Thread(target=self.runner.shutdown)
+        shutdown.start()
+        while not futures[2].cancelled():
+            shutdown.join(timeout=0.01)
+        self.action_client.slow_released.set()
+        shutdown.join()
+
+        assert_that(
+            [future.cancelled() for future in futures],
+            contains_exactly(False, False, True),
+        )
@@ -14,10 +14,10 @@ if TYPE_CHECKING:
 class Plugin:
     def load(self, dependencies: PluginDependencies) -> None:
         api = dependencies['api']
-        ajam_client = dependencies['ajam_client']
+        action_client = dependencies['action_client']
 
         api.add_resource(
             CommandResource,
             '/action/Command',
-            resource_class_args=[ajam_client],
+            resource_class_args=[action_client],
         )
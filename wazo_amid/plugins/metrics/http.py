@@ -0,0 +1,18 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from flask import Response
+
+from wazo_amid import metrics
+from wazo_amid.auth import required_acl
+from wazo_amid.rest_api import AuthResource
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsResource(AuthResource):
+    @required_acl('amid.metrics.read')
+    def get(self) -> Response:
+        return Response(metrics.exposition(), content_type=CONTENT_TYPE)
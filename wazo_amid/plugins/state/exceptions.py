@@ -0,0 +1,16 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from wazo_amid.exceptions import APIException
+
+
+class NotFoundException(APIException):
+    def __init__(self, resource: str, resource_id: str) -> None:
+        super().__init__(
+            status_code=404,
+            message=f'No such {resource}',
+            error_id=f'{resource}-not-found',
+            details={'id': resource_id},
+        )
@@ -0,0 +1,74 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from wazo_amid.auth import required_acl, required_master_tenant
+from wazo_amid.rest_api import AuthResource
+
+from .exceptions import NotFoundException
+
+if TYPE_CHECKING:
+    from wazo_amid.state_cache import StateCache
+
+
+class _StateResource(AuthResource):
+    def __init__(self, state_cache: StateCache) -> None:
+        self.state_cache = state_cache
+
+
+def _items(items: list[dict[str, Any]]) -> dict[str, Any]:
+    return {'items': items, 'total': len(items)}
+
+
+class ChannelsResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.channels.read')
+    def get(self) -> tuple[dict[str, Any], int]:
+        return _items(self.state_cache.channels()), 200
+
+
+class ChannelResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.channels.read')
+    def get(self, uniqueid: str) -> tuple[dict[str, Any], int]:
+        channel = self.state_cache.channel(uniqueid)
+        if channel is None:
+            raise NotFoundException('channel', uniqueid)
+        return channel, 200
+
+
+class BridgesResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.bridges.read')
+    def get(self) -> tuple[dict[str, Any], int]:
+        return _items(self.state_cache.bridges()), 200
+
+
+class BridgeResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.bridges.read')
+    def get(self, bridge_id: str) -> tuple[dict[str, Any], int]:
+        bridge = self.state_cache.bridge(bridge_id)
+        if bridge is None:
+            raise NotFoundException('bridge', bridge_id)
+        return bridge, 200
+
+
+class DevicesResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.devices.read')
+    def get(self) -> tuple[dict[str, Any], int]:
+        return _items(self.state_cache.devices()), 200
+
+
+class DeviceResource(_StateResource):
+    @required_master_tenant()
+    @required_acl('amid.devices.read')
+    def get(self, device: str) -> tuple[dict[str, Any], int]:
+        state = self.state_cache.device(device)
+        if state is None:
+            raise NotFoundException('device', device)
+        return state, 200
@@ -0,0 +1,44 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .http import (
+    BridgeResource,
+    BridgesResource,
+    ChannelResource,
+    ChannelsResource,
+    DeviceResource,
+    DevicesResource,
+)
+
+if TYPE_CHECKING:
+    from wazo_amid.rest_api import PluginDependencies
+
+logger = logging.getLogger(__name__)
+
+
+class Plugin:
+    def load(self, dependencies: PluginDependencies) -> None:
+        api = dependencies['api']
+        state_cache = dependencies['state_cache']
+        if state_cache is None:
+            logger.info('State cache disabled, not loading the state endpoints')
+            return
+
+        args = [state_cache]
+        api.add_resource(ChannelsResource, '/channels', resource_class_args=args)
+        api.add_resource(
+            ChannelResource, '/channels/<uniqueid>', resource_class_args=args
+        )
+        api.add_resource(BridgesResource, '/bridges', resource_class_args=args)
+        api.add_resource(
+            BridgeResource, '/bridges/<bridge_id>', resource_class_args=args
+        )
+        api.add_resource(DevicesResource, '/devices', resource_class_args=args)
+        api.add_resource(
+            DeviceResource, '/devices/<path:device>', resource_class_args=args
+        )
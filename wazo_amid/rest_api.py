@@ -5,12 +5,16 @@ from __future__ import annotations
 
 import logging
 import os
+import time
+from contextlib import ExitStack
 from datetime import timedelta
-from functools import wraps
+from functools import partial, wraps
 from typing import TYPE_CHECKING, TypedDict
 
 import marshmallow
 from flask import Flask
+from flask import Response as FlaskResponse
+from flask import g, request
 from flask_cors import CORS
 from flask_restful import Api, Resource
 from werkzeug.middleware.proxy_fix import ProxyFix
@@ -18,7 +22,12 @@ from xivo import http_helpers, plugin_helpers, rest_api_helpers, wsgi
 from xivo.flask.auth_verifier import AuthVerifierFlask
 from xivo.http_helpers import ReverseProxied
 
+from wazo_amid import metrics
+from wazo_amid.action_cache import CachedActionClient
+from wazo_amid.config import get_ami_configs
 from wazo_amid.plugin_helpers.ajam import AJAMClient
+from wazo_amid.plugin_helpers.ami import AMIActionClient
+from wazo_amid.plugin_helpers.coalescing import CoalescingActionClient
 
 from .exceptions import ValidationError
 
@@ -28,6 +37,10 @@ if TYPE_CHECKING:
 
     from xivo.status import StatusAggregator
 
+    from wazo_amid.action_cache import ActionCache
+    from wazo_amid.plugin_helpers.ami import ActionClient
+    from wazo_amid.state_cache import StateCache
+
     from .config import AmidConfigDict, RestApiConfigDict
 
     P = ParamSpec('P')
@@ -41,21 +54,31 @@ logger = logging.getLogger(__name__)
 api = Api(prefix=f'/{VERSION}')
 auth_verifier = AuthVerifierFlask()
 wsgi_server: wsgi.WSGIServer = None
+# called in reverse order once the server stopped handling requests
+teardown = ExitStack()
 
 
 class PluginDependencies(TypedDict):
     api: Api
     ajam_client: AJAMClient
+    action_client: ActionClient
     config: AmidConfigDict
     status_aggregator: StatusAggregator
+    state_cache: StateCache | None
+    teardown: ExitStack
 
 
 def configure(
-    global_config: AmidConfigDict, status_aggregator: StatusAggregator
+    global_config: AmidConfigDict,
+    status_aggregator: StatusAggregator,
+    state_cache: StateCache | None = None,
+    action_cache: ActionCache | None = None,
 ) -> None:
     http_helpers.add_logger(app, logger)
     app.before_request(http_helpers.log_before_request)
     app.after_request(http_helpers.log_request)
+    app.before_request(_start_request_timer)
+    app.after_request(_observe_request_duration)
     app.config.update(global_config)
     app.secret_key = os.urandom(24)
     app.permanent_session_lifetime = timedelta(minutes=5)
@@ -65,25 +88,79 @@ def configure(
     if enabled:
         CORS(app, **cors_config)
 
-    load_resources(global_config, status_aggregator)
+    load_resources(global_config, status_aggregator, state_cache, action_cache)
     api.init_app(app)
 
 
 def load_resources(
-    global_config: AmidConfigDict, status_aggregator: StatusAggregator
+    global_config: AmidConfigDict,
+    status_aggregator: StatusAggregator,
+    state_cache: StateCache | None = None,
+    action_cache: ActionCache | None = None,
 ) -> None:
+    ajam_client = AJAMClient(
+        **global_config['ajam'],
+        pool_size=global_config['rest_api']['max_threads'],
+    )
+    teardown.callback(ajam_client.close)
+    status_aggregator.add_provider(ajam_client.provide_status)
+    action_client: ActionClient = CoalescingActionClient(
+        _create_action_client(global_config, ajam_client),
+        global_config['action_client']['coalesced_actions'],
+    )
+    if action_cache is not None:
+        action_client = CachedActionClient(action_client, action_cache)
     plugin_helpers.load(
         namespace='wazo_amid.plugins',
         names=global_config['enabled_plugins'],
         dependencies={
             'api': api,
-            'ajam_client': AJAMClient(**global_config['ajam']),
+            'ajam_client': ajam_client,
+            'action_client': action_client,
             'config': global_config,
             'status_aggregator': status_aggregator,
+            'state_cache': state_cache,
+            'teardown': teardown,
         },
     )
 
 
+def _create_action_client(
+    global_config: AmidConfigDict, ajam_client: AJAMClient
+) -> ActionClient:
+    action_client_config = global_config['action_client']
+    if action_client_config['transport'] == 'ami':
+        # actions are sent to the first Asterisk node
+        ami_config = get_ami_configs(global_config)[0]
+        return AMIActionClient(
+            host=ami_config['host'],
+            port=ami_config['port'],
+            username=ami_config['username'],
+            password=ami_config['password'],
+            timeout=action_client_config['timeout'],
+        )
+    return ajam_client
+
+
+def _start_request_timer() -> None:
+    g.request_start = time.perf_counter()
+
+
+def _observe_request_duration(response: FlaskResponse) -> FlaskResponse:
+    start = g.get('request_start')
+    if start is not None:
+        resource = request.url_rule.rule if request.url_rule else 'unknown'
+        # streamed bodies are still being sent when the response is returned
+        response.call_on_close(
+            partial(_observe_duration_since, start, request.method, resource)
+        )
+    return response
+
+
+def _observe_duration_since(start: float, method: str, resource: str) -> None:
+    metrics.rest_request_seconds.observe(time.perf_counter() - start, method, resource)
+
+
 def run(config: RestApiConfigDict) -> None:
     bind_addr = (config['listen'], config['port'])
 
@@ -117,6 +194,7 @@ def run(config: RestApiConfigDict) -> None:
 def stop() -> None:
     if wsgi_server:
         wsgi_server.stop()
+    teardown.close()
 
 
 def handle_validation_exception(func: Callable[P, R]) -> Callable[P, R]:
@@ -0,0 +1,254 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from xivo.status import Status
+
+from .ami.parser import AMIParsingError
+
+if TYPE_CHECKING:
+    from xivo.status import StatusDict
+
+    from .ami.client import AnyMessage
+
+logger = logging.getLogger(__name__)
+
+Headers = dict[str, Any]
+
+RESYNC_ACTION_ID = 'wazo-amid-state-resync'
+RESYNC_ACTIONS = [
+    {'Action': 'CoreShowChannels', 'ActionID': RESYNC_ACTION_ID},
+    {'Action': 'BridgeList', 'ActionID': RESYNC_ACTION_ID},
+    {'Action': 'DeviceStateList', 'ActionID': RESYNC_ACTION_ID},
+]
+RESYNC_COMPLETE_EVENTS = frozenset(
+    ('CoreShowChannelsComplete', 'BridgeListComplete', 'DeviceStateListComplete')
+)
+IGNORED_HEADERS = frozenset(('Event', 'Privilege', 'ActionID'))
+
+
+class _NodeState:
+    def __init__(self) -> None:
+        self.channels: dict[str, Headers] = {}
+        self.bridges: dict[str, Headers] = {}
+        self.bridge_channels: dict[str, set[str]] = {}
+        self.devices: dict[str, str] = {}
+        self.pending_resyncs = set(RESYNC_COMPLETE_EVENTS)
+
+
+class StateCache:
+    """Live channels, bridges and device states, maintained from AMI events.
+
+    Each Asterisk node starts from an empty state when its AMI connection is
+    established, then the replies to RESYNC_ACTIONS fill it with what already
+    exists. Those replies are consumed by the cache and never published.
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[str | None, _NodeState] = {}
+        self._lock = threading.Lock()
+
+    def reset(self, node: str | None) -> None:
+        with self._lock:
+            self._nodes[node] = _NodeState()
+
+    def disconnected(self, node: str | None) -> None:
+        """Forget the state of a node whose AMI connection was lost.
+
+        Nothing is served for the node and the status is failed until it is
+        resynchronized after reconnecting.
+        """
+        self.reset(node)
+
+    def update(self, messages: Iterable[AnyMessage]) -> list[AnyMessage]:
+        """Apply events to the cache and return the messages to publish"""
+        published = []
+        with self._lock:
+            for message in messages:
+                handler = _HANDLERS.get(message.name)
+                if handler is None:
+                    published.append(message)
+                    continue
+                try:
+                    headers = message.headers
+                except AMIParsingError:
+                    published.append(message)
+                    continue
+
+                state = self._nodes.setdefault(message.node, _NodeState())
+                try:
+                    handler(state, headers)
+                except KeyError as e:
+                    logger.debug('Ignoring %s event without %s', message.name, e)
+                if headers.get('ActionID') != RESYNC_ACTION_ID:
+                    published.append(message)
+        return published
+
+    def channels(self) -> list[Headers]:
+        with self._lock:
+            return [
+                _with_node(channel, node)
+                for node, state in self._nodes.items()
+                for channel in state.channels.values()
+            ]
+
+    def channel(self, uniqueid: str) -> Headers | None:
+        with self._lock:
+            for node, state in self._nodes.items():
+                if uniqueid in state.channels:
+                    return _with_node(state.channels[uniqueid], node)
+        return None
+
+    def bridges(self) -> list[Headers]:
+        with self._lock:
+            return [
+                self._bridge(state, bridge_id, node)
+                for node, state in self._nodes.items()
+                for bridge_id in state.bridges
+            ]
+
+    def bridge(self, bridge_id: str) -> Headers | None:
+        with self._lock:
+            for node, state in self._nodes.items():
+                if bridge_id in state.bridges:
+                    return self._bridge(state, bridge_id, node)
+        return None
+
+    def devices(self) -> list[Headers]:
+        with self._lock:
+            return [
+                _with_node({'Device': device, 'State': device_state}, node)
+                for node, state in self._nodes.items()
+                for device, device_state in state.devices.items()
+            ]
+
+    def device(self, device: str) -> Headers | None:
+        with self._lock:
+            for node, state in self._nodes.items():
+                if device in state.devices:
+                    headers = {'Device': device, 'State': state.devices[device]}
+                    return _with_node(headers, node)
+        return None
+
+    def provide_status(self, status: StatusDict) -> None:
+        with self._lock:
+            synced = bool(self._nodes) and not any(
+                state.pending_resyncs for state in self._nodes.values()
+            )
+            status['state_cache']['status'] = Status.ok if synced else Status.fail
+            status['state_cache']['channels'] = sum(
+                len(state.channels) for state in self._nodes.values()
+            )
+            status['state_cache']['bridges'] = sum(
+                len(state.bridges) for state in self._nodes.values()
+            )
+            status['state_cache']['devices'] = sum(
+                len(state.devices) for state in self._nodes.values()
+            )
+
+    @staticmethod
+    def _bridge(state: _NodeState, bridge_id: str, node: str | None) -> Headers:
+        bridge = _with_node(state.bridges[bridge_id], node)
+        bridge['channels'] = sorted(state.bridge_channels.get(bridge_id, ()))
+        return bridge
+
+
+def _with_node(headers: Headers, node: str | None) -> Headers:
+    result = dict(headers)
+    if node is not None:
+        result['asterisk_node'] = node
+    return result
+
+
+def _fields(headers: Headers) -> Headers:
+    return {
+        name: value for name, value in headers.items() if name not in IGNORED_HEADERS
+    }
+
+
+def _bridge_fields(headers: Headers) -> Headers:
+    return {name: value for name, value in headers.items() if name.startswith('Bridge')}
+
+
+def _on_new_channel(state: _NodeState, headers: Headers) -> None:
+    state.channels[headers['Uniqueid']] = _fields(headers)
+
+
+def _on_channel_update(state: _NodeState, headers: Headers) -> None:
+    channel = state.channels.get(headers.get('Uniqueid', ''))
+    if channel is not None:
+        channel.update(_fields(headers))
+
+
+def _on_hangup(state: _NodeState, headers: Headers) -> None:
+    state.channels.pop(headers.get('Uniqueid', ''), None)
+
+
+def _on_core_show_channel(state: _NodeState, headers: Headers) -> None:
+    uniqueid = headers['Uniqueid']
+    state.channels.setdefault(uniqueid, {}).update(_fields(headers))
+    bridge_id = headers.get('BridgeId')
+    if bridge_id:
+        state.bridges.setdefault(bridge_id, {'BridgeUniqueid': bridge_id})
+        state.bridge_channels.setdefault(bridge_id, set()).add(uniqueid)
+
+
+def _on_bridge_update(state: _NodeState, headers: Headers) -> None:
+    bridge_id = headers['BridgeUniqueid']
+    state.bridges.setdefault(bridge_id, {}).update(_bridge_fields(headers))
+
+
+def _on_bridge_destroy(state: _NodeState, headers: Headers) -> None:
+    bridge_id = headers.get('BridgeUniqueid', '')
+    state.bridges.pop(bridge_id, None)
+    state.bridge_channels.pop(bridge_id, None)
+
+
+def _on_bridge_enter(state: _NodeState, headers: Headers) -> None:
+    _on_bridge_update(state, headers)
+    bridge_id = headers['BridgeUniqueid']
+    state.bridge_channels.setdefault(bridge_id, set()).add(headers['Uniqueid'])
+
+
+def _on_bridge_leave(state: _NodeState, headers: Headers) -> None:
+    bridge_id = headers.get('BridgeUniqueid', '')
+    channels = state.bridge_channels.get(bridge_id)
+    if channels is not None:
+        channels.discard(headers.get('Uniqueid', ''))
+    bridge = state.bridges.get(bridge_id)
+    if bridge is not None:
+        bridge.update(_bridge_fields(headers))
+
+
+def _on_device_state_change(state: _NodeState, headers: Headers) -> None:
+    state.devices[headers['Device']] = headers['State']
+
+
+def _on_resync_complete(state: _NodeState, headers: Headers) -> None:
+    if headers.get('ActionID') == RESYNC_ACTION_ID:
+        state.pending_resyncs.discard(headers['Event'])
+
+
+_HANDLERS: dict[str, Callable[[_NodeState, Headers], None]] = {
+    'Newchannel': _on_new_channel,
+    'Newstate': _on_channel_update,
+    'NewCallerid': _on_channel_update,
+    'NewConnectedLine': _on_channel_update,
+    'Newexten': _on_channel_update,
+    'Rename': _on_channel_update,
+    'Hangup': _on_hangup,
+    'CoreShowChannel': _on_core_show_channel,
+    'BridgeCreate': _on_bridge_update,
+    'BridgeListItem': _on_bridge_update,
+    'BridgeDestroy': _on_bridge_destroy,
+    'BridgeEnter': _on_bridge_enter,
+    'BridgeLeave': _on_bridge_leave,
+    'DeviceStateChange': _on_device_state_change,
+    **{event: _on_resync_complete for event in RESYNC_COMPLETE_EVENTS},
+}
@@ -0,0 +1,149 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+from collections import defaultdict
+from unittest.mock import Mock
+
+from hamcrest import assert_that, equal_to, has_entries, none
+
+from wazo_amid.action_cache import ActionCache, CachedActionClient
+from wazo_amid.ami.client import Message
+
+SETTINGS = b'Response: Success\r\nAMIversion: 9.0.0\r\n\r\n'
+ENDPOINTS = b'Response: Success\r\nEventList: start\r\n\r\n'
+ERROR = b'Response: Error\r\nMessage: Invalid/unknown command\r\n\r\n'
+
+
+def event(name: str) -> Message:
+    return Message(name, {'Event': name})
+
+
+class TestActionCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now = 100.0
+        self.cache = ActionCache(
+            {
+                'CoreSettings': {'ttl': 60},
+                'PJSIPShowEndpoints': {
+                    'ttl': 10,
+                    'invalidated_by': ['ContactStatus', 'Device*'],
+                },
+                'Ping': {'ttl': 0},
+            },
+            clock=lambda: self.now,
+        )
+
+    def test_given_cached_response_when_get_then_found_until_ttl(self) -> None:
+        self.cache.set('CoreSettings', {}, SETTINGS, self.cache.epoch())
+
+        assert_that(self.cache.get('coresettings', {}), equal_to(SETTINGS))
+        self.now += 60
+        assert_that(self.cache.get('CoreSettings', {}), none())
+
+    def test_that_arguments_are_part_of_the_key(self) -> None:
+        epoch = self.cache.epoch()
+        self.cache.set('PJSIPShowEndpoints', {'Endpoint': 'a'}, ENDPOINTS, epoch)
+
+        assert_that(
+            self.cache.get('PJSIPShowEndpoints', {'endpoint': 'a'}),
+            equal_to(ENDPOINTS),
+        )
+        assert_that(self.cache.get('PJSIPShowEndpoints', {'Endpoint': 'b'}), none())
+        assert_that(self.cache.get('PJSIPShowEndpoints', {}), none())
+
+    def test_that_errors_and_actions_without_ttl_are_not_cached(self) -> None:
+        self.cache.set('CoreSettings', {}, ERROR, self.cache.epoch())
+        self.cache.set('Ping', {}, SETTINGS, self.cache.epoch())
+
+        assert_that(self.cache.cacheable('Ping'), equal_to(False))
+        assert_that(self.cache.get('CoreSettings', {}), none())
+
+    def test_given_matching_event_when_invalidate_then_action_dropped(self) -> None:
+        self.cache.set('CoreSettings', {}, SETTINGS, self.cache.epoch())
+        self.cache.set('PJSIPShowEndpoints', {}, ENDPOINTS, self.cache.epoch())
+
+        self.cache.invalidate([event('Newchannel'), event('DeviceStateChange')])
+
+        assert_that(self.cache.get('PJSIPShowEndpoints', {}), none())
+        assert_that(self.cache.get('CoreSettings', {}), equal_to(SETTINGS))
+
+    def test_given_reload_when_invalidate_then_everything_dropped(self) -> None:
+        self.cache.set('CoreSettings', {}, SETTINGS, self.cache.epoch())
+
+        self.cache.invalidate([event('Reload')])
+
+        assert_that(self.cache.get('CoreSettings', {}), none())
+
+    def test_given_invalidation_during_request_when_set_then_not_cached(
+        self,
+    ) -> None:
+        epoch = self.cache.epoch()
+        self.cache.invalidate([event('FullyBooted')])
+
+        self.cache.set('CoreSettings', {}, SETTINGS, epoch)
+
+        assert_that(self.cache.get('CoreSettings', {}), none())
+
+    def test_provide_status(self) -> None:
+        self.cache.set('CoreSettings', {}, SETTINGS, self.cache.epoch())
+        self.cache.get('CoreSettings', {})
+        self.cache.get('PJSIPShowEndpoints', {})
+        self.cache.invalidate([event('Reload')])
+        status: dict = defaultdict(dict)
+
+        self.cache.provide_status(status)
+
+        assert_that(
+            status['action_cache'],
+            has_entries(size=0, hits=1, misses=1, hit_ratio=0.5, invalidations=1),
+        )
+
+
+class TestCachedActionClient(unittest.TestCase):
+    def setUp(self) -> None:
+        self.action_client = Mock()
+        self.action_client.get.return_value = Mock(content=SETTINGS)
+        self.action_client.stream.return_value = iter_stream(
+            SETTINGS[:10], SETTINGS[10:]
+        )
+        self.cache = ActionCache({'CoreSettings': {'ttl': 60}})
+        self.client = CachedActionClient(self.action_client, self.cache)
+
+    def test_given_cacheable_action_when_get_twice_then_sent_once(self) -> None:
+        self.client.get('CoreSettings', {})
+        result = self.client.get('CoreSettings', {})
+
+        assert_that(result.content, equal_to(SETTINGS))
+        self.action_client.get.assert_called_once_with('CoreSettings', {})
+
+    def test_given_other_action_when_get_twice_then_sent_twice(self) -> None:
+        self.client.get('Ping', {})
+        self.client.get('Ping', {})
+
+        assert_that(self.action_client.get.call_count, equal_to(2))
+
+    def test_given_streamed_response_when_consumed_then_cached(self) -> None:
+        stream = self.client.stream('CoreSettings', {})
+        assert_that(b''.join(stream), equal_to(SETTINGS))
+        stream.close()
+
+        cached = self.client.stream('CoreSettings', {})
+
+        assert_that(b''.join(cached), equal_to(SETTINGS))
+        self.action_client.stream.assert_called_once_with('CoreSettings', {})
+
+    def test_given_stream_closed_early_then_not_cached(self) -> None:
+        stream = self.client.stream('CoreSettings', {})
+        next(iter(stream))
+        stream.close()
+
+        assert_that(self.cache.get('CoreSettings', {}), none())
+
+
+def iter_stream(*chunks: bytes) -> Mock:
+    stream = Mock()
+    stream.__iter__ = Mock(return_value=iter(chunks))
+    return stream
@@ -0,0 +1,136 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import socket
+import threading
+import unittest
+from unittest.mock import Mock
+
+from hamcrest import assert_that, contains_exactly, equal_to, has_entries
+
+from wazo_amid.ami.async_client import AsyncAMIClient
+from wazo_amid.ami.client import AnyMessage
+from wazo_amid.async_facade import AsyncEventHandlerFacade
+from wazo_amid.bus.client import BusClient
+from wazo_amid.event_queue import EventQueue
+
+EVENTS = (
+    b'Event: Newchannel\r\nUniqueid: 1\r\n\r\n'
+    b'Event: VarSet\r\nUniqueid: 1\r\n\r\n'
+    b'Event: Hangup\r\nUniqueid: 1\r\n\r\n'
+)
+
+
+class TestAsyncEventHandlerFacade(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(self.server.close)
+        self.received = b''
+        self.events = EVENTS
+        self.ping_received = threading.Event()
+        self.connection_closed = threading.Event()
+        self.server_thread = threading.Thread(target=self._serve, daemon=True)
+        self.server_thread.start()
+
+        self.published: list[AnyMessage] = []
+        self.all_published = threading.Event()
+        self.bus_client = Mock(BusClient)
+        self.bus_client.publish.side_effect = self._publish
+
+        port = self.server.getsockname()[1]
+        self.ami_client = AsyncAMIClient(
+            '127.0.0.1',
+            'user',
+            'pass',
+            port,
+            event_filter={'allow': [], 'deny': ['VarSet']},
+            startup_actions=[{'Action': 'CoreShowChannels'}],
+            ping_interval=0.01,
+        )
+        self.facade = AsyncEventHandlerFacade([self.ami_client], self.bus_client)
+
+    def _serve(self) -> None:
+        try:
+            conn, _ = self.server.accept()
+        except OSError:
+            return
+        with conn:
+            conn.sendall(b'Asterisk Call Manager/5.0.1\r\n')
+            conn.sendall(self.events)
+            while data := conn.recv(4096):
+                self.received += data
+                if b'Action: Ping\r\n' in self.received:
+                    self.ping_received.set()
+        self.connection_closed.set()
+
+    def _publish(self, *messages: AnyMessage) -> None:
+        self.published.extend(messages)
+        if len(self.published) >= 2:
+            self.all_published.set()
+
+    def test_when_run_then_events_published_in_order_and_pings_sent(self) -> None:
+        facade_thread = threading.Thread(target=self.facade.run)
+        facade_thread.start()
+
+        self.all_published.wait(timeout=5)
+        self.ping_received.wait(timeout=5)
+        self.facade.stop()
+        facade_thread.join(timeout=5)
+
+        assert_that(facade_thread.is_alive(), equal_to(False))
+        assert_that(
+            [message.name for message in self.published],
+            contains_exactly('Newchannel', 'Hangup'),
+        )
+        assert_that(self.received.startswith(b'Action: Login\r\n'), equal_to(True))
+        assert_that(b'Action: CoreShowChannels\r\n' in self.received, equal_to(True))
+        assert_that(self.ping_received.is_set(), equal_to(True))
+        assert_that(self.ami_client.connected, equal_to(False))
+
+    def test_given_ping_unanswered_when_run_then_connection_closed(self) -> None:
+        self.ami_client.liveness.ping_timeout = 0.05
+        facade_thread = threading.Thread(target=self.facade.run)
+        facade_thread.start()
+
+        self.connection_closed.wait(timeout=5)
+        self.facade.stop()
+        facade_thread.join(timeout=5)
+
+        assert_that(self.connection_closed.is_set(), equal_to(True))
+        assert_that(self.ami_client.liveness.status(), has_entries(ping_timeouts=1))
+
+    def test_given_full_event_queue_when_run_then_loop_not_blocked(self) -> None:
+        self.events = b'Event: UserEvent\r\n\r\n' * 5
+        publishing, published = threading.Event(), threading.Event()
+
+        def publish(*messages: AnyMessage) -> None:
+            publishing.set()
+            published.wait(timeout=5)
+
+        self.bus_client.publish.side_effect = publish
+        facade = AsyncEventHandlerFacade(
+            [self.ami_client], self.bus_client, EventQueue(max_size=1)
+        )
+        facade_thread = threading.Thread(target=facade.run)
+        facade_thread.start()
+        publishing.wait(timeout=5)
+
+        loop_running = threading.Event()
+        assert facade._loop is not None
+        facade._loop.call_soon_threadsafe(loop_running.set)
+        loop_running.wait(timeout=1)
+        published.set()
+        facade.stop()
+        facade_thread.join(timeout=5)
+
+        assert_that(loop_running.is_set(), equal_to(True))
+        assert_that(facade_thread.is_alive(), equal_to(False))
+
+    def test_given_stopped_before_run_when_run_then_return(self) -> None:
+        self.facade.stop()
+
+        self.facade.run()
+
+        self.bus_client.publish.assert_not_called()
@@ -0,0 +1,122 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import unittest
+from collections import defaultdict
+
+from hamcrest import (
+    assert_that,
+    calling,
+    contains_exactly,
+    equal_to,
+    has_entries,
+    none,
+    raises,
+)
+
+from wazo_amid.ami.client import Message
+from wazo_amid.event_queue import EventQueue
+
+
+def message(name: str, index: int = 0) -> Message:
+    return Message(name, {'Event': name, 'Index': str(index)})
+
+
+class TestEventQueue(unittest.TestCase):
+    def test_given_unknown_policy_then_raise(self) -> None:
+        assert_that(
+            calling(EventQueue).with_args(overflow_policy='unknown'),
+            raises(ValueError),
+        )
+
+    def test_when_get_batch_then_all_messages_in_order(self) -> None:
+        queue = EventQueue()
+        messages = [message('foo', i) for i in range(3)]
+        for m in messages:
+            queue.put(m)
+
+        assert_that(queue.get_batch(), contains_exactly(*messages))
+
+    def test_given_closed_and_empty_when_get_batch_then_none(self) -> None:
+        queue = EventQueue()
+        queue.put(message('foo'))
+        queue.close()
+
+        assert_that(queue.get_batch(), contains_exactly(message('foo')))
+        assert_that(queue.get_batch(), none())
+
+    def test_given_drop_oldest_when_full_then_oldest_dropped(self) -> None:
+        queue = EventQueue(max_size=2, overflow_policy='drop_oldest')
+
+        for i in range(3):
+            queue.put(message('foo', i))
+
+        assert_that(
+            queue.get_batch(), contains_exactly(message('foo', 1), message('foo', 2))
+        )
+        status: defaultdict = defaultdict(dict)
+        queue.provide_status(status)
+        assert_that(status['event_queue'], has_entries(depth=0, dropped={'foo': 1}))
+
+    def test_given_drop_priority_when_full_then_lowest_priority_dropped(self) -> None:
+        queue = EventQueue(
+            max_size=3,
+            overflow_policy='drop_priority',
+            priorities={'Hangup': 10, 'RTCP*': -10},
+        )
+        queue.put(message('Newchannel', 0))
+        queue.put(message('RTCPSent', 1))
+        queue.put(message('Hangup', 2))
+
+        queue.put(message('Newstate', 3))
+        queue.put(message('Newstate', 4))
+        queue.put(message('RTCPReceived', 5))
+
+        assert_that(
+            queue.get_batch(),
+            contains_exactly(
+                message('Hangup', 2), message('Newstate', 3), message('Newstate', 4)
+            ),
+        )
+        status: defaultdict = defaultdict(dict)
+        queue.provide_status(status)
+        assert_that(
+            status['event_queue']['dropped'],
+            equal_to({'RTCPSent': 1, 'Newchannel': 1, 'RTCPReceived': 1}),
+        )
+
+    def test_given_block_when_full_then_put_waits_for_get(self) -> None:
+        queue = EventQueue(max_size=1, overflow_policy='block')
+        queue.put(message('foo', 0))
+        put_thread = threading.Thread(target=queue.put, args=(message('foo', 1),))
+
+        put_thread.start()
+        put_thread.join(timeout=0.1)
+        assert_that(put_thread.is_alive(), equal_to(True))
+
+        assert_that(queue.get_batch(), contains_exactly(message('foo', 0)))
+        put_thread.join(timeout=1)
+        assert_that(queue.get_batch(), contains_exactly(message('foo', 1)))
+
+    def test_given_block_and_waiting_reader_when_batch_larger_than_queue_then_put(
+        self,
+    ) -> None:
+        queue = EventQueue(max_size=1, overflow_policy='block')
+        batches: list = []
+        get_thread = threading.Thread(
+            target=lambda: batches.extend(iter(queue.get_batch, None))
+        )
+        get_thread.start()
+        messages = [message('foo', index) for index in range(3)]
+        put_thread = threading.Thread(target=queue.put_batch, args=(messages,))
+
+        put_thread.start()
+        put_thread.join(timeout=1)
+        queue.close()
+        get_thread.join(timeout=1)
+
+        assert_that(put_thread.is_alive(), equal_to(False))
+        assert_that(sum(batches, []), equal_to(messages))
@@ -3,17 +3,19 @@
 
 from __future__ import annotations
 
+import threading
 import unittest
 from collections import deque
 from unittest.mock import ANY, Mock, call, patch, sentinel
 
-from hamcrest import assert_that, contains, equal_to
+from hamcrest import assert_that, contains_exactly, equal_to
 
-from wazo_amid.ami.client import AMIClient, AMIConnectionError, Message
+from wazo_amid.action_cache import ActionCache
+from wazo_amid.ami.client import AMIClient, AMIConnectionError, AnyMessage, Message
+from wazo_amid.ami.reconnect import ReconnectBackoff
 from wazo_amid.bus.client import BusClient
 from wazo_amid.facade import EventHandlerFacade
-
-RECONNECTION_DELAY = 5
+from wazo_amid.state_cache import StateCache
 
 
 class TestEventHandlerFacade(unittest.TestCase):
@@ -40,9 +42,12 @@ class TestEventHandlerFacade(unittest.TestCase):
         self.bus_client_mock = Mock(BusClient)
 
         self.ami_client_mock = Mock(AMIClient)
+        self.ami_client_mock.name = None
+        self.ami_client_mock.backoff = Mock(ReconnectBackoff)
+        self.ami_client_mock.backoff.disconnected.return_value = sentinel.delay
         self.ami_client_mock.parse_next_messages.side_effect = [Exception()]
 
-        self.facade = EventHandlerFacade(self.ami_client_mock, self.bus_client_mock)
+        self.facade = EventHandlerFacade([self.ami_client_mock], self.bus_client_mock)
 
     def test_when_run_then_ami_client_connect_and_login(self) -> None:
         self.assertRaises(Exception, self.facade.run)
@@ -64,7 +69,8 @@ class TestEventHandlerFacade(unittest.TestCase):
 
         self.assertRaises(Exception, self.facade.run)
 
-        self.event_wait.assert_called_once_with(timeout=RECONNECTION_DELAY)
+        self.ami_client_mock.backoff.disconnected.assert_called_once_with()
+        self.event_wait.assert_called_once_with(timeout=sentinel.delay)
         assert_that(self.ami_client_mock.disconnect.call_count, equal_to(2))
         assert_that(self.ami_client_mock.connect_and_login.call_count, equal_to(2))
 
@@ -90,22 +96,74 @@ class TestEventHandlerFacade(unittest.TestCase):
         self,
     ) -> None:
         self.ami_client_mock.parse_next_messages.side_effect = [
-            [sentinel.first_message],
-            [sentinel.second_message],
+            deque([sentinel.first_message, sentinel.second_message]),
+            deque([sentinel.third_message]),
             Exception(),
         ]
-        expected_calls = [call(sentinel.first_message), call(sentinel.second_message)]
 
         self.assertRaises(Exception, self.facade.run)
 
         assert_that(self.ami_client_mock.parse_next_messages.call_count, equal_to(3))
-        mock_calls = self.bus_client_mock.publish.mock_calls
-        assert_that(mock_calls, contains(*expected_calls))
+        published = [
+            message
+            for mock_call in self.bus_client_mock.publish.call_args_list
+            for message in mock_call.args
+        ]
+        assert_that(
+            published,
+            contains_exactly(
+                sentinel.first_message,
+                sentinel.second_message,
+                sentinel.third_message,
+            ),
+        )
+
+    def test_given_messages_in_one_batch_when_run_then_published_in_one_call(
+        self,
+    ) -> None:
+        self.ami_client_mock.parse_next_messages.side_effect = [
+            deque([sentinel.first_message, sentinel.second_message]),
+            Exception(),
+        ]
+
+        self.assertRaises(Exception, self.facade.run)
+
+        self.bus_client_mock.publish.assert_called_once_with(
+            sentinel.first_message, sentinel.second_message
+        )
+
+    def test_given_publish_error_when_run_then_next_messages_published(
+        self,
+    ) -> None:
+        first_publish = threading.Event()
+
+        def publish(*messages: AnyMessage) -> None:
+            if not first_publish.is_set():
+                first_publish.set()
+                raise Exception()
+
+        def parse_next_messages() -> deque[AnyMessage]:
+            calls = self.ami_client_mock.parse_next_messages.call_count
+            if calls == 1:
+                return deque([sentinel.first_message])
+            # the first batch is published on its own before the next is read
+            first_publish.wait(timeout=5)
+            if calls == 2:
+                return deque([sentinel.second_message])
+            raise Exception()
+
+        self.bus_client_mock.publish.side_effect = publish
+        self.ami_client_mock.parse_next_messages.side_effect = parse_next_messages
+
+        self.assertRaises(Exception, self.facade.run)
+
+        self.bus_client_mock.publish.assert_called_with(sentinel.second_message)
+        assert_that(self.bus_client_mock.publish.call_count, equal_to(2))
 
     def test_given_events_in_queue_when_process_messages_then_queue_is_emptied(
         self,
     ) -> None:
-        queue: deque[Message] = deque()
+        queue: deque[AnyMessage] = deque()
         queue.append(sentinel.event1)
         queue.append(sentinel.event2)
 
@@ -117,3 +175,110 @@ class TestEventHandlerFacade(unittest.TestCase):
         self.facade.stop()
 
         self.ami_client_mock.stop.assert_called_once_with()
+
+    def test_given_several_ami_clients_when_one_fails_then_all_stopped(
+        self,
+    ) -> None:
+        first_message_read = threading.Event()
+
+        def parse_first_client_messages() -> list[Message]:
+            if first_message_read.is_set():
+                return []
+            first_message_read.set()
+            return [sentinel.message]
+
+        def parse_other_client_messages() -> list[Message]:
+            first_message_read.wait()
+            raise Exception()
+
+        self.ami_client_mock.parse_next_messages.side_effect = (
+            parse_first_client_messages
+        )
+        other_ami_client_mock = Mock(AMIClient)
+        other_ami_client_mock.parse_next_messages.side_effect = (
+            parse_other_client_messages
+        )
+        facade = EventHandlerFacade(
+            [self.ami_client_mock, other_ami_client_mock], self.bus_client_mock
+        )
+
+        self.assertRaises(Exception, facade.run)
+
+        published = [
+            message
+            for mock_call in self.bus_client_mock.publish.call_args_list
+            for message in mock_call.args
+        ]
+        assert_that(
+            published,
+            contains_exactly(sentinel.message),
+        )
+        other_ami_client_mock.connect_and_login.assert_called_once_with()
+        self.ami_client_mock.stop.assert_called_once_with()
+
+    def test_given_several_ami_clients_when_stop_then_all_clients_stopped(
+        self,
+    ) -> None:
+        other_ami_client_mock = Mock(AMIClient)
+        facade = EventHandlerFacade(
+            [self.ami_client_mock, other_ami_client_mock], self.bus_client_mock
+        )
+
+        facade.stop()
+
+        self.ami_client_mock.stop.assert_called_once_with()
+        other_ami_client_mock.stop.assert_called_once_with()
+
+    def test_given_state_cache_when_run_then_cache_reset_and_updated(self) -> None:
+        state_cache = Mock(StateCache)
+        state_cache.update.return_value = [sentinel.published]
+        self.ami_client_mock.name = 'node-1'
+        self.ami_client_mock.parse_next_messages.side_effect = [
+            [sentinel.message],
+            Exception(),
+        ]
+        facade = EventHandlerFacade(
+            [self.ami_client_mock], self.bus_client_mock, state_cache=state_cache
+        )
+
+        self.assertRaises(Exception, facade.run)
+
+        state_cache.reset.assert_called_once_with('node-1')
+        state_cache.update.assert_called_once_with(ANY)
+        self.bus_client_mock.publish.assert_called_once_with(sentinel.published)
+
+    def test_given_state_cache_when_ami_connection_lost_then_node_state_forgotten(
+        self,
+    ) -> None:
+        state_cache = Mock(StateCache)
+        self.ami_client_mock.name = 'node-1'
+        self.ami_client_mock.backoff.disconnected.return_value = 0
+        self.ami_client_mock.connect_and_login.side_effect = [
+            AMIConnectionError(),
+            None,
+        ]
+        facade = EventHandlerFacade(
+            [self.ami_client_mock], self.bus_client_mock, state_cache=state_cache
+        )
+
+        self.assertRaises(Exception, facade.run)
+
+        assert_that(
+            state_cache.mock_calls[:2],
+            contains_exactly(call.disconnected('node-1'), call.reset('node-1')),
+        )
+
+    def test_given_action_cache_when_run_then_cache_invalidated(self) -> None:
+        action_cache = Mock(ActionCache)
+        self.ami_client_mock.parse_next_messages.side_effect = [
+            [sentinel.message],
+            Exception(),
+        ]
+        facade = EventHandlerFacade(
+            [self.ami_client_mock], self.bus_client_mock, action_cache=action_cache
+        )
+
+        self.assertRaises(Exception, facade.run)
+
+        action_cache.invalidate.assert_called_once_with(ANY)
+        self.bus_client_mock.publish.assert_called_once_with(sentinel.message)
@@ -0,0 +1,79 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import threading
+import unittest
+
+from hamcrest import assert_that, contains_string, equal_to
+
+from wazo_amid.metrics import BoundedLabel, Counter, Gauge, Histogram, Registry
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = Registry()
+
+    def test_given_counter_incremented_by_threads_then_summed(self) -> None:
+        counter = Counter('events_total', 'Events', ['event'], registry=self.registry)
+
+        def increment() -> None:
+            for _ in range(1000):
+                counter.inc('Newchannel')
+            counter.inc('Hangup', amount=2)
+
+        threads = [threading.Thread(target=increment) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(
+            self.registry.exposition(),
+            equal_to(
+                '# HELP events_total Events\n'
+                '# TYPE events_total counter\n'
+                'events_total{event="Hangup"} 8\n'
+                'events_total{event="Newchannel"} 4000\n'
+            ),
+        )
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = Histogram(
+            'latency_seconds', 'Latency', buckets=(0.1, 1), registry=self.registry
+        )
+
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        assert_that(
+            self.registry.exposition(),
+            equal_to(
+                '# HELP latency_seconds Latency\n'
+                '# TYPE latency_seconds histogram\n'
+                'latency_seconds_bucket{le="0.1"} 2\n'
+                'latency_seconds_bucket{le="1"} 3\n'
+                'latency_seconds_bucket{le="+Inf"} 4\n'
+                'latency_seconds_sum 3.65\n'
+                'latency_seconds_count 4\n'
+            ),
+        )
+
+    def test_that_gauge_is_read_on_collect_and_labels_escaped(self) -> None:
+        Gauge('depth', 'Depth', registry=self.registry).set_function(lambda: 3)
+        Counter('odd_total', 'Odd', ['name'], registry=self.registry).inc('a"\\\n')
+
+        exposition = self.registry.exposition()
+
+        assert_that(exposition, contains_string('depth 3\n'))
+        assert_that(exposition, contains_string('odd_total{name="a\\"\\\\\\n"} 1\n'))
+
+    def test_given_bounded_label_when_too_many_values_then_other(self) -> None:
+        label = BoundedLabel(max_values=2)
+
+        values = [label(value) for value in ('a', 'b', 'c', 'a', 'd', 'b')]
+
+        assert_that(values, equal_to(['a', 'b', 'other', 'a', 'other', 'b']))
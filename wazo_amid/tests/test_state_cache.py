@@ -0,0 +1,183 @@
+# Copyright 2026 The Wazo Authors  (see the AUTHORS file)
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+from __future__ import annotations
+
+import unittest
+from collections import defaultdict
+
+from hamcrest import assert_that, contains_exactly, empty, equal_to, has_entries, none
+from xivo.status import Status
+
+from wazo_amid.ami.client import LazyMessage, Message
+from wazo_amid.state_cache import RESYNC_ACTION_ID, StateCache
+
+
+def event(name: str, node: str | None = None, **headers: str) -> Message:
+    return Message(name, {'Event': name, 'Privilege': 'call,all', **headers}, node)
+
+
+def resync_event(name: str, **headers: str) -> Message:
+    return event(name, ActionID=RESYNC_ACTION_ID, **headers)
+
+
+class TestStateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = StateCache()
+        self.cache.reset(None)
+
+    def test_given_new_channel_when_updated_then_channel_listed(self) -> None:
+        self.cache.update(
+            [
+                event('Newchannel', Uniqueid='1', Channel='PJSIP/a', ChannelState='0'),
+                event('Newstate', Uniqueid='1', ChannelState='6'),
+            ]
+        )
+
+        assert_that(
+            self.cache.channels(),
+            contains_exactly(
+                {'Uniqueid': '1', 'Channel': 'PJSIP/a', 'ChannelState': '6'}
+            ),
+        )
+        assert_that(self.cache.channel('1'), has_entries(Channel='PJSIP/a'))
+
+    def test_given_newexten_event_when_updated_then_dialplan_position_updated(
+        self,
+    ) -> None:
+        newexten = (
+            b'Event: Newexten\r\nPrivilege: dialplan,all\r\nChannel: PJSIP/a\r\n'
+            b'Uniqueid: 1\r\nContext: default\r\nExten: 1001\r\nPriority: 2\r\n'
+            b'Application: Dial\r\nAppData: PJSIP/b'
+        )
+        self.cache.update(
+            [
+                event('Newchannel', Uniqueid='1', Channel='PJSIP/a', Exten='s'),
+                LazyMessage('Newexten', newexten),
+            ]
+        )
+
+        assert_that(
+            self.cache.channel('1'),
+            has_entries(Exten='1001', Priority='2', Application='Dial'),
+        )
+
+    def test_given_hangup_when_updated_then_channel_removed(self) -> None:
+        self.cache.update(
+            [
+                event('Newchannel', Uniqueid='1', Channel='PJSIP/a'),
+                event('Hangup', Uniqueid='1', Channel='PJSIP/a'),
+            ]
+        )
+
+        assert_that(self.cache.channels(), empty())
+        assert_that(self.cache.channel('1'), none())
+
+    def test_given_bridge_events_when_updated_then_bridge_channels_tracked(
+        self,
+    ) -> None:
+        self.cache.update(
+            [
+                event('BridgeCreate', BridgeUniqueid='b', BridgeType='basic'),
+                event('BridgeEnter', BridgeUniqueid='b', Uniqueid='1'),
+                event('BridgeEnter', BridgeUniqueid='b', Uniqueid='2'),
+                event('BridgeLeave', BridgeUniqueid='b', Uniqueid='1'),
+            ]
+        )
+
+        assert_that(
+            self.cache.bridge('b'),
+            equal_to({'BridgeUniqueid': 'b', 'BridgeType': 'basic', 'channels': ['2']}),
+        )
+
+        self.cache.update([event('BridgeDestroy', BridgeUniqueid='b')])
+
+        assert_that(self.cache.bridges(), empty())
+
+    def test_given_device_state_change_when_updated_then_device_state(
+        self,
+    ) -> None:
+        self.cache.update(
+            [
+                event('DeviceStateChange', Device='PJSIP/a', State='INUSE'),
+                event('DeviceStateChange', Device='PJSIP/a', State='NOT_INUSE'),
+            ]
+        )
+
+        assert_that(
+            self.cache.devices(),
+            contains_exactly({'Device': 'PJSIP/a', 'State': 'NOT_INUSE'}),
+        )
+
+    def test_given_resync_replies_when_updated_then_consumed_and_synced(
+        self,
+    ) -> None:
+        live = event('VarSet', Variable='FOO')
+        status: defaultdict = defaultdict(dict)
+        self.cache.provide_status(status)
+        assert_that(status['state_cache'], has_entries(status=Status.fail))
+
+        published = self.cache.update(
+            [
+                resync_event('CoreShowChannel', Uniqueid='1', BridgeId='b'),
+                resync_event('CoreShowChannelsComplete'),
+                resync_event('BridgeListItem', BridgeUniqueid='b'),
+                resync_event('BridgeListComplete'),
+                resync_event('DeviceStateChange', Device='PJSIP/a', State='INUSE'),
+                resync_event('DeviceStateListComplete'),
+                live,
+            ]
+        )
+
+        assert_that(published, contains_exactly(live))
+        assert_that(self.cache.bridge('b'), has_entries(channels=['1']))
+        self.cache.provide_status(status)
+        assert_that(
+            status['state_cache'],
+            has_entries(status=Status.ok, channels=1, bridges=1, devices=1),
+        )
+
+    def test_given_unrelated_lazy_message_when_updated_then_not_decoded(
+        self,
+    ) -> None:
+        message = LazyMessage('VarSet', b'Event: VarSet\r\nbogus')
+
+        published = self.cache.update([message])
+
+        assert_that(published, contains_exactly(message))
+
+    def test_given_several_nodes_when_reset_then_only_node_state_cleared(
+        self,
+    ) -> None:
+        self.cache.update(
+            [
+                event('Newchannel', 'node-1', Uniqueid='1'),
+                event('Newchannel', 'node-2', Uniqueid='2'),
+            ]
+        )
+
+        self.cache.reset('node-1')
+
+        assert_that(
+            self.cache.channels(),
+            contains_exactly({'Uniqueid': '2', 'asterisk_node': 'node-2'}),
+        )
+
+    def test_given_synced_node_when_disconnected_then_state_dropped_and_failed(
+        self,
+    ) -> None:
+        self.cache.update(
+            [
+                event('Newchannel', Uniqueid='1'),
+                resync_event('CoreShowChannelsComplete'),
+                resync_event('BridgeListComplete'),
+                resync_event('DeviceStateListComplete'),
+            ]
+        )
+
+        self.cache.disconnected(None)
+
+        assert_that(self.cache.channels(), empty())
+        status: defaultdict = defaultdict(dict)
+        self.cache.provide_status(status)
+        assert_that(status['state_cache'], has_entries(status=Status.fail))